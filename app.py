@@ -1,5 +1,8 @@
 import os
-from typing import Dict, List
+import re
+import secrets
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Union
 
 import ujson
 from dotenv import load_dotenv
@@ -7,28 +10,173 @@ from starlette.applications import Starlette
 from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 from doc import generate_schema
+from mailing import CircuitBreaker, EmailDispatcher, EmailOutbox, SendinBlueClient
+from middlewares import (
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    MetricsMiddleware,
+    ServerTimingMiddleware,
+)
+from monitoring import LoopLagMonitor, ProfileStore, StackSampler, mark_worker_dead
 
-from routes import routes
+from pdf_generation import (
+    InvoiceCacheEvictor,
+    RenderExecutor,
+    SingleFlight,
+    font_registry,
+    invoice_cache,
+)
+
+from routes import DownloadLinkSigner, deliver_email, routes
 
 load_dotenv()
 SEND_IN_BLUE_API_KEY = os.getenv("SEND_IN_BLUE_API_KEY")
+DOWNLOAD_LINK_SECRET: Optional[str] = os.getenv("DOWNLOAD_LINK_SECRET")
+# NOTE : Without an admin token, the profiling and admin routes are disabled.
+ADMIN_TOKEN: Optional[str] = os.getenv("ADMIN_TOKEN")
 
 with open("config.json", "r") as configData:
     ENV = os.getenv("ENV")
-    fullConfig: Dict[str, Dict[str, str]] = ujson.load(configData)
-    config: Dict[str, str] = fullConfig["PROD"] if ENV == "PROD" else fullConfig["DEV"]
+    fullConfig: Dict[str, Dict[str, Union[str, int]]] = ujson.load(configData)
+    config: Dict[str, Union[str, int]] = (
+        fullConfig["PROD"] if ENV == "PROD" else fullConfig["DEV"]
+    )
+
+# NOTE : Without a secret shared by the workers, a download link would only be valid on the
+#           worker which has signed it, until it restarts. The random secret is only used when
+#           no download link is sent.
+if config["emailDownloadLinks"] and not DOWNLOAD_LINK_SECRET:
+    raise RuntimeError("DOWNLOAD_LINK_SECRET must be set when emailDownloadLinks is enabled.")
+
+DOWNLOAD_LINK_SECRET = DOWNLOAD_LINK_SECRET or secrets.token_hex(32)
+
+# NOTE : The streamed batch archives are left out of the idempotent paths, their request body
+#           being streamed as well.
+IDEMPOTENT_PATHS: Pattern = re.compile(
+    r"^/(pdf/(?!batch$)[^/]+|pdf/merged/[^/]+|email(/bulk)?)$"
+)
+
+idempotency_store: IdempotencyStore = IdempotencyStore(
+    Path(config["idempotencyStorePath"]),
+    config["idempotencyTTL"],
+    config["idempotencyMaxEntries"],
+    config["idempotencyLease"],
+    config["idempotencyMaxBytes"],
+)
 
 middleware: List[Middleware] = [
+    Middleware(MetricsMiddleware),
     Middleware(
         CORSMiddleware,
         allow_origins=[config["apostoAppURL"], config["apostoBetaURL"]],
         allow_methods=["GET", "POST"],
-        allow_headers=["Content-Type", "Accept"],
+        allow_headers=["Content-Type", "Accept", "Idempotency-Key"],
+        expose_headers=["Idempotent-Replayed"],
+    ),
+    Middleware(
+        IdempotencyMiddleware,
+        store=idempotency_store,
+        paths=IDEMPOTENT_PATHS,
+        max_body_size=config["idempotencyMaxBodySize"],
     ),
 ]
 
-app: Starlette = Starlette(debug=True, middleware=middleware, routes=routes)
+# NOTE : The stage timings are added outside of the idempotency middleware, so that a replayed
+#           response does not carry the timings of the original request.
+if config["serverTiming"]:
+    middleware.insert(1, Middleware(ServerTimingMiddleware))
+
+# NOTE : Fonts are registered before the render workers are forked, so that they are parsed
+#           only once.
+font_registry.register()
+
+render_executor: RenderExecutor = RenderExecutor(
+    config["renderExecutor"],
+    config["renderWorkers"],
+    config["renderQueueSize"],
+    config["stackSamplerRate"],
+)
+
+invoice_cache.quota_bytes = config["pdfStoreQuotaBytes"]
+invoice_cache.ttl = config["pdfStoreTTL"]
+invoice_cache_evictor: InvoiceCacheEvictor = InvoiceCacheEvictor(
+    invoice_cache, config["pdfStoreEvictionInterval"], config["pdfStoreEvictionBatchSize"]
+)
+
+sendinblue_client: SendinBlueClient = SendinBlueClient(
+    config["sendInBlueAPIURL"],
+    SEND_IN_BLUE_API_KEY,
+    timeout=config["sendInBlueTimeout"],
+    connect_timeout=config["sendInBlueConnectTimeout"],
+    max_connections=config["sendInBlueMaxConnections"],
+    max_concurrency=config["sendInBlueMaxConcurrency"],
+    retries=config["sendInBlueRetries"],
+    retry_backoff=config["sendInBlueRetryBackoff"],
+    max_retry_delay=config["sendInBlueMaxRetryDelay"],
+    circuit_breaker=CircuitBreaker(
+        config["sendInBlueCircuitFailureThreshold"], config["sendInBlueCircuitResetTimeout"]
+    ),
+)
+
+download_link_signer: DownloadLinkSigner = DownloadLinkSigner(
+    DOWNLOAD_LINK_SECRET.encode("utf-8"), config["downloadLinkTTL"]
+)
+
+email_outbox: EmailOutbox = EmailOutbox(
+    Path(config["emailOutboxPath"]),
+    config["emailOutboxLease"],
+    config["emailOutboxRetention"],
+)
+
+# NOTE : The emails are delivered with the services set on the application state, which is
+#           looked up when each email is sent.
+email_dispatcher: EmailDispatcher = EmailDispatcher(
+    email_outbox,
+    lambda email_json: deliver_email(app, email_json),
+    config["emailDispatchRate"],
+    config["emailDispatchConcurrency"],
+    config["emailDispatchBatchSize"],
+    config["emailDispatchInterval"],
+    config["emailMaxAttempts"],
+    config["emailRetryBackoff"],
+)
+
+loop_lag_monitor: LoopLagMonitor = LoopLagMonitor(
+    config["loopLagInterval"], config["loopBlockThreshold"]
+)
+
+app: Starlette = Starlette(
+    debug=True,
+    middleware=middleware,
+    routes=routes,
+    on_startup=[
+        loop_lag_monitor.start,
+        invoice_cache_evictor.start,
+        email_dispatcher.start,
+    ],
+    on_shutdown=[
+        loop_lag_monitor.stop,
+        email_dispatcher.stop,
+        invoice_cache_evictor.stop,
+        render_executor.shutdown,
+        sendinblue_client.close,
+        mark_worker_dead,
+    ],
+)
+app.state.render_executor = render_executor
+app.state.render_flights = SingleFlight()
+app.state.sendinblue_client = sendinblue_client
+app.state.download_link_signer = download_link_signer
+app.state.email_outbox = email_outbox
+app.state.email_dispatcher = email_dispatcher
+app.state.idempotency_store = idempotency_store
+app.state.profile_store = ProfileStore(
+    Path(config["profilesPath"]), config["profilesMaxCount"]
+)
+app.state.stack_sampler = StackSampler(config["stackSamplerRate"])
+app.state.font_registration_time = font_registry.registration_time
 app.state.SEND_IN_BLUE_API_KEY = os.getenv("SEND_IN_BLUE_API_KEY")
+app.state.ADMIN_TOKEN = ADMIN_TOKEN
 
 for key in config.keys():
     setattr(app.state, key, config[key])
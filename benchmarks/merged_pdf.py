@@ -0,0 +1,41 @@
+import time
+from typing import List
+
+from models import Invoice
+from pdf_generation import MergedPDFGenerator, PDFGenerator
+from pdf_generation.contents import InvoiceContent
+from tests.commons import InvoiceContentTestCase
+
+INVOICES: int = 100
+
+
+def report(name: str, duration: float, size: int):
+    print(
+        f"{name:<8} {duration / INVOICES * 1000:8.2f} ms {size // INVOICES:8d} bytes per invoice"
+    )
+
+
+def main():
+    invoice_content_test_case: InvoiceContentTestCase = InvoiceContentTestCase()
+    invoice_content_test_case.setUp()
+    invoice_contents: List[InvoiceContent] = list(
+        InvoiceContent(Invoice(**invoice_content_test_case.invoice)) for _ in range(INVOICES)
+    )
+
+    started_at: float = time.perf_counter()
+    size: int = sum(
+        len(PDFGenerator(invoice_content).render()) for invoice_content in invoice_contents
+    )
+    duration: float = time.perf_counter() - started_at
+
+    report("separate", duration, size)
+
+    started_at: float = time.perf_counter()
+    size: int = len(MergedPDFGenerator(invoice_contents).render())
+    duration: float = time.perf_counter() - started_at
+
+    report("merged", duration, size)
+
+
+if __name__ == "__main__":
+    main()
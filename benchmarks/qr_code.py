@@ -0,0 +1,63 @@
+import timeit
+from io import BytesIO
+from typing import Callable, List, Optional
+
+from models import Invoice
+from pdf_generation.aposto_pdf import ApostoCanvas
+from pdf_generation.content import SwissQRCode
+from pdf_generation.contents import InvoiceContent
+from pdf_generation.qr_code_encoder import SwissQRCodeEncoder
+from pdf_generation.qr_invoice import QRInvoice
+from pdf_generation.qr_invoice_templates import qr_invoice_swiss_qr_code_template
+from tests.commons import InvoiceContentTestCase
+
+REPEAT: int = 5
+NUMBER: int = 50
+
+
+def draw_raster_qr_code(invoice_content: InvoiceContent) -> bytes:
+    cvs: ApostoCanvas = ApostoCanvas(BytesIO())
+    swiss_qr_code: SwissQRCode = qr_invoice_swiss_qr_code_template[0]
+    cvs._draw_image(QRInvoice(invoice_content).generate_qr_code(), swiss_qr_code.qr_code)
+
+    return cvs.getpdfdata()
+
+
+def draw_vector_qr_code(invoice_content: InvoiceContent) -> bytes:
+    cvs: ApostoCanvas = ApostoCanvas(BytesIO())
+    cvs.draw_swiss_qr_code_template(qr_invoice_swiss_qr_code_template, invoice_content)
+
+    return cvs.getpdfdata()
+
+
+def encode_qr_code(invoice_content: InvoiceContent):
+    qr_invoice: QRInvoice = QRInvoice(invoice_content)
+    SwissQRCodeEncoder().encode(qr_invoice._generate_qr_code_string())
+
+
+def benchmark(name: str, draw_qr_code: Callable, invoice_content: InvoiceContent):
+    timings: List[float] = timeit.repeat(
+        lambda: draw_qr_code(invoice_content), repeat=REPEAT, number=NUMBER
+    )
+    result: Optional[bytes] = draw_qr_code(invoice_content)
+    size: str = f"{len(result):8d} bytes" if result else ""
+
+    print(f"{name:<8} {min(timings) / NUMBER * 1000:8.2f} ms {size}")
+
+
+def main():
+    invoice_content_test_case: InvoiceContentTestCase = InvoiceContentTestCase()
+    invoice_content_test_case.setUp()
+    invoice_content: InvoiceContent = InvoiceContent(
+        Invoice(**invoice_content_test_case.invoice)
+    )
+
+    # NOTE : The vector drawing reuses the QR code matrix cached by the first run, as a
+    #           re-rendered invoice does, while the encoding is measured without the cache.
+    benchmark("raster", draw_raster_qr_code, invoice_content)
+    benchmark("vector", draw_vector_qr_code, invoice_content)
+    benchmark("encode", encode_qr_code, invoice_content)
+
+
+if __name__ == "__main__":
+    main()
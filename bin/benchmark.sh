@@ -0,0 +1,6 @@
+#!/bin/bash
+
+source venv/bin/activate
+
+python3 -m benchmarks.qr_code
+python3 -m benchmarks.merged_pdf
@@ -2,4 +2,9 @@
 
 source venv/bin/activate
 
+# NOTE : The uvicorn workers share their metrics through this directory, emptied at each start.
+export prometheus_multiproc_dir="$(pwd)/metrics"
+rm -rf "$prometheus_multiproc_dir"
+mkdir -p "$prometheus_multiproc_dir"
+
 uvicorn --host 0.0.0.0 --port 8080 --workers 4 app:app
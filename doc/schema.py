@@ -49,6 +49,38 @@ def generate_schema(app: Starlette):
                             },
                         },
                     },
+                    "RenderError": {
+                        "description": "An error occurring when the server is already generating too many invoices",
+                        "properties": {
+                            "render_error": {
+                                "description": "A readable message associated with the failure",
+                                "type": "string",
+                            }
+                        },
+                    },
+                    "EmailStatus": {
+                        "description": "The delivery status of an invoice email",
+                        "properties": {
+                            "id": {"description": "The email identifier", "type": "string"},
+                            "status": {
+                                "description": "The email status",
+                                "type": "string",
+                                "enum": ["queued", "sending", "sent", "failed"],
+                            },
+                            "attempts": {
+                                "description": "The number of delivery attempts",
+                                "type": "integer",
+                            },
+                            "message_id": {
+                                "description": "The SendinBlue message identifier, once sent",
+                                "type": "string",
+                            },
+                            "error": {
+                                "description": "The last delivery error",
+                                "type": "string",
+                            },
+                        },
+                    },
                     "SendinBlueError": {
                         "description": "An error occurring when sending an email with SendinBlue service has failed",
                         "properties": {
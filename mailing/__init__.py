@@ -0,0 +1,4 @@
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .email_dispatcher import EmailDispatcher
+from .email_outbox import EmailOutbox
+from .sendinblue_client import SendinBlueClient, SendinBlueError
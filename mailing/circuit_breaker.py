@@ -0,0 +1,60 @@
+import time
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fails fast once a remote service has failed `failure_threshold` times in a row. After
+    `reset_timeout` seconds, a single trial call is let through: its success closes the circuit
+    again, its failure keeps it open for another `reset_timeout` seconds
+    """
+
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.failures: int = 0
+        self._opened_at: float = 0.0
+        self._trial_running: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.failure_threshold:
+            return self.CLOSED
+
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+
+        return self.HALF_OPEN
+
+    def before_call(self):
+        state: str = self.state
+
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_running):
+            raise CircuitOpenError(
+                f"The circuit is open after {self.failures} failures in a row, retry later."
+            )
+
+        if state == self.HALF_OPEN:
+            self._trial_running = True
+
+    def release_trial(self):
+        """Lets another trial call through, when the running one was cancelled"""
+        self._trial_running = False
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_running = False
+
+        if self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
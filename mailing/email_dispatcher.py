@@ -0,0 +1,134 @@
+import asyncio
+import sqlite3
+import time
+from typing import Awaitable, Callable, List, Optional
+
+from .email_outbox import ClaimedEmail, EmailOutbox
+from .sendinblue_client import SendinBlueError
+
+# NOTE : Delivers an email of the outbox given as JSON and returns the SendinBlue response.
+Deliver = Callable[[str], Awaitable[dict]]
+
+# NOTE : How often the sent and failed emails past their retention are purged from the outbox.
+PURGE_INTERVAL: float = 3600
+
+
+class EmailDispatcher:
+    """
+    Sends the emails of an `EmailOutbox` in the background. At most `rate` emails are started
+    per second, by all the dispatchers sharing the outbox, and at most `concurrency` are
+    rendered and sent at once by each dispatcher, so that a burst of
+    emails neither exceeds the SendinBlue rate limits nor takes over the render workers. A
+    failed email is retried `max_attempts` times with an exponential backoff, unless SendinBlue
+    has rejected it or may already have sent it
+    """
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        deliver: Deliver,
+        rate: float = 2,
+        concurrency: int = 2,
+        batch_size: int = 10,
+        interval: float = 1,
+        max_attempts: int = 5,
+        retry_backoff: float = 30,
+    ):
+        self.outbox: EmailOutbox = outbox
+        self.deliver: Deliver = deliver
+        self.rate: float = rate
+        self.concurrency: int = concurrency
+        self.batch_size: int = batch_size
+        self.interval: float = interval
+        self.max_attempts: int = max_attempts
+        self.retry_backoff: float = retry_backoff
+        self._purged_at: float = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _is_rejected(error: Exception) -> bool:
+        return isinstance(error, SendinBlueError) and not error.retryable
+
+    async def _dispatch(self, semaphore: asyncio.Semaphore, email: ClaimedEmail):
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        email_id, email_json, attempts = email
+
+        try:
+            async with semaphore:
+                response: dict = await self.deliver(email_json)
+        except Exception as error:
+            message: str = str(error) or type(error).__name__
+
+            if self._is_rejected(error) or attempts >= self.max_attempts:
+                await loop.run_in_executor(None, self.outbox.mark_failed, email_id, message)
+            else:
+                delay: float = self.retry_backoff * 2 ** (attempts - 1)
+                await loop.run_in_executor(None, self.outbox.retry, email_id, message, delay)
+
+            return
+
+        await loop.run_in_executor(
+            None, self.outbox.mark_sent, email_id, response.get("messageId")
+        )
+
+    async def dispatch_batch(self) -> int:
+        """
+        Claims a batch of emails due to be sent and sends them, returning the batch size
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        emails: List[ClaimedEmail] = await loop.run_in_executor(
+            None, self.outbox.claim, self.batch_size
+        )
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.concurrency)
+        dispatches: List[asyncio.Future] = []
+
+        try:
+            for email in emails:
+                slot: float = await loop.run_in_executor(
+                    None, self.outbox.reserve_slot, 1 / self.rate
+                )
+                await asyncio.sleep(max(0.0, slot - time.time()))
+
+                dispatches.append(asyncio.ensure_future(self._dispatch(semaphore, email)))
+
+            await asyncio.gather(*dispatches)
+        finally:
+            # NOTE : The emails still being sent when the dispatcher stops are claimed again
+            #           once their lease expires.
+            for dispatch in dispatches:
+                dispatch.cancel()
+
+        return len(emails)
+
+    async def _purge(self):
+        if self._purged_at and time.monotonic() - self._purged_at < PURGE_INTERVAL:
+            return
+
+        await asyncio.get_event_loop().run_in_executor(None, self.outbox.purge)
+        self._purged_at = time.monotonic()
+
+    async def _run(self):
+        while True:
+            try:
+                await self._purge()
+                dispatched: int = await self.dispatch_batch()
+            except sqlite3.OperationalError:
+                dispatched: int = 0
+
+            await asyncio.sleep(0 if dispatched == self.batch_size else self.interval)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
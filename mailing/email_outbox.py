@@ -0,0 +1,207 @@
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+# NOTE : An email claimed by a dispatcher, with its identifier, its invoice JSON and its number
+#           of delivery attempts, this one included.
+ClaimedEmail = Tuple[str, str, int]
+
+
+class EmailOutbox:
+    """
+    Durable queue of the invoice emails to send, stored in SQLite. An email is claimed by a
+    dispatcher for `lease` seconds: if the process stops before the email is sent or failed,
+    the lease expires and the email is claimed again. The sent and failed emails, along with
+    the patient data of their invoice, are purged `retention` seconds after their last update
+    """
+
+    QUEUED: str = "queued"
+    SENDING: str = "sending"
+    SENT: str = "sent"
+    FAILED: str = "failed"
+
+    def __init__(self, path: Path, lease: float = 300, retention: float = 604800):
+        self.path: Path = path
+        self.lease: float = lease
+        self.retention: float = retention
+
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            connection: sqlite3.Connection = sqlite3.connect(
+                self.path.as_posix(), timeout=10, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS emails ("
+                "id TEXT PRIMARY KEY, invoice TEXT NOT NULL, status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "message_id TEXT, error TEXT)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS emails_next_attempt_at "
+                "ON emails (status, next_attempt_at)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS emails_updated_at ON emails (status, updated_at)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS send_slots ("
+                "id INTEGER PRIMARY KEY CHECK (id = 1), next_slot REAL NOT NULL)"
+            )
+            connection.commit()
+
+            self._connection = connection
+
+        return self._connection
+
+    def enqueue(self, invoice: str) -> str:
+        email_id: str = uuid.uuid4().hex
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.execute(
+                "INSERT INTO emails (id, invoice, status, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (email_id, invoice, self.QUEUED, now, now, now),
+            )
+            self.connection.commit()
+
+        return email_id
+
+    def get(self, email_id: str) -> Optional[Dict[str, Union[str, int, float, None]]]:
+        with self._lock:
+            row: Optional[tuple] = self.connection.execute(
+                "SELECT id, status, attempts, created_at, updated_at, message_id, error "
+                "FROM emails WHERE id = ?",
+                (email_id,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return dict(
+            zip(
+                ("id", "status", "attempts", "created_at", "updated_at", "message_id", "error"),
+                row,
+            )
+        )
+
+    def claim(self, batch_size: int) -> List[ClaimedEmail]:
+        """
+        Claims at most `batch_size` emails due to be sent, oldest first, including the emails
+        whose lease has expired
+        """
+        now: float = time.time()
+
+        with self._lock:
+            # NOTE : The write lock is taken before reading, so that two processes sharing the
+            #           outbox never claim the same email.
+            self.connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                claimed: List[ClaimedEmail] = [
+                    (email_id, invoice, attempts + 1)
+                    for email_id, invoice, attempts in self.connection.execute(
+                        "SELECT id, invoice, attempts FROM emails "
+                        "WHERE status IN (?, ?) AND next_attempt_at <= ? "
+                        "ORDER BY next_attempt_at LIMIT ?",
+                        (self.QUEUED, self.SENDING, now, batch_size),
+                    )
+                ]
+                self.connection.executemany(
+                    "UPDATE emails SET status = ?, attempts = ?, next_attempt_at = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    list(
+                        (self.SENDING, attempts, now + self.lease, now, email_id)
+                        for email_id, _, attempts in claimed
+                    ),
+                )
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                raise
+
+        return claimed
+
+    def reserve_slot(self, interval: float) -> float:
+        """
+        Reserves the next send slot, shared by all the dispatchers of the outbox, and returns
+        its time. The slots are `interval` seconds apart, so that the emails are sent at the
+        same rate whatever the number of dispatching processes
+        """
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                row: Optional[tuple] = self.connection.execute(
+                    "SELECT next_slot FROM send_slots WHERE id = 1"
+                ).fetchone()
+                slot: float = max(now, row[0]) if row is not None else now
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO send_slots (id, next_slot) VALUES (1, ?)",
+                    (slot + interval,),
+                )
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                raise
+
+        return slot
+
+    def purge(self) -> int:
+        """
+        Deletes the sent and failed emails older than the retention, returning their number
+        """
+        with self._lock:
+            purged: int = self.connection.execute(
+                "DELETE FROM emails WHERE status IN (?, ?) AND updated_at < ?",
+                (self.SENT, self.FAILED, time.time() - self.retention),
+            ).rowcount
+            self.connection.commit()
+
+        return purged
+
+    def _update(self, email_id: str, status: str, next_attempt_at: float, **columns):
+        now: float = time.time()
+        assignments: str = "".join(f", {column} = ?" for column in columns)
+
+        with self._lock:
+            self.connection.execute(
+                f"UPDATE emails SET status = ?, next_attempt_at = ?, updated_at = ?{assignments} "
+                "WHERE id = ?",
+                (status, next_attempt_at, now, *columns.values(), email_id),
+            )
+            self.connection.commit()
+
+    def mark_sent(self, email_id: str, message_id: Optional[str]):
+        self._update(email_id, self.SENT, 0, message_id=message_id, error=None)
+
+    def retry(self, email_id: str, error: str, delay: float):
+        self._update(email_id, self.QUEUED, time.time() + delay, error=error)
+
+    def mark_failed(self, email_id: str, error: str):
+        self._update(email_id, self.FAILED, 0, error=error)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts: Dict[str, int] = dict(
+                self.connection.execute("SELECT status, COUNT(*) FROM emails GROUP BY status")
+            )
+
+        return {
+            status: counts.get(status, 0)
+            for status in (self.QUEUED, self.SENDING, self.SENT, self.FAILED)
+        }
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple, Type
+
+import httpcore
+import httpx
+
+from monitoring import SENDINBLUE_REQUEST_SECONDS
+from .circuit_breaker import CircuitBreaker
+
+RETRIED_STATUS_CODES: frozenset = frozenset((429, 500, 502, 503, 504))
+
+# NOTE : Only the errors raised before the request is sent are retried. Any other transport
+#           error, such as a read timeout, may occur once SendinBlue has accepted the email,
+#           which a retry would send twice.
+RETRIED_TRANSPORT_ERRORS: Tuple[Type[httpx.TransportError], ...] = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+
+class SendinBlueError(Exception):
+    """
+    A SendinBlue API call that has not succeeded, with the status code and the error body
+    returned by SendinBlue, or made-up ones when no response has been received. It is
+    `retryable` unless the email has been rejected or may already have been sent
+    """
+
+    def __init__(
+        self, status_code: int, body: Dict[str, str], retryable: Optional[bool] = None
+    ):
+        super().__init__(body.get("message", ""))
+        self.status_code: int = status_code
+        self.body: Dict[str, str] = body
+        self.retryable: bool = (
+            status_code in RETRIED_STATUS_CODES if retryable is None else retryable
+        )
+
+
+class SendinBlueClient:
+    """
+    Asynchronous SendinBlue API client. It keeps its connections alive between calls, bounds
+    the number of concurrent calls, retries the rate-limited and failed calls with an
+    exponential backoff and stops calling SendinBlue while its circuit breaker is open
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        api_key: Optional[str],
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        max_connections: int = 10,
+        max_concurrency: int = 10,
+        retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_retry_delay: float = 30.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[httpcore.AsyncHTTPTransport] = None,
+    ):
+        self.api_url: str = api_url
+        self.api_key: Optional[str] = api_key
+        self.timeout: httpx.Timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits: httpx.Limits = httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections
+        )
+        self.max_concurrency: int = max_concurrency
+        self.retries: int = retries
+        self.retry_backoff: float = retry_backoff
+        self.max_retry_delay: float = max_retry_delay
+        self.circuit_breaker: CircuitBreaker = (
+            circuit_breaker if circuit_breaker is not None else CircuitBreaker()
+        )
+        self.transport: Optional[httpcore.AsyncHTTPTransport] = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # NOTE : The client and the semaphore are created on the first call, so that they
+        #           belong to the event loop of the worker.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.api_url,
+                headers={
+                    "accept": "application/json",
+                    "content-type": "application/json",
+                    "api-key": self.api_key or "",
+                },
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+
+        return self._client
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        retry_after: Optional[str] = (
+            response.headers.get("retry-after") if response is not None else None
+        )
+
+        # NOTE : The delay is capped so that an email is sent, or given back to the outbox,
+        #           long before its outbox lease expires and another worker claims it.
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self.max_retry_delay)
+
+        return min(self.retry_backoff * 2 ** attempt, self.max_retry_delay)
+
+    async def _post_once(self, path: str, content: bytes) -> httpx.Response:
+        self.circuit_breaker.before_call()
+
+        try:
+            async with self.semaphore:
+                started_at: float = time.perf_counter()
+
+                try:
+                    response: httpx.Response = await self.client.post(path, content=content)
+                except Exception:
+                    SENDINBLUE_REQUEST_SECONDS.labels("error").observe(
+                        time.perf_counter() - started_at
+                    )
+                    raise
+
+                SENDINBLUE_REQUEST_SECONDS.labels(str(response.status_code)).observe(
+                    time.perf_counter() - started_at
+                )
+        except asyncio.CancelledError:
+            # NOTE : A cancellation, when the client disconnects or the worker stops, is not a
+            #           SendinBlue failure, but it must not keep a half-open trial running.
+            self.circuit_breaker.release_trial()
+            raise
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+
+        if response.status_code in RETRIED_STATUS_CODES:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+        return response
+
+    async def post(self, path: str, content: bytes) -> dict:
+        response: Optional[httpx.Response] = None
+
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(self._retry_delay(attempt - 1, response))
+
+            try:
+                response = await self._post_once(path, content)
+            except RETRIED_TRANSPORT_ERRORS as transport_error:
+                response = None
+
+                if attempt == self.retries:
+                    raise SendinBlueError(
+                        503, {"code": "unreachable", "message": str(transport_error)}
+                    )
+
+                continue
+            except httpx.TransportError as transport_error:
+                raise SendinBlueError(
+                    502,
+                    {
+                        "code": "delivery_unknown",
+                        "message": f"{type(transport_error).__name__}: {transport_error}",
+                    },
+                    retryable=False,
+                )
+
+            if response.status_code not in RETRIED_STATUS_CODES:
+                break
+
+        # NOTE : A proxy in front of SendinBlue may answer an error with an HTML page.
+        try:
+            body: dict = response.json() if response.content else {}
+        except ValueError:
+            body: dict = {"message": response.text}
+
+        if response.is_error:
+            raise SendinBlueError(response.status_code, body)
+
+        return body
+
+    async def send_email(self, email: bytes) -> dict:
+        return await self.post("/smtp/email", email)
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
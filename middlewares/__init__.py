@@ -0,0 +1,9 @@
+from .idempotency import (
+    IdempotencyConflictError,
+    IdempotencyKeyReusedError,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    StoredResponse,
+)
+from .metrics import MetricsMiddleware
+from .server_timing import ServerTimingMiddleware
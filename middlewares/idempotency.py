@@ -0,0 +1,352 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Pattern, Tuple
+
+import ujson
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import Response, UJSONResponse
+from starlette.status import (
+    HTTP_400_BAD_REQUEST,
+    HTTP_409_CONFLICT,
+    HTTP_422_UNPROCESSABLE_ENTITY,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+IDEMPOTENCY_KEY_HEADER: str = "idempotency-key"
+REPLAYED_HEADER: str = "idempotent-replayed"
+MAX_KEY_LENGTH: int = 255
+
+
+class IdempotencyConflictError(Exception):
+    pass
+
+
+class IdempotencyKeyReusedError(Exception):
+    pass
+
+
+class StoredResponse(NamedTuple):
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+class IdempotencyStore:
+    """
+    Bounded SQLite store of the responses to the requests sent with an idempotency key. A key
+    is pending while its first request is handled, for at most `lease` seconds, then its
+    response is kept for `ttl` seconds. At most `max_entries` responses, with bodies of at most
+    `max_bytes` bytes in total, are kept, the oldest ones being purged first
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = 86400,
+        max_entries: int = 1000,
+        lease: float = 60,
+        max_bytes: int = 268435456,
+    ):
+        self.path: Path = path
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.lease: float = lease
+        self.max_bytes: int = max_bytes
+
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            connection: sqlite3.Connection = sqlite3.connect(
+                self.path.as_posix(), timeout=10, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, completed INTEGER NOT NULL, "
+                "status_code INTEGER, headers TEXT, body BLOB, "
+                "size INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL)"
+            )
+
+            # NOTE : The stores created before the responses were bounded in bytes lack their
+            #           size.
+            if "size" not in {
+                column[1] for column in connection.execute("PRAGMA table_info(responses)")
+            }:
+                connection.execute(
+                    "ALTER TABLE responses ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+                )
+                connection.execute("UPDATE responses SET size = COALESCE(LENGTH(body), 0)")
+
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at)"
+            )
+            connection.commit()
+
+            self._connection = connection
+
+        return self._connection
+
+    def _is_expired(self, completed: bool, created_at: float, now: float) -> bool:
+        return created_at < now - (self.ttl if completed else self.lease)
+
+    def _purge(self, now: float):
+        """
+        Deletes the expired responses, then the oldest ones beyond `max_entries` or
+        `max_bytes`
+        """
+        self.connection.execute(
+            "DELETE FROM responses WHERE created_at < ? OR (completed = 0 AND created_at < ?)",
+            (now - self.ttl, now - self.lease),
+        )
+        self.connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self.connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY created_at DESC) AS total "
+            "FROM responses) WHERE total > ?)",
+            (self.max_bytes,),
+        )
+
+    def begin(self, key: str, fingerprint: str) -> Optional[StoredResponse]:
+        """
+        Returns the stored response of a key or, if there is none yet, marks the key as
+        pending and returns `None`
+        """
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                self._purge(now)
+                row: Optional[tuple] = self.connection.execute(
+                    "SELECT fingerprint, completed, status_code, headers, body, created_at "
+                    "FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+
+                if row is not None and self._is_expired(row[1], row[5], now):
+                    self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+
+                if row is None:
+                    self.connection.execute(
+                        "INSERT INTO responses (key, fingerprint, completed, created_at) "
+                        "VALUES (?, ?, 0, ?)",
+                        (key, fingerprint, now),
+                    )
+                    self.connection.commit()
+
+                    return None
+
+                self.connection.commit()
+            except BaseException:
+                self.connection.rollback()
+                raise
+
+        stored_fingerprint, completed, status_code, headers, body, _ = row
+
+        if stored_fingerprint != fingerprint:
+            raise IdempotencyKeyReusedError(
+                "This idempotency key has already been used for another request."
+            )
+
+        if not completed:
+            raise IdempotencyConflictError(
+                "A request with this idempotency key is still being handled."
+            )
+
+        return StoredResponse(
+            status_code, [tuple(header) for header in ujson.loads(headers)], body
+        )
+
+    def complete(self, key: str, response: StoredResponse):
+        with self._lock:
+            self.connection.execute(
+                "UPDATE responses SET completed = 1, status_code = ?, headers = ?, body = ?, "
+                "size = ? WHERE key = ?",
+                (
+                    response.status_code,
+                    ujson.dumps(response.headers),
+                    response.body,
+                    len(response.body),
+                    key,
+                ),
+            )
+            self._purge(time.time())
+            self.connection.commit()
+
+    def abandon(self, key: str):
+        with self._lock:
+            self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.connection.commit()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class IdempotencyMiddleware:
+    """
+    Handles the `POST` requests sent with an `Idempotency-Key` header once: the response to
+    the first request is stored and the retries get it back without the request being handled
+    again. The server errors and the responses larger than `max_body_size` are not stored, so
+    that they can be retried
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        store: IdempotencyStore,
+        paths: Pattern = re.compile(".*"),
+        max_body_size: int = 5242880,
+    ):
+        self.app: ASGIApp = app
+        self.store: IdempotencyStore = store
+        self.paths: Pattern = paths
+        self.max_body_size: int = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not self.paths.match(scope["path"])
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key: Optional[str] = Headers(scope=scope).get(IDEMPOTENCY_KEY_HEADER)
+
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            response: Response = UJSONResponse(
+                {
+                    "idempotency_error": f"The idempotency key must have between 1 and {MAX_KEY_LENGTH} characters."
+                },
+                status_code=HTTP_400_BAD_REQUEST,
+            )
+            await response(scope, receive, send)
+            return
+
+        body: bytes = await self._read_body(receive)
+        key: str = f"{scope['method']} {scope['path']} {idempotency_key}"
+        fingerprint: str = hashlib.sha256(
+            scope.get("query_string", b"") + b"\n" + body
+        ).hexdigest()
+
+        try:
+            stored_response: Optional[StoredResponse] = await run_in_threadpool(
+                self.store.begin, key, fingerprint
+            )
+        except IdempotencyConflictError as conflict_error:
+            response: Response = UJSONResponse(
+                {"idempotency_error": str(conflict_error)}, status_code=HTTP_409_CONFLICT
+            )
+            await response(scope, receive, send)
+            return
+        except IdempotencyKeyReusedError as key_reused_error:
+            response: Response = UJSONResponse(
+                {"idempotency_error": str(key_reused_error)},
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+            await response(scope, receive, send)
+            return
+
+        if stored_response is not None:
+            await self._replay(stored_response, send)
+            return
+
+        await self._handle(scope, receive, send, key, body)
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks: List[bytes] = []
+        more_body: bool = True
+
+        while more_body:
+            message: Message = await receive()
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(stored_response: StoredResponse, send: Send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": stored_response.status_code,
+                "headers": [
+                    (name.encode("latin-1"), value.encode("latin-1"))
+                    for name, value in stored_response.headers
+                ]
+                + [(REPLAYED_HEADER.encode("latin-1"), b"true")],
+            }
+        )
+        await send({"type": "http.response.body", "body": stored_response.body})
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send, key: str, body: bytes):
+        body_sent: bool = False
+        status_code: int = 500
+        headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+        size: int = 0
+
+        # NOTE : The request body, already read, is given back to the application. The
+        #           following messages, such as the client disconnection, are still received.
+        async def receive_body() -> Message:
+            nonlocal body_sent
+
+            if body_sent:
+                return await receive()
+
+            body_sent = True
+
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send_and_record(message: Message):
+            nonlocal status_code, headers, size
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body" and size <= self.max_body_size:
+                chunk: bytes = message.get("body", b"")
+                chunks.append(chunk)
+                size += len(chunk)
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_and_record)
+        except BaseException:
+            await run_in_threadpool(self.store.abandon, key)
+            raise
+
+        if status_code >= 500 or size > self.max_body_size:
+            await run_in_threadpool(self.store.abandon, key)
+            return
+
+        await run_in_threadpool(
+            self.store.complete, key, StoredResponse(status_code, headers, b"".join(chunks))
+        )
@@ -0,0 +1,56 @@
+import time
+from typing import Callable, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from monitoring import REQUEST_SECONDS, REQUEST_STAGE_SECONDS
+
+
+def _route_name(scope: Scope) -> str:
+    endpoint: Optional[Callable] = scope.get("endpoint")
+
+    if endpoint is None:
+        return "unknown"
+
+    return getattr(endpoint, "__name__", "unknown").replace("_endpoint", "")
+
+
+class MetricsMiddleware:
+    """
+    Records the duration of every request, by route and status code, and the time spent
+    sending its response
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at: float = time.perf_counter()
+        response_started_at: Optional[float] = None
+        status_code: int = 500
+
+        async def send_and_record(message: Message):
+            nonlocal response_started_at, status_code
+
+            if message["type"] == "http.response.start":
+                response_started_at = time.perf_counter()
+                status_code = message["status"]
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_record)
+        finally:
+            ended_at: float = time.perf_counter()
+            route: str = _route_name(scope)
+
+            REQUEST_SECONDS.labels(route, str(status_code)).observe(ended_at - started_at)
+
+            if response_started_at is not None:
+                REQUEST_STAGE_SECONDS.labels(route, "send").observe(
+                    ended_at - response_started_at
+                )
@@ -0,0 +1,39 @@
+from typing import Dict
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from monitoring import stage_timings
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(
+        f"{stage};dur={duration * 1000:.3f}" for stage, duration in timings.items()
+    )
+
+
+class ServerTimingMiddleware:
+    """
+    Reports the duration of the stages of a request, up to its response, in milliseconds in
+    the `Server-Timing` header, so that they show in the browser developer tools
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with stage_timings() as timings:
+
+            async def send_with_server_timing(message: Message):
+                if message["type"] == "http.response.start" and timings:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing(timings)
+                    )
+
+                await send(message)
+
+            await self.app(scope, receive, send_with_server_timing)
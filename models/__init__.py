@@ -2,4 +2,5 @@ from .author import Author
 from .invoice import Invoice
 from .patient import Patient
 from .service import Service
+from .tarif_590 import ServiceCode, ServiceCodeCatalogue, tarif_590
 from .therapist import Therapist
@@ -1,6 +1,6 @@
 from datetime import datetime
 import re
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Pattern, Tuple, Union
 
 from pydantic import BaseModel, Field, validator
 from pydantic.fields import ModelField
@@ -10,6 +10,23 @@ from .patient import Patient
 from .service import Service
 from .therapist import Therapist
 
+QR_IBAN_PATTERN: Pattern = re.compile(r"^CH[0-9]{2}3[0-1][0-9]{15}$")
+
+QR_REFERENCE_CHECKSUM_MATRIX: Tuple[Tuple[int, ...], ...] = (
+    (0, 9, 4, 6, 8, 2, 7, 1, 3, 5),
+    (9, 4, 6, 8, 2, 7, 1, 3, 5, 0),
+    (4, 6, 8, 2, 7, 1, 3, 5, 0, 9),
+    (6, 8, 2, 7, 1, 3, 5, 0, 9, 4),
+    (8, 2, 7, 1, 3, 5, 0, 9, 4, 6),
+    (2, 7, 1, 3, 5, 0, 9, 4, 6, 8),
+    (7, 1, 3, 5, 0, 9, 4, 6, 8, 2),
+    (1, 3, 5, 0, 9, 4, 6, 8, 2, 7),
+    (3, 5, 0, 9, 4, 6, 8, 2, 7, 1),
+    (5, 0, 9, 4, 6, 8, 2, 7, 1, 3),
+)
+
+QR_REFERENCE_CHECKSUM_KEY: Tuple[int, ...] = (0, 9, 8, 7, 6, 5, 4, 3, 2, 1)
+
 
 class Invoice(BaseModel):
     """
@@ -74,7 +91,7 @@ class Invoice(BaseModel):
 
     @property
     def reference_type(self) -> str:
-        if re.match(r"^CH[0-9]{2}3[0-1][0-9]{15}$", self.author.iban):
+        if QR_IBAN_PATTERN.match(self.author.iban):
             return "QRR"
 
         return "SCOR"
@@ -90,33 +107,19 @@ class Invoice(BaseModel):
     def _creditor_reference(self) -> str:
         timestamp: int = int(self.timestamp.timestamp() * 1000)
 
-        for i in range(0, 10):
-            for j in range(0, 10):
-                if int(f"{timestamp}2715{i}{j}") % 97 == 1:
-                    return f"RF{i}{j}{timestamp}"
+        # NOTE : ISO 11649 check digits: "RF" is appended as 2715 with the check digits set to
+        #           00, and the check digits are then 98 minus the remainder modulo 97.
+        check_digits: int = 98 - int(f"{timestamp}271500") % 97
+
+        return f"RF{check_digits:02d}{timestamp}"
 
     @property
     def _qr_reference(self) -> str:
         _qr_reference: str = f"{int(self.timestamp.timestamp() * 1000)}".rjust(26, "0")
 
-        checksum_matrix = [
-            [0, 9, 4, 6, 8, 2, 7, 1, 3, 5],
-            [9, 4, 6, 8, 2, 7, 1, 3, 5, 0],
-            [4, 6, 8, 2, 7, 1, 3, 5, 0, 9],
-            [6, 8, 2, 7, 1, 3, 5, 0, 9, 4],
-            [8, 2, 7, 1, 3, 5, 0, 9, 4, 6],
-            [2, 7, 1, 3, 5, 0, 9, 4, 6, 8],
-            [7, 1, 3, 5, 0, 9, 4, 6, 8, 2],
-            [1, 3, 5, 0, 9, 4, 6, 8, 2, 7],
-            [3, 5, 0, 9, 4, 6, 8, 2, 7, 1],
-            [5, 0, 9, 4, 6, 8, 2, 7, 1, 3],
-        ]
-
-        checksum_key = [0, 9, 8, 7, 6, 5, 4, 3, 2, 1]
-
         report: int = 0
 
-        for i in range(0, len(_qr_reference)):
-            report = checksum_matrix[report][int(_qr_reference[i])]
+        for digit in _qr_reference:
+            report = QR_REFERENCE_CHECKSUM_MATRIX[report][int(digit)]
 
-        return f"{_qr_reference}{checksum_key[report]}"
+        return f"{_qr_reference}{QR_REFERENCE_CHECKSUM_KEY[report]}"
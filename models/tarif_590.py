@@ -0,0 +1,159 @@
+from typing import Dict, Iterable, List, NamedTuple
+
+DEFAULT_LANGUAGE: str = "fr"
+
+TARIF_590_VERSION: str = "1"
+
+
+class ServiceCode(NamedTuple):
+    """
+    A Tarif 590 service code, with its label in each available language
+    """
+
+    code: int
+    labels: Dict[str, str]
+
+    def label(self, language: str = DEFAULT_LANGUAGE) -> str:
+        return self.labels.get(language, self.labels[DEFAULT_LANGUAGE])
+
+
+class ServiceCodeCatalogue:
+    """
+    The service codes of a version of the Tarif 590 standard, indexed by code. It is built once
+    and shared by the `Service` model validation and the invoice rendering
+    """
+
+    def __init__(self, version: str, service_codes: Iterable[ServiceCode]):
+        self.version: str = version
+        self._service_codes: Dict[int, ServiceCode] = dict(
+            (service_code.code, service_code) for service_code in service_codes
+        )
+
+    def __contains__(self, code: int) -> bool:
+        return code in self._service_codes
+
+    def __len__(self) -> int:
+        return len(self._service_codes)
+
+    @property
+    def codes(self) -> List[int]:
+        return list(self._service_codes)
+
+    def get(self, code: int) -> ServiceCode:
+        return self._service_codes[code]
+
+    def label(self, code: int, language: str = DEFAULT_LANGUAGE) -> str:
+        return self._service_codes[code].label(language)
+
+
+SERVICE_CODE_LABELS_FR: Dict[int, str] = {
+    1003: "Acupressure, par période de 5 minutes",
+    1004: "Acupuncture, par période de 5 minutes",
+    1005: "Massage des points d’acupuncture, par période de 5 minutes",
+    1006: "Technique Alexander, par période de 5 minutes",
+    1008: (
+        "Médécine anthroposophique, traitement/consultation, par période de 5 minutes"
+    ),
+    1010: "Aromathérapie, par période de 5 minutes",
+    1012: "Thérapie respiratoire, par période de 5 minutes",
+    1013: "Atlaslogie, par période de 5 minutes",
+    1014: "Audio-psycho-phonologie/Tomatis, par période de 5 minutes",
+    1017: "Training autogène, par période de 5 minutes",
+    1021: "Massage ayurvédique, par période de 5 minutes",
+    1022: "Thérapie des fleurs de Bach, par période de 5 minutes",
+    1024: "Thérapie par le mouvement (intégrat./cliniq.), par période de 5 minutes",
+    1025: "Massage du tissu conjonctif, par période de 5 minutes",
+    1026: "Biofeedback, par période de 5 minutes",
+    1027: "Biorésonance, par période de 5 minutes",
+    1028: "Biochimie selon Schüssler, par période de 5 minutes",
+    1029: "Psychologie biodynamique/Biodynamique, par période de 5 minutes",
+    1030: "Sangsues, par période de 5 minutes",
+    1032: "Hydrothérapie du côlon, par période de 5 minutes",
+    1033: "Massage du côlon, par période de 5 minutes",
+    1034: "Thérapie crâniosacrale, par période de 5 minutes",
+    1039: "Électrothérapie, par période de 5 minutes",
+    1045: "Massage ésalien, par période de 5 minutes",
+    1047: "Eutonie Gerda Alexander, par période de 5 minutes",
+    1048: "Chromopuncture, par période de 5 minutes",
+    1049: "Thérapie par la couleur, par période de 5 minutes",
+    1050: "Fasciathérapie, par période de 5 minutes",
+    1051: "Méthode Feldenkrais, par période de 5 minutes",
+    1052: "Massage des zones réflexes du pied, par période de 5 minutes",
+    1054: "Yoga thérapie, par période de 5 minutes",
+    1055: "Eurythmie thérapeutique, par période de 5 minutes",
+    1056: "Hippothérapie, par période de 5 minutes",
+    1057: "Homéopathie, par période de 5 minutes",
+    1058: "Hydrothérapie, par période de 5 minutes",
+    1060: "Kinésiologie, par période de 5 minutes",
+    1061: "Thérapie sonore, par période de 5 minutes",
+    1062: "Massage classique, par période de 5 minutes",
+    1063: "Thérapie selon Kneipp, par période de 5 minutes",
+    1064: "Acupuncture par laser, par période de 5 minutes",
+    1065: "Thérapie par la lumière, par période de 5 minutes",
+    1066: "Drainage lymphatique (manuel), par période de 5 minutes",
+    1067: "Magnétothérapie/thérapie par champs magnétiques, par période de 5 minutes",
+    1068: "Thérapie par la peinture, par période de 5 minutes",
+    1069: "Mésothérapie, par période de 5 minutes",
+    1070: "Massage métamorphique, par période de 5 minutes",
+    1071: "Moxibustion, par période de 5 minutes",
+    1072: "Musicothérapie, par période de 5 minutes",
+    1076: "Neurofeedback, par période de 5 minutes",
+    1077: "Acupuncture des oreilles, par période de 5 minutes",
+    1079: "Otothérapie par les bougies, par période de 5 minutes",
+    1080: "Formation du mouvement rythmo-organique Medau, par période de 5 minutes",
+    1081: "Ortho-Bionomy, par période de 5 minutes",
+    1082: "Thérapie orthomoléculaire, par période de 5 minutes",
+    1084: "Thérapie par l’ozone, par période de 5 minutes",
+    1085: "Phytothérapie, par période de 5 minutes",
+    1087: "Polarité, par période de 5 minutes",
+    1088: "Intégration posturale, par période de 5 minutes",
+    1089: "Psychomotricité, par période de 5 minutes",
+    1091: "Thérapie de théâtre de marionnettes, par période de 5 minutes",
+    1092: "Qi Gong, par période de 5 minutes",
+    1093: "Rééquilibration, par période de 5 minutes",
+    1094: "Thérapie par nouvelle naissance, par période de 5 minutes",
+    1096: "Reiki, par période de 5 minutes",
+    1097: "Rolfing/intégration structurelle, par période de 5 minutes",
+    1098: "Massages rythmiques anthrop., par période de 5 minutes",
+    1100: "Shiatsu, par période de 5 minutes",
+    1102: "Sophrologie, par période de 5 minutes",
+    1104: "Thérapie Sumathu, par période de 5 minutes",
+    1105: "Sympathicothérapie, par période de 5 minutes",
+    1106: "Tai Chi, par période de 5 minutes",
+    1111: "Massage thaï, par période de 5 minutes",
+    1114: "Médecine tibétaine, traitement/consultation, par période de 5 minutes",
+    1115: "Touch for Health, par période de 5 minutes",
+    1117: "Massage selon Trager, par période de 5 minutes",
+    1120: "Vitalpratique selon Vuille, par période de 5 minutes",
+    1121: "Cataplasmes/enveloppements/fango, par période de 5 minutes",
+    1122: "Équilibration vertébrale, par période de 5 minutes",
+    1123: "Zilgrei, par période de 5 minutes",
+    1131: "Thérapie à médiation plastique, par période de 5 minutes",
+    1132: "Thérapie intermédiale, par période de 5 minutes",
+    1134: "Réflexothérapie, par période de 5 minutes",
+    1140: "Microkinésithérapie",
+    1141: "Thérapie Dorn/Breuss, par période de 5 minutes",
+    1142: "Spagyrie, par période de 5 minutes",
+    1200: (
+        "anamnèse / bilan / diagnostique / constatations médicales, par période de 5 minutes"
+    ),
+    1202: "Art de parole thérapeutique, par période de 5 minutes",
+    1203: "Ostéopathie, par période de 5 minutes",
+    1204: "Etiopathie, par période de 5 minutes",
+    1205: "Méthodes de détoxication, par période de 5 minutess",
+    1206: "thérapie nutritionnelle, par période de 5 minutes",
+    1207: "Thérapie de l'ordre / Diététique, par période de 5 minutes",
+    1210: "Spiraldynamik, par période de 5 minutes",
+}
+
+TARIF_590_CATALOGUES: Dict[str, ServiceCodeCatalogue] = {
+    TARIF_590_VERSION: ServiceCodeCatalogue(
+        TARIF_590_VERSION,
+        (
+            ServiceCode(code, {"fr": label})
+            for code, label in SERVICE_CODE_LABELS_FR.items()
+        ),
+    )
+}
+
+tarif_590: ServiceCodeCatalogue = TARIF_590_CATALOGUES[TARIF_590_VERSION]
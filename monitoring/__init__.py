@@ -0,0 +1,24 @@
+from .loop_lag import LoopLagMonitor
+from .metrics import (
+    LOOP_BLOCKS,
+    LOOP_LAG_SECONDS,
+    RENDER_CACHE_LOOKUPS,
+    RENDER_IN_FLIGHT,
+    RENDER_QUEUE_DEPTH,
+    RENDER_STAGE_SECONDS,
+    RENDER_WAIT_SECONDS,
+    REQUEST_SECONDS,
+    REQUEST_STAGE_SECONDS,
+    SENDINBLUE_REQUEST_SECONDS,
+    mark_worker_dead,
+    metrics_registry,
+)
+from .profiles import ProfileStore
+from .stack_sampler import ProcessStackSampler, StackSampler
+from .stages import (
+    add_stage_timings,
+    collect_stage_timings,
+    render_stage,
+    request_stage,
+    stage_timings,
+)
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+from typing import Optional
+
+from .metrics import LOOP_BLOCKS, LOOP_LAG_SECONDS
+
+logger: logging.Logger = logging.getLogger("aposto.loop")
+
+
+def _blocking_route(frame: Optional[FrameType]) -> str:
+    """
+    Finds the route blocking the event loop from the innermost endpoint in its stack
+    """
+    while frame is not None:
+        if frame.f_code.co_name.endswith("_endpoint"):
+            return frame.f_code.co_name.replace("_endpoint", "")
+
+        frame = frame.f_back
+
+    return "unknown"
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a task sleeping for `interval` seconds, which is
+    the time it has been blocked by synchronous code. A watchdog thread logs the stack of the
+    event loop, along with the route running, whenever it is blocked past `threshold` seconds
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.5):
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self._heartbeat: float = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._loop_thread_ident: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+
+    async def _run(self):
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+        while True:
+            self._heartbeat = time.monotonic()
+            scheduled_at: float = loop.time()
+            await asyncio.sleep(self.interval)
+
+            LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - scheduled_at - self.interval))
+
+    def _report(self, blocked_time: float):
+        frame: Optional[FrameType] = sys._current_frames().get(self._loop_thread_ident)
+        route: str = _blocking_route(frame)
+
+        LOOP_BLOCKS.labels(route).inc()
+        logger.warning(
+            "The event loop has been blocked for %.3f s by the %s route:\n%s",
+            blocked_time,
+            route,
+            "".join(traceback.format_stack(frame)) if frame is not None else "",
+        )
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            heartbeat: float = self._heartbeat
+            blocked_time: float = time.monotonic() - heartbeat - self.interval
+
+            # NOTE : A blocking call is reported once, while it is still running, so that its
+            #           stack is the one of the code blocking the event loop.
+            if blocked_time >= self.threshold and heartbeat != self._reported_heartbeat:
+                self._reported_heartbeat = heartbeat
+                self._report(blocked_time)
+
+    def start(self):
+        self._loop_thread_ident = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._run())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._stopped.set()
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._watchdog.join()
+        self._task = None
+        self._watchdog = None
@@ -0,0 +1,99 @@
+import os
+from typing import Optional, Tuple
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client import multiprocess
+
+# NOTE : With several uvicorn workers, every worker writes its metrics in this directory and
+#           the `/metrics` endpoint aggregates them, whichever worker handles it.
+MULTIPROCESS_DIRECTORY: Optional[str] = os.getenv("prometheus_multiproc_dir")
+
+STAGE_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+REQUEST_SECONDS: Histogram = Histogram(
+    "aposto_request_seconds",
+    "Time spent handling a request, from its reception to the end of its response",
+    ["route", "status_code"],
+    buckets=STAGE_BUCKETS,
+)
+REQUEST_STAGE_SECONDS: Histogram = Histogram(
+    "aposto_request_stage_seconds",
+    "Time spent in each stage of a request: parse, validation, content, render, enqueue, "
+    "send and, for the email deliveries of the outbox, sendinblue",
+    ["route", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+RENDER_STAGE_SECONDS: Histogram = Histogram(
+    "aposto_render_stage_seconds",
+    "Time spent in each stage of a PDF rendering: drawing, qr_encoding, which is part of "
+    "the drawing, and save",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+RENDER_CACHE_LOOKUPS: Counter = Counter(
+    "aposto_render_cache_lookups",
+    "Lookups of a rendered invoice in the invoice cache, by result",
+    ["result"],
+)
+RENDER_IN_FLIGHT: Gauge = Gauge(
+    "aposto_render_in_flight",
+    "Renders running or waiting in the render executors",
+    multiprocess_mode="livesum",
+)
+RENDER_QUEUE_DEPTH: Gauge = Gauge(
+    "aposto_render_queue_depth",
+    "Renders waiting for a render worker",
+    multiprocess_mode="livesum",
+)
+RENDER_WAIT_SECONDS: Histogram = Histogram(
+    "aposto_render_wait_seconds",
+    "Time spent by a render waiting for a render worker",
+    buckets=STAGE_BUCKETS,
+)
+SENDINBLUE_REQUEST_SECONDS: Histogram = Histogram(
+    "aposto_sendinblue_request_seconds",
+    "Time spent calling the SendinBlue API, by response status code",
+    ["status_code"],
+    buckets=STAGE_BUCKETS,
+)
+
+LOOP_LAG_SECONDS: Histogram = Histogram(
+    "aposto_event_loop_lag_seconds",
+    "Delay of the event loop in running a callback scheduled on time, the time it has been "
+    "blocked by synchronous code",
+    buckets=STAGE_BUCKETS,
+)
+LOOP_BLOCKS: Counter = Counter(
+    "aposto_event_loop_blocks",
+    "Times the event loop has been blocked past the threshold, by the route running then",
+    ["route"],
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    if MULTIPROCESS_DIRECTORY is None:
+        return REGISTRY
+
+    registry: CollectorRegistry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+
+    return registry
+
+
+def mark_worker_dead():
+    if MULTIPROCESS_DIRECTORY is not None:
+        multiprocess.mark_process_dead(os.getpid())
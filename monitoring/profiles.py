@@ -0,0 +1,89 @@
+import cProfile
+import os
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Union
+
+PROFILE_NAME: Pattern = re.compile(r"^\d{14}-[a-z_]+-[0-9a-f]{8}\.prof$")
+
+
+def _stat(profile_path: Path) -> Optional[os.stat_result]:
+    # NOTE : The workers sharing the profiles directory may remove a profile at any time.
+    try:
+        return profile_path.stat()
+    except FileNotFoundError:
+        return None
+
+
+class ProfileStore:
+    """
+    Directory of the profiles of the requests run under `cProfile`, in the `.prof` format read
+    by `pstats`, `snakeviz` or `flameprof`. Only the `max_profiles` most recent profiles are
+    kept
+    """
+
+    def __init__(self, path: Path, max_profiles: int = 50):
+        self.path: Path = path
+        self.max_profiles: int = max_profiles
+
+        self._lock: threading.Lock = threading.Lock()
+
+    def profile(self, label: str, function: Callable, *args) -> Tuple[str, Any]:
+        """
+        Calls a function under the profiler and stores its profile, returning the profile name
+        along with the function result
+        """
+        profiler: cProfile.Profile = cProfile.Profile()
+        result: Any = profiler.runcall(function, *args)
+        name: str = f"{time.strftime('%Y%m%d%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}.prof"
+
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(self.path / name)
+            self._prune()
+
+        return (name, result)
+
+    def _profiles(self) -> List[Tuple[Path, os.stat_result]]:
+        if not self.path.is_dir():
+            return []
+
+        profiles: List[Tuple[Path, os.stat_result]] = []
+
+        for profile_path in self.path.iterdir():
+            profile_stat: Optional[os.stat_result] = (
+                _stat(profile_path) if PROFILE_NAME.match(profile_path.name) else None
+            )
+
+            if profile_stat is not None:
+                profiles.append((profile_path, profile_stat))
+
+        return sorted(profiles, key=lambda profile: profile[1].st_mtime)
+
+    def _prune(self):
+        for profile_path, _ in self._profiles()[: -self.max_profiles]:
+            try:
+                profile_path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def list(self) -> List[Dict[str, Union[str, int, float]]]:
+        return [
+            {
+                "name": profile_path.name,
+                "size": profile_stat.st_size,
+                "created_at": profile_stat.st_mtime,
+            }
+            for profile_path, profile_stat in reversed(self._profiles())
+        ]
+
+    def get_path(self, name: str) -> Optional[Path]:
+        if not PROFILE_NAME.match(name):
+            return None
+
+        profile_path: Path = self.path / name
+
+        return profile_path if profile_path.is_file() else None
@@ -0,0 +1,140 @@
+import os
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+from multiprocessing.context import BaseContext
+from types import FrameType
+from typing import Dict, List
+
+
+def _frame_name(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """
+    Samples the stacks of all the threads of the process `rate` times per second, without
+    tracing them, so that it can run under production load. The samples are counted by stack,
+    in the collapsed format read by `flamegraph.pl` and `speedscope`
+    """
+
+    def __init__(self, rate: float = 100):
+        self.rate: float = rate
+
+    def _sample_stacks(self, stacks: Counter):
+        thread_names: Dict[int, str] = {
+            thread.ident: thread.name for thread in threading.enumerate()
+        }
+        sampler_ident: int = threading.get_ident()
+
+        for thread_ident, frame in sys._current_frames().items():
+            if thread_ident == sampler_ident:
+                continue
+
+            frame_names: List[str] = []
+
+            while frame is not None:
+                frame_names.append(_frame_name(frame))
+                frame = frame.f_back
+
+            frame_names.append(thread_names.get(thread_ident, str(thread_ident)))
+            stacks[";".join(reversed(frame_names))] += 1
+
+    def sample(self, seconds: float) -> Dict[str, int]:
+        """
+        Samples the stacks for `seconds` seconds and returns the number of samples of each
+        stack
+        """
+        stacks: Counter = Counter()
+        interval: float = 1 / self.rate
+        ends_at: float = time.perf_counter() + seconds
+
+        while time.perf_counter() < ends_at:
+            self._sample_stacks(stacks)
+            time.sleep(interval)
+
+        return dict(stacks)
+
+    @staticmethod
+    def collapsed(stacks: Dict[str, int]) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+
+class ProcessStackSampler:
+    """
+    Samples the stacks of the processes of a pool on demand. Each process runs an idle sampler
+    thread, started by the pool initializer `start_worker`, which samples its process when
+    `sample` is called and sends its stacks back, rooted at `<name_prefix>-<pid>`
+    """
+
+    POLL_INTERVAL: float = 0.05
+    RESULT_TIMEOUT: float = 5.0
+
+    def __init__(self, context: BaseContext, rate: float = 100, name_prefix: str = "process"):
+        self.rate: float = rate
+        self.name_prefix: str = name_prefix
+        self._sampling_id = context.Value("i", 0)
+        self._sampling_seconds = context.Value("d", 0.0)
+        self._results = context.Queue()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # NOTE : The lock only serializes the samplings requested by the parent process, the
+        #           pool processes get their own.
+        return {**self.__dict__, "_lock": None}
+
+    def start_worker(self):
+        threading.Thread(target=self._run_worker, name="stack-sampler", daemon=True).start()
+
+    def _run_worker(self):
+        stack_sampler: StackSampler = StackSampler(self.rate)
+        sampling_id: int = self._sampling_id.value
+
+        while True:
+            time.sleep(self.POLL_INTERVAL)
+
+            if self._sampling_id.value == sampling_id:
+                continue
+
+            sampling_id = self._sampling_id.value
+            stacks: Dict[str, int] = stack_sampler.sample(self._sampling_seconds.value)
+            self._results.put((sampling_id, os.getpid(), stacks))
+
+    def sample(self, seconds: float, processes: int) -> Dict[str, int]:
+        """
+        Samples the stacks of the `processes` processes of the pool for `seconds` seconds and
+        returns the number of samples of each stack. Processes which do not answer in time are
+        left out
+        """
+        stacks: Counter = Counter()
+
+        # NOTE : Samplings are serialized, so that the results of a sampling which has timed
+        #           out cannot be mistaken for the ones of the next sampling.
+        with self._lock:
+            with self._sampling_id.get_lock():
+                self._sampling_seconds.value = seconds
+                self._sampling_id.value += 1
+                sampling_id: int = self._sampling_id.value
+
+            ends_at: float = time.perf_counter() + seconds + self.RESULT_TIMEOUT
+            answered: int = 0
+
+            while answered < processes:
+                try:
+                    result_id, pid, process_stacks = self._results.get(
+                        timeout=max(0.0, ends_at - time.perf_counter())
+                    )
+                except queue.Empty:
+                    break
+
+                if result_id != sampling_id:
+                    continue
+
+                answered += 1
+
+                for stack, count in process_stacks.items():
+                    stacks[f"{self.name_prefix}-{pid};{stack}"] += count
+
+        return dict(stacks)
@@ -0,0 +1,70 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import Histogram
+
+from .metrics import RENDER_STAGE_SECONDS, REQUEST_STAGE_SECONDS
+
+# NOTE : The durations of the stages of the current request, in seconds, when it reports them
+#           in its `Server-Timing` header.
+_stage_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "stage_timings", default=None
+)
+
+
+@contextmanager
+def stage_timings() -> Iterator[Dict[str, float]]:
+    """
+    Collects the durations of the stages run within this context, by stage
+    """
+    timings: Dict[str, float] = {}
+    token: Token = _stage_timings.set(timings)
+
+    try:
+        yield timings
+    finally:
+        _stage_timings.reset(token)
+
+
+def add_stage_timings(timings: Dict[str, float]):
+    current_timings: Optional[Dict[str, float]] = _stage_timings.get()
+
+    if current_timings is None:
+        return
+
+    for stage, duration in timings.items():
+        current_timings[stage] = current_timings.get(stage, 0.0) + duration
+
+
+def collect_stage_timings(function: Callable, *args) -> Tuple[Dict[str, float], Any]:
+    """
+    Calls a function with its own stage timings and returns them along with its result, so that
+    the stages run by another thread or process can be added to the current request
+    """
+    with stage_timings() as timings:
+        result: Any = function(*args)
+
+    return (timings, result)
+
+
+@contextmanager
+def _timed_stage(histogram: Histogram, stage: str) -> Iterator[None]:
+    start: float = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        duration: float = time.perf_counter() - start
+
+        histogram.observe(duration)
+        add_stage_timings({stage: duration})
+
+
+def request_stage(route: str, stage: str) -> Iterator[None]:
+    return _timed_stage(REQUEST_STAGE_SECONDS.labels(route, stage), stage)
+
+
+def render_stage(stage: str) -> Iterator[None]:
+    return _timed_stage(RENDER_STAGE_SECONDS.labels(stage), stage)
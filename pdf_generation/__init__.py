@@ -1 +1,5 @@
-from .pdf_generator import PDFGenerator
+from .invoice_cache import InvoiceCache, InvoiceCacheEvictor, InvoiceLock, invoice_cache
+from .pdf_generator import MergedPDFGenerator, PDFGenerator
+from .render_executor import RenderExecutor, RenderQueueFullError
+from .single_flight import SingleFlight
+from .text_style import FontRegistry, font_registry
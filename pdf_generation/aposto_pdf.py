@@ -1,40 +1,23 @@
-from pathlib import Path
-from typing import List
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
 
 from PIL import Image
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfgen import canvas
 
-from .content import Graphic, SwissQRCode, Text, Value
-from .contents import InvoiceContent
+from monitoring import render_stage
+from .content import Graphic, SwissQRCode
+from .contents import InvoiceContent, ServiceContent
+from .image_assets import ImageAsset, get_image_asset
+from .qr_code_encoder import QRCodeMatrix
 from .qr_invoice import QRInvoice
-from .text_style import TextStyle, TTFontToRegister
+from .template import DrawProgram
+from .text_style import font_registry
 
 
 class ApostoCanvas(canvas.Canvas):
-    SERVICE_TOP_SHIFT: float = 6.363
-
-    def __init__(self, filename: str):
+    def __init__(self, filename: Union[str, BinaryIO]):
         super().__init__(filename)
-        self._register_fonts()
-
-    def _register_fonts(self):
-        TTFontToRegister(Path("fonts/Arial.ttf"), "Arial").register()
-        TTFontToRegister(Path("fonts/Arial Bold.ttf"), "Arial B").register()
-        TTFontToRegister(Path("fonts/OCRB.ttf"), "ORCB").register()
-
-    def _set_font(self, style: TextStyle):
-        return super().setFont(style.family, style.size)
-
-    def _draw_string(self, text: Text):
-        self._set_font(text.style)
-
-        if text.style.align == "R":
-            super().drawRightString(text.left, text.bottom, text.text)
-        elif text.style.align == "C":
-            super().drawCentredString(text.left, text.bottom, text.text)
-        else:
-            super().drawString(text.left, text.bottom, text.text)
+        font_registry.register()
 
     def _draw_frame(self, frame: Graphic):
         super().rect(frame.left, frame.bottom, frame.width, frame.height, stroke=1)
@@ -48,9 +31,82 @@ class ApostoCanvas(canvas.Canvas):
             graphic.height,
         )
 
-    def draw_descriptor_template(self, descriptor_template: List[Text]):
-        for descriptor in descriptor_template:
-            self._draw_string(descriptor)
+    def _draw_image_asset(self, image_asset: ImageAsset, graphic: Graphic):
+        # NOTE : Same as `drawImage`, except that the image stream is encoded once per process
+        #           instead of once per call.
+        self._currentPageHasImages = 1
+        image_name: str = self._doc.getXObjectName(image_asset.name)
+
+        if image_name not in self._doc.idToObject:
+            image_xobject = image_asset.image_xobject()
+            self._setXObjects(image_xobject)
+            self._doc.Reference(image_xobject, image_name)
+            self._doc.addForm(image_asset.name, image_xobject)
+
+        super().saveState()
+        super().translate(graphic.left, graphic.bottom)
+        super().scale(graphic.width, graphic.height)
+        self._code.append(f"/{image_name} Do")
+        super().restoreState()
+
+        self._formsinuse.append(image_asset.name)
+
+    def _draw_matrix(self, matrix: QRCodeMatrix, graphic: Graphic):
+        # NOTE : Every run of consecutive dark modules of a row is filled as a single rectangle,
+        #           so that the QR code stays a small vector drawing instead of a bitmap.
+        module_width: float = graphic.width / len(matrix[0])
+        module_height: float = graphic.height / len(matrix)
+        path = super().beginPath()
+
+        for row_index, row in enumerate(matrix):
+            bottom: float = graphic.bottom + graphic.height - (row_index + 1) * module_height
+            run_start: Optional[int] = None
+
+            for column_index, dark in enumerate((*row, False)):
+                if dark and run_start is None:
+                    run_start = column_index
+                elif not dark and run_start is not None:
+                    path.rect(
+                        graphic.left + run_start * module_width,
+                        bottom,
+                        (column_index - run_start) * module_width,
+                        module_height,
+                    )
+                    run_start = None
+
+        super().drawPath(path, stroke=0, fill=1)
+
+    def draw_static_layer(self, name: str, draw_layer: Callable[["ApostoCanvas"], None]):
+        # NOTE : The static layer is compiled into a form XObject the first time it is drawn in
+        #           the document. Every later page of the document only references it.
+        if not super().hasForm(name):
+            super().beginForm(name)
+            draw_layer(self)
+            super().endForm()
+
+        super().doForm(name)
+
+    def draw_program(
+        self,
+        program: DrawProgram,
+        content: Optional[Union[InvoiceContent, ServiceContent]] = None,
+    ):
+        for draw_op in program:
+            super().setFont(draw_op.style.family, draw_op.style.size)
+            draw_op.draw_string(
+                self,
+                draw_op.left,
+                draw_op.bottom,
+                draw_op.text if draw_op.value is None else draw_op.value(content),
+            )
+
+    def draw_services_programs(
+        self, services_programs: Tuple[DrawProgram, ...], invoice_content: InvoiceContent
+    ):
+        for services_program, service_content in zip(
+            services_programs, invoice_content.services_content
+        ):
+            self.draw_program(services_program, service_content)
 
     def draw_frame_template(self, frame_template: List[Graphic]):
         super().setLineWidth(0.75)
@@ -58,22 +114,6 @@ class ApostoCanvas(canvas.Canvas):
         for frame in frame_template:
             self._draw_frame(frame)
 
-    def draw_value_template(
-        self,
-        value_template: List[Value],
-        invoice_content: InvoiceContent,
-        is_service_template: bool = False,
-    ):
-        if not is_service_template:
-            for value in value_template:
-                self._draw_string(value.to_text(invoice_content))
-        else:
-            for index, service_content in enumerate(invoice_content.services_content):
-                for value in value_template:
-                    text: Text = value.to_text(service_content)
-                    text.shift_top(index * self.SERVICE_TOP_SHIFT)
-                    self._draw_string(text)
-
     def draw_datamatrix_template(
         self, datamatrix_template: List[Graphic], invoice_content: InvoiceContent
     ):
@@ -86,22 +126,24 @@ class ApostoCanvas(canvas.Canvas):
             self._draw_image(datamatrix_image, datamatrix)
 
     def draw_scissors_template(self, scissors_template: List[Graphic]):
-        scissors_image: Image = Image.open("./pdf_generation/img/scissors.png")
-
         for scissors in scissors_template:
-            if scissors.rotate:
-                scissors_image = scissors_image.rotate(scissors.rotate, expand=True)
-
-            self._draw_image(scissors_image, scissors)
+            self._draw_image_asset(
+                get_image_asset("scissors.png", scissors.rotate), scissors
+            )
 
     def draw_swiss_qr_code_template(
         self, swiss_qr_code_template: List[SwissQRCode], invoice_content: InvoiceContent
     ):
-        qr_code_image: Image.Image = QRInvoice(invoice_content).generate_qr_code()
-        swiss_cross_image: Image.Image = Image.open(
-            "./pdf_generation/img/swiss_cross.png"
-        )
+        with render_stage("qr_encoding"):
+            qr_code_matrix: QRCodeMatrix = QRInvoice(
+                invoice_content
+            ).generate_qr_code_matrix()
+
+        for swiss_qr_code in swiss_qr_code_template:
+            self._draw_matrix(qr_code_matrix, swiss_qr_code.qr_code)
+
+    def draw_swiss_cross_template(self, swiss_qr_code_template: List[SwissQRCode]):
+        swiss_cross_asset: ImageAsset = get_image_asset("swiss_cross.png")
 
         for swiss_qr_code in swiss_qr_code_template:
-            self._draw_image(qr_code_image, swiss_qr_code.qr_code)
-            self._draw_image(swiss_cross_image, swiss_qr_code.swiss_cross)
+            self._draw_image_asset(swiss_cross_asset, swiss_qr_code.swiss_cross)
@@ -1,12 +1,6 @@
-from functools import reduce
-from typing import Union
-
 from reportlab.lib.units import mm
 
-import pdf_generation.text_style as text_style
-
-from .contents import InvoiceContent, ServiceContent
-from .text_style import TextStyle
+from .text_style import TextStyle, get_text_style
 
 
 class Content:
@@ -22,6 +16,9 @@ class Content:
     def bottom(self) -> float:
         return Content.top_to_bottom(self._top)
 
+    def shifted_bottom(self, top_shift: float) -> float:
+        return Content.top_to_bottom(self._top + top_shift)
+
     @staticmethod
     def to_mm(val: float) -> float:
         return val * mm
@@ -35,10 +32,7 @@ class Text(Content):
     def __init__(self, dict_text: dict):
         super().__init__(dict_text)
         self.text: str = dict_text["text"]
-        self.style: TextStyle = getattr(text_style, dict_text["style"])()
-
-    def shift_top(self, shift: float):
-        self._top += shift
+        self.style: TextStyle = get_text_style(dict_text["style"])
 
 
 class Graphic(Content):
@@ -65,17 +59,7 @@ class Value(Content):
     def __init__(self, dict_value: dict):
         super().__init__(dict_value)
         self.key: str = dict_value["key"]
-        self.style: TextStyle = getattr(text_style, dict_value["style"])()
-
-    def to_text(self, content: Union[InvoiceContent, ServiceContent]) -> Text:
-        return Text(
-            {
-                "text": reduce(getattr, self.key.split("."), content),
-                "left": self._left,
-                "top": self._top,
-                "style": type(self.style).__name__,
-            }
-        )
+        self.style: TextStyle = get_text_style(dict_value["style"])
 
 
 class SwissQRCode:
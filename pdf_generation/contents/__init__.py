@@ -1,6 +1,7 @@
 from .author_content import AuthorContent
 from .entity_content import EntityContent
 from .invoice_content import InvoiceContent
+from .invoice_fields import InvoiceFields
 from .patient_content import PatientContent
 from .service_content import ServiceContent
 from .therapist_content import TherapistContent
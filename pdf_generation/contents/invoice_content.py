@@ -1,11 +1,11 @@
 from typing import List, Union
 
-from dateutil import tz
 from PIL import Image
 from pystrich.datamatrix import DataMatrixEncoder, DataMatrixRenderer
 
 from models import Invoice
 from .author_content import AuthorContent
+from .invoice_fields import InvoiceFields
 from .patient_content import PatientContent
 from .service_content import ServiceContent
 from .therapist_content import TherapistContent
@@ -14,6 +14,7 @@ from .therapist_content import TherapistContent
 class InvoiceContent:
     def __init__(self, invoice: Invoice):
         self._invoice: Invoice = invoice
+        self.fields: InvoiceFields = InvoiceFields.derive(self._invoice)
 
         self.author_content: AuthorContent = AuthorContent(self._invoice.author)
         self.therapist_content: TherapistContent = TherapistContent(
@@ -29,21 +30,21 @@ class InvoiceContent:
     def naturapeute_id(self) -> Union[str, None]:
         return self._invoice.id
 
+    @property
+    def canonical_invoice(self) -> str:
+        return f"{self._invoice.json(sort_keys=True)}\n{self.fields.total_amount}"
+
     @property
     def timestamp(self) -> str:
-        return str(int(self._invoice.timestamp.timestamp() * 1000))[:-3]
+        return self.fields.timestamp
 
     @property
     def full_date_string(self) -> str:
-        return self._invoice.timestamp.astimezone(tz.gettz("Europe/Zurich")).strftime(
-            "%d.%m.%Y %H:%M:%S"
-        )
+        return self.fields.full_date_string
 
     @property
     def date_string(self) -> str:
-        return self._invoice.timestamp.astimezone(tz.gettz("Europe/Zurich")).strftime(
-            "%d.%m.%Y"
-        )
+        return self.fields.date_string
 
     @property
     def identification(self) -> str:
@@ -55,9 +56,7 @@ class InvoiceContent:
 
     @property
     def therapy_dates(self) -> str:
-        (therapy_start_date, therapy_end_date) = self._invoice.therapy_dates
-
-        return f"{therapy_start_date.astimezone(tz.gettz('Europe/Zurich')).strftime('%d.%m.%Y')} - {therapy_end_date.astimezone(tz.gettz('Europe/Zurich')).strftime('%d.%m.%Y')}"
+        return f"{self.fields.therapy_start_date_string} - {self.fields.therapy_end_date_string}"
 
     @property
     def therapy_reason(self) -> str:
@@ -125,35 +124,23 @@ class InvoiceContent:
 
     @property
     def total_amount(self) -> str:
-        return "%.2f" % self._invoice.total_amount
+        return self.fields.total_amount
 
     @property
     def paid_amount(self) -> str:
-        return self.total_amount if self._invoice.paid else "0.00"
+        return self.fields.paid_amount
 
     @property
     def owed_amount(self) -> str:
-        return "0.00" if self._invoice.paid else self.total_amount
+        return self.fields.owed_amount
 
     @property
     def reference_type(self) -> str:
-        return self._invoice.reference_type
+        return self.fields.reference_type
 
     @property
     def reference(self) -> str:
-        reference: str = self._invoice.reference
-
-        if self._invoice.reference_type == "SCOR":
-            reference: str = " ".join(
-                [reference[i : i + 4] for i in range(0, len(reference), 4)]
-            )
-        elif self._invoice.reference_type == "QRR":
-            reference: str = " ".join(
-                [reference[0:2]]
-                + [reference[i : i + 5] for i in range(2, len(reference), 5)]
-            )
-
-        return reference
+        return self.fields.formatted_reference
 
     @property
     def esr_coding_line(self) -> Union[str, None]:
@@ -162,18 +149,14 @@ class InvoiceContent:
 
         total_amount: str = self.total_amount.replace(".", "").rjust(10, "0")
 
-        return f"01{total_amount}>{self._invoice.author.ESRId}{self._invoice.QRReference}+ {self._invoice.author.ESRBankId}"
+        return f"01{total_amount}>{self._invoice.author.ESRId}{self.fields.reference}+ {self._invoice.author.ESRBankId}"
 
     def _generate_datamatrix_string(self) -> Union[str, None]:
         if not self.esr_coding_line:
             return None
 
         separator: str = "#"
-        therapy_start_date = (
-            self._invoice.therapy_dates[0]
-            .astimezone(tz.gettz("Europe/Zurich"))
-            .strftime("%d.%m.%Y")
-        )
+        therapy_start_date: str = self.fields.therapy_start_date_string
         due_amount: str = "0"
 
         datamatrix_string = f"{self.esr_coding_line}{separator}{self.author_content.gln}{separator}{self.therapist_content.gln}{separator}"
@@ -0,0 +1,65 @@
+from datetime import datetime, tzinfo
+from typing import NamedTuple
+
+from dateutil import tz
+
+from models import Invoice
+
+ZURICH: tzinfo = tz.gettz("Europe/Zurich")
+
+
+def _format_reference(reference: str, reference_type: str) -> str:
+    if reference_type == "SCOR":
+        return " ".join([reference[i : i + 4] for i in range(0, len(reference), 4)])
+
+    if reference_type == "QRR":
+        return " ".join(
+            [reference[0:2]] + [reference[i : i + 5] for i in range(2, len(reference), 5)]
+        )
+
+    return reference
+
+
+class InvoiceFields(NamedTuple):
+    """
+    Every value computed from an `Invoice`, derived once when the invoice content is created.
+    The templates and the QR-invoice read them from there instead of computing them again
+    """
+
+    timestamp: str
+    full_date_string: str
+    date_string: str
+    therapy_start_date_string: str
+    therapy_end_date_string: str
+    total_amount: str
+    paid_amount: str
+    owed_amount: str
+    reference_type: str
+    reference: str
+    formatted_reference: str
+
+    @classmethod
+    def derive(cls, invoice: Invoice) -> "InvoiceFields":
+        date: datetime = invoice.timestamp.astimezone(ZURICH)
+        (therapy_start_date, therapy_end_date) = invoice.therapy_dates
+        total_amount: str = "%.2f" % invoice.total_amount
+        reference_type: str = invoice.reference_type
+        reference: str = invoice.reference
+
+        return cls(
+            timestamp=str(int(invoice.timestamp.timestamp() * 1000))[:-3],
+            full_date_string=date.strftime("%d.%m.%Y %H:%M:%S"),
+            date_string=date.strftime("%d.%m.%Y"),
+            therapy_start_date_string=therapy_start_date.astimezone(ZURICH).strftime(
+                "%d.%m.%Y"
+            ),
+            therapy_end_date_string=therapy_end_date.astimezone(ZURICH).strftime(
+                "%d.%m.%Y"
+            ),
+            total_amount=total_amount,
+            paid_amount=total_amount if invoice.paid else "0.00",
+            owed_amount="0.00" if invoice.paid else total_amount,
+            reference_type=reference_type,
+            reference=reference,
+            formatted_reference=_format_reference(reference, reference_type),
+        )
@@ -1,5 +1,4 @@
-from models import Service
-from ..service_codes import SERVICE_CODES
+from models import Service, tarif_590
 
 
 class ServiceContent:
@@ -61,8 +60,4 @@ class ServiceContent:
 
     @property
     def code_label(self) -> str:
-        return next(
-            service_code["label"]
-            for service_code in SERVICE_CODES
-            if service_code["value"] == self._service.code
-        )
+        return tarif_590.label(self._service.code)
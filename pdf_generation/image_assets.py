@@ -0,0 +1,50 @@
+import copy
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
+
+IMG_DIRECTORY: Path = Path("pdf_generation/img")
+
+
+class ImageAsset:
+    """
+    A static image of the templates, decoded, rotated and encoded as a PDF image stream once per
+    process. Every document then embeds a copy of the encoded stream, without decoding nor
+    compressing the pixels again
+    """
+
+    def __init__(self, path: Path, rotate: Optional[float] = None):
+        image: Image.Image = Image.open(path.resolve().as_posix())
+
+        if rotate:
+            image = image.rotate(rotate, expand=True)
+
+        image_reader: ImageReader = ImageReader(image)
+
+        # NOTE : The name is computed the way `Canvas.drawImage` does it, so that the same
+        #           image is still embedded only once per document.
+        self.name: str = _digester(image_reader.getRGBData() + b"None")
+        self.image: Image.Image = image
+        self._image_xobject: PDFImageXObject = PDFImageXObject(self.name, image_reader)
+
+    @property
+    def width(self) -> int:
+        return self._image_xobject.width
+
+    @property
+    def height(self) -> int:
+        return self._image_xobject.height
+
+    def image_xobject(self) -> PDFImageXObject:
+        # NOTE : ReportLab binds an XObject to the first document it is registered in, so each
+        #           document gets its own shallow copy sharing the encoded stream.
+        return copy.copy(self._image_xobject)
+
+
+@lru_cache(maxsize=None)
+def get_image_asset(filename: str, rotate: Optional[float] = None) -> ImageAsset:
+    return ImageAsset(IMG_DIRECTORY.joinpath(filename), rotate)
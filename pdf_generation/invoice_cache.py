@@ -0,0 +1,382 @@
+import asyncio
+import fcntl
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from monitoring import RENDER_CACHE_LOOKUPS
+from .contents import InvoiceContent
+
+# NOTE : Bump this version whenever the templates or the drawing code change, so that PDFs
+#           rendered with the previous layout are not served anymore.
+TEMPLATE_VERSION: str = "5"
+
+logger: logging.Logger = logging.getLogger("aposto.store")
+
+
+class InvoiceLock:
+    """
+    Advisory lock file of a stored invoice, held while the invoice is rendered and stored, so
+    that the workers sharing the store render it only once
+    """
+
+    def __init__(self, path: Path):
+        self.path: Path = path
+        self._file: Optional[BinaryIO] = None
+
+    def _is_current(self, lock_file: BinaryIO) -> bool:
+        try:
+            path_stat: os.stat_result = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+
+        file_stat: os.stat_result = os.fstat(lock_file.fileno())
+
+        return (path_stat.st_dev, path_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        while True:
+            lock_file: BinaryIO = open(self.path, "ab")
+
+            try:
+                fcntl.flock(
+                    lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+                )
+            except BlockingIOError:
+                lock_file.close()
+                return False
+
+            # NOTE : The lock file may have been removed by an eviction between its opening and
+            #           its locking, its lock would then not be shared with the next workers.
+            if self._is_current(lock_file):
+                self._file = lock_file
+
+                return True
+
+            lock_file.close()
+
+    def remove(self) -> bool:
+        """
+        Removes the lock file, unless it is held, returning whether it was removed
+        """
+        if not self.acquire(blocking=False):
+            return False
+
+        try:
+            self.path.unlink()
+        finally:
+            self.release()
+
+        return True
+
+    def release(self):
+        if self._file is None:
+            return
+
+        fcntl.flock(self._file, fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "InvoiceLock":
+        self.acquire()
+
+        return self
+
+    def __exit__(self, *_):
+        self.release()
+
+
+class InvoiceCache:
+    """
+    Content-addressed store of the rendered PDF invoices. Every stored file is recorded in a
+    SQLite index with its size, creation and last access times, so that lookups and evictions
+    never have to list the store directories
+    """
+
+    INDEX_FILENAME: str = "index.sqlite3"
+
+    def __init__(
+        self,
+        root: Path,
+        quota_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.root: Path = root
+        self.quota_bytes: Optional[int] = quota_bytes
+        self.ttl: Optional[float] = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        state: dict = self.__dict__.copy()
+        state["_lock"] = None
+        state["_connection"] = None
+
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root.joinpath(self.INDEX_FILENAME)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+
+            connection: sqlite3.Connection = sqlite3.connect(
+                self.index_path.as_posix(), timeout=10, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS invoices ("
+                "tenant TEXT NOT NULL, key TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (tenant, key))"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS invoices_accessed_at ON invoices (accessed_at)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS invoices_created_at ON invoices (created_at)"
+            )
+            connection.commit()
+
+            self._connection = connection
+
+        return self._connection
+
+    @staticmethod
+    def key(invoice_content: InvoiceContent) -> str:
+        canonical_invoice: str = f"{TEMPLATE_VERSION}\n{invoice_content.canonical_invoice}"
+
+        return hashlib.sha256(canonical_invoice.encode("utf-8")).hexdigest()
+
+    def path(self, tenant: str, key: str) -> Path:
+        return self.root.joinpath(tenant, f"{key}.pdf")
+
+    def lock(self, tenant: str, key: str) -> InvoiceLock:
+        return InvoiceLock(self.root.joinpath(tenant, f"{key}.lock"))
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and created_at < now - self.ttl
+
+    def get_path(self, tenant: str, key: str) -> Optional[Path]:
+        """
+        Returns the path of a stored invoice, unless it has expired or its file is missing
+        """
+        now: float = time.time()
+
+        with self._lock:
+            row: Optional[Tuple[float]] = self.connection.execute(
+                "SELECT created_at FROM invoices WHERE tenant = ? AND key = ?", (tenant, key)
+            ).fetchone()
+
+            if row is None or self._is_expired(row[0], now):
+                self.misses += 1
+                RENDER_CACHE_LOOKUPS.labels("miss").inc()
+                return None
+
+            invoice_path: Path = self.path(tenant, key)
+
+            if not invoice_path.is_file():
+                self.connection.execute(
+                    "DELETE FROM invoices WHERE tenant = ? AND key = ?", (tenant, key)
+                )
+                self.connection.commit()
+                self.misses += 1
+                RENDER_CACHE_LOOKUPS.labels("miss").inc()
+                return None
+
+            self.connection.execute(
+                "UPDATE invoices SET accessed_at = ? WHERE tenant = ? AND key = ?",
+                (now, tenant, key),
+            )
+            self.connection.commit()
+            self.hits += 1
+            RENDER_CACHE_LOOKUPS.labels("hit").inc()
+
+        return invoice_path
+
+    def get(self, tenant: str, key: str) -> Optional[bytes]:
+        invoice_path: Optional[Path] = self.get_path(tenant, key)
+
+        if invoice_path is None:
+            return None
+
+        # NOTE : The file may still be evicted between the lookup and the read.
+        try:
+            return invoice_path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, tenant: str, key: str, invoice_pdf: bytes) -> Path:
+        invoice_path: Path = self.path(tenant, key)
+        invoice_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # NOTE : The PDF is written to a temporary file which then replaces the stored one
+        #           atomically, so that a concurrent reader never gets a half-written PDF.
+        with NamedTemporaryFile(
+            dir=invoice_path.parent, prefix=f".{key}.", suffix=".tmp", delete=False
+        ) as temporary_file:
+            try:
+                temporary_file.write(invoice_pdf)
+            except BaseException:
+                os.unlink(temporary_file.name)
+                raise
+
+        os.replace(temporary_file.name, invoice_path)
+
+        now: float = time.time()
+
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO invoices (tenant, key, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (tenant, key, len(invoice_pdf), now, now),
+            )
+            self.connection.commit()
+
+        return invoice_path
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM invoices"
+            ).fetchone()[0]
+
+    def _eviction_candidates(self, batch_size: int) -> List[Tuple[str, str, int]]:
+        candidates: List[Tuple[str, str, int]] = []
+
+        if self.ttl is not None:
+            candidates = self.connection.execute(
+                "SELECT tenant, key, size FROM invoices WHERE created_at < ? LIMIT ?",
+                (time.time() - self.ttl, batch_size),
+            ).fetchall()
+
+        if candidates or self.quota_bytes is None:
+            return candidates
+
+        size: int = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM invoices"
+        ).fetchone()[0]
+
+        for tenant, key, entry_size in self.connection.execute(
+            "SELECT tenant, key, size FROM invoices ORDER BY accessed_at LIMIT ?",
+            (batch_size,),
+        ):
+            if size <= self.quota_bytes:
+                break
+
+            candidates.append((tenant, key, entry_size))
+            size -= entry_size
+
+        return candidates
+
+    def evict(self, batch_size: int = 100) -> int:
+        """
+        Evicts at most `batch_size` expired invoices or, if none has expired, at most
+        `batch_size` least recently used invoices until the store fits in its quota
+        """
+        with self._lock:
+            candidates: List[Tuple[str, str, int]] = self._eviction_candidates(batch_size)
+
+            for tenant, key, _ in candidates:
+                try:
+                    self.path(tenant, key).unlink()
+                except FileNotFoundError:
+                    pass
+
+                self.lock(tenant, key).remove()
+
+            self.connection.executemany(
+                "DELETE FROM invoices WHERE tenant = ? AND key = ?",
+                list((tenant, key) for tenant, key, _ in candidates),
+            )
+            self.connection.commit()
+            self.evictions += len(candidates)
+
+        return len(candidates)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups: int = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "evictions": self.evictions,
+        }
+
+
+class InvoiceCacheEvictor:
+    """
+    Evicts invoices from an `InvoiceCache` in small batches, in the background, instead of
+    sweeping the whole store at once
+    """
+
+    def __init__(self, cache: InvoiceCache, interval: float = 60, batch_size: int = 100):
+        self.cache: InvoiceCache = cache
+        self.interval: float = interval
+        self.batch_size: int = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+
+        while True:
+            try:
+                evicted: int = await loop.run_in_executor(
+                    None, self.cache.evict, self.batch_size
+                )
+            except sqlite3.OperationalError:
+                evicted: int = 0
+            except Exception:
+                # NOTE : The eviction keeps running, otherwise the quota and the TTL would not
+                #           be enforced anymore.
+                logger.exception("The eviction of stored invoices has failed.")
+                evicted: int = 0
+
+            # NOTE : A full batch means there is probably more to evict, so the next batch is
+            #           scheduled right away while still yielding to the requests.
+            await asyncio.sleep(0 if evicted == self.batch_size else self.interval)
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+
+invoice_cache: InvoiceCache = InvoiceCache(Path("./out"))
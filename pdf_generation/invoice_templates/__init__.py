@@ -1,5 +1,5 @@
-from .descriptor_templates import descriptor_templates as invoice_descriptor_templates
+from .descriptor_templates import descriptor_program as invoice_descriptor_program
 from .graphic_templates import datamatrix_template as invoice_datamatrix_template
 from .graphic_templates import frame_template as invoice_frame_template
-from .value_templates import services_template as invoice_services_template
-from .value_templates import value_templates as invoice_value_templates
+from .value_templates import services_programs as invoice_services_programs
+from .value_templates import value_program as invoice_value_program
@@ -1,26 +1,28 @@
 from pathlib import Path
-from typing import List
+from typing import Tuple
 
-from pdf_generation.content import Value
-from pdf_generation.template import ValueTemplate
+from pdf_generation.template import DrawProgram, ValueTemplate
 
-value_templates: List[List[Value]] = [
+SERVICE_ROWS: int = 5
+SERVICE_TOP_SHIFT: float = 6.363
+
+value_program: DrawProgram = (
     ValueTemplate(
         Path("pdf_generation/invoice_templates/value_templates/author_template.json")
-    ).load_template(),
-    ValueTemplate(
+    ).compile()
+    + ValueTemplate(
         Path("pdf_generation/invoice_templates/value_templates/footer_template.json")
-    ).load_template(),
-    ValueTemplate(
+    ).compile()
+    + ValueTemplate(
         Path(
             "pdf_generation/invoice_templates/value_templates/other_fields_template.json"
         )
-    ).load_template(),
-    ValueTemplate(
+    ).compile()
+    + ValueTemplate(
         Path("pdf_generation/invoice_templates/value_templates/patient_template.json")
-    ).load_template(),
-]
+    ).compile()
+)
 
-services_template: List[Value] = ValueTemplate(
+services_programs: Tuple[DrawProgram, ...] = ValueTemplate(
     Path("pdf_generation/invoice_templates/value_templates/services_template.json")
-).load_template()
+).compile_rows(SERVICE_ROWS, SERVICE_TOP_SHIFT)
@@ -1,95 +1,141 @@
+from io import BytesIO
 from pathlib import Path
+from typing import List, Optional
 
+from monitoring import render_stage
 from .aposto_pdf import ApostoCanvas
 from .contents import InvoiceContent
+from .invoice_cache import InvoiceCache, InvoiceLock, invoice_cache
 from .invoice_templates import (
     invoice_datamatrix_template,
-    invoice_descriptor_templates,
+    invoice_descriptor_program,
     invoice_frame_template,
-    invoice_services_template,
-    invoice_value_templates,
+    invoice_services_programs,
+    invoice_value_program,
 )
 from .qr_invoice_templates import (
-    qr_invoice_descriptor_templates,
-    qr_invoice_qr_part_descriptor_templates,
+    qr_invoice_descriptor_program,
+    qr_invoice_qr_part_descriptor_program,
     qr_invoice_frame_template,
     qr_invoice_scissors_template,
     qr_invoice_swiss_qr_code_template,
-    qr_invoice_value_templates,
-    qr_invoice_qr_part_value_templates,
+    qr_invoice_value_program,
+    qr_invoice_qr_part_value_program,
     qr_invoice_qr_part_frame_template,
 )
+from .template import DrawProgram
+
+qr_invoice_static_program: DrawProgram = (
+    qr_invoice_descriptor_program + qr_invoice_qr_part_descriptor_program
+)
+qr_invoice_page_value_program: DrawProgram = (
+    qr_invoice_value_program + qr_invoice_qr_part_value_program
+)
 
 
 class PDFGenerator:
-    def __init__(self, invoice_content: InvoiceContent):
+    def __init__(
+        self, invoice_content: InvoiceContent, cache: InvoiceCache = invoice_cache
+    ):
         self._invoice_content: InvoiceContent = invoice_content
+        self._cache: InvoiceCache = cache
+        self.cache_key: str = cache.key(invoice_content)
 
     @property
-    def invoice_path(self) -> Path:
-        invoice_dir_str = (
-            f"./out/{self._invoice_content.naturapeute_id}"
+    def invoice_filename(self) -> str:
+        return f"invoice-{self._invoice_content.timestamp}.pdf"
+
+    @property
+    def tenant(self) -> str:
+        return (
+            self._invoice_content.naturapeute_id
             if self._invoice_content.naturapeute_id
-            else "./out/demo"
+            else "demo"
+        )
+
+    @property
+    def invoice_path(self) -> Path:
+        return self._cache.path(self.tenant, self.cache_key)
+
+    @staticmethod
+    def _draw_qr_invoice_static_layer(cvs: ApostoCanvas):
+        cvs.draw_program(qr_invoice_static_program)
+        cvs.draw_frame_template(qr_invoice_frame_template)
+        cvs.draw_frame_template(qr_invoice_qr_part_frame_template)
+        cvs.draw_scissors_template(qr_invoice_scissors_template)
+
+        # NOTE : The static layer is drawn over the QR code, so that the Swiss cross lays on it.
+        cvs.draw_swiss_cross_template(qr_invoice_swiss_qr_code_template)
+
+    @staticmethod
+    def _draw_invoice_static_layer(cvs: ApostoCanvas):
+        cvs.draw_program(invoice_descriptor_program)
+        cvs.draw_frame_template(invoice_frame_template)
+
+    @staticmethod
+    def draw_invoice(cvs: ApostoCanvas, invoice_content: InvoiceContent):
+        # QR-invoice page
+        cvs.draw_program(qr_invoice_page_value_program, invoice_content)
+        cvs.draw_swiss_qr_code_template(qr_invoice_swiss_qr_code_template, invoice_content)
+        cvs.draw_static_layer(
+            "qr_invoice_page", PDFGenerator._draw_qr_invoice_static_layer
         )
-        invoice_dir: Path = Path(invoice_dir_str)
-        invoice_dir.mkdir(parents=True, exist_ok=True)
 
-        return invoice_dir.joinpath(f"invoice-{self._invoice_content.timestamp}.pdf")
+        cvs.showPage()
 
-    def generate_invoice(self) -> Path:
-        invoice_path: Path = self.invoice_path
+        # Invoice page
+        cvs.draw_program(invoice_value_program, invoice_content)
+        cvs.draw_services_programs(invoice_services_programs, invoice_content)
+        cvs.draw_datamatrix_template(invoice_datamatrix_template, invoice_content)
+        cvs.draw_static_layer("invoice_page", PDFGenerator._draw_invoice_static_layer)
 
-        if not invoice_path.exists():
-            cvs: ApostoCanvas = ApostoCanvas(invoice_path.as_posix())
+        cvs.showPage()
 
-            # QR-invoice page
-            for qr_invoice_descriptor_template in qr_invoice_descriptor_templates:
-                cvs.draw_descriptor_template(qr_invoice_descriptor_template)
+    def render(self) -> bytes:
+        invoice_buffer: BytesIO = BytesIO()
 
-            cvs.draw_frame_template(qr_invoice_frame_template)
+        cvs: ApostoCanvas = ApostoCanvas(invoice_buffer)
 
-            for qr_invoice_value_template in qr_invoice_value_templates:
-                cvs.draw_value_template(qr_invoice_value_template, self._invoice_content)
+        with render_stage("drawing"):
+            self.draw_invoice(cvs, self._invoice_content)
 
-            # QR-invoice part in QR-invoice page
-            for (
-                qr_invoice_qr_part_descriptor_template
-            ) in qr_invoice_qr_part_descriptor_templates:
-                cvs.draw_descriptor_template(qr_invoice_qr_part_descriptor_template)
+        with render_stage("save"):
+            cvs.save()
 
-            for qr_invoice_qr_part_value_template in qr_invoice_qr_part_value_templates:
-                cvs.draw_value_template(
-                    qr_invoice_qr_part_value_template, self._invoice_content
-                )
+        return invoice_buffer.getvalue()
 
-            cvs.draw_frame_template(qr_invoice_qr_part_frame_template)
-            cvs.draw_scissors_template(qr_invoice_scissors_template)
-            cvs.draw_swiss_qr_code_template(
-                qr_invoice_swiss_qr_code_template, self._invoice_content
-            )
+    def cached_invoice(self) -> Optional[bytes]:
+        return self._cache.get(self.tenant, self.cache_key)
 
-            cvs.showPage()
+    def cached_invoice_path(self) -> Optional[Path]:
+        return self._cache.get_path(self.tenant, self.cache_key)
 
-            # Invoice page
-            for invoice_descriptor_template in invoice_descriptor_templates:
-                cvs.draw_descriptor_template(invoice_descriptor_template)
+    def save(self, invoice_pdf: bytes) -> Path:
+        return self._cache.put(self.tenant, self.cache_key, invoice_pdf)
 
-            cvs.draw_frame_template(invoice_frame_template)
+    def lock(self) -> InvoiceLock:
+        return self._cache.lock(self.tenant, self.cache_key)
 
-            for invoice_value_template in invoice_value_templates:
-                cvs.draw_value_template(invoice_value_template, self._invoice_content)
 
-            cvs.draw_value_template(
-                invoice_services_template, self._invoice_content, is_service_template=True
-            )
+class MergedPDFGenerator:
+    """
+    Renders many invoices back to back in a single document. The fonts, the images and the
+    static layers are embedded once for the whole document instead of once per invoice
+    """
 
-            cvs.draw_datamatrix_template(
-                invoice_datamatrix_template, self._invoice_content
-            )
+    def __init__(self, invoice_contents: List[InvoiceContent]):
+        self._invoice_contents: List[InvoiceContent] = invoice_contents
 
-            cvs.showPage()
+    def render(self) -> bytes:
+        invoice_buffer: BytesIO = BytesIO()
 
-            cvs.save()
+        cvs: ApostoCanvas = ApostoCanvas(invoice_buffer)
+
+        # NOTE : `showPage` compresses the drawing operations of each page into its stream,
+        #           so only the compressed pages of the finished invoices are kept until saved.
+        for invoice_content in self._invoice_contents:
+            PDFGenerator.draw_invoice(cvs, invoice_content)
+
+        cvs.save()
 
-        return invoice_path
+        return invoice_buffer.getvalue()
@@ -0,0 +1,157 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from qrcode import QRCode, util
+from qrcode.constants import ERROR_CORRECT_M
+from qrcode.exceptions import DataOverflowError
+
+# NOTE : The Swiss QR-bill implementation guidelines limit the QR code to the version 25 with
+#           the error correction level M.
+MAX_VERSION: int = 25
+
+QRCodeMatrix = Tuple[Tuple[bool, ...], ...]
+
+_RUN_PATTERN: Pattern = re.compile(r"0{5,}|1{5,}")
+_FINDER_LIKE_PATTERN: Pattern = re.compile(r"(?=10111010000|00001011101)")
+
+
+def _to_bitboards(lines: Iterable[Iterable[Optional[bool]]]) -> Tuple[int, ...]:
+    return tuple(
+        int("".join("1" if module else "0" for module in line), 2) for line in lines
+    )
+
+
+def _lost_point(rows: Tuple[int, ...], columns: Tuple[int, ...]) -> int:
+    modules_count: int = len(rows)
+    line_format: str = f"0{modules_count}b"
+    lines: List[str] = list(format(line, line_format) for line in rows + columns)
+
+    runs_lost_point: int = sum(
+        len(run.group()) - 2 for line in lines for run in _RUN_PATTERN.finditer(line)
+    )
+    finder_like_lost_point: int = 40 * sum(
+        len(_FINDER_LIKE_PATTERN.findall(line)) for line in lines
+    )
+
+    block_mask: int = (1 << (modules_count - 1)) - 1
+    blocks_count: int = 0
+
+    for top, bottom in zip(rows, rows[1:]):
+        same_columns: int = ~(top ^ bottom)
+        blocks: int = same_columns & (same_columns >> 1) & ~(top ^ (top >> 1)) & block_mask
+        blocks_count += bin(blocks).count("1")
+
+    dark_count: int = sum(line.count("1") for line in lines[:modules_count])
+    dark_ratio: float = float(dark_count) / (modules_count ** 2)
+    balance_lost_point: int = int(abs(dark_ratio * 100 - 50) / 5) * 10
+
+    return runs_lost_point + 3 * blocks_count + finder_like_lost_point + balance_lost_point
+
+
+def lost_point(modules: List[List[bool]]) -> int:
+    """
+    Penalty score of a masked symbol, equal to `qrcode.util.lost_point`. Rows and columns are
+    scanned as bit strings and the 2x2 blocks as integer bitboards, not module by module
+    """
+    return _lost_point(_to_bitboards(modules), _to_bitboards(zip(*modules)))
+
+
+class SymbolLayout(NamedTuple):
+    """
+    Bitboards of the modules inverted by each mask pattern, restricted to the data modules
+    """
+
+    mask_rows: Tuple[Tuple[int, ...], ...]
+    mask_columns: Tuple[Tuple[int, ...], ...]
+
+
+@lru_cache(maxsize=None)
+def get_symbol_layout(version: int, error_correction: int) -> SymbolLayout:
+    qr_code: QRCode = QRCode(version=version, error_correction=error_correction)
+    qr_code.modules_count = version * 4 + 17
+    qr_code.modules = list([None] * qr_code.modules_count for _ in range(qr_code.modules_count))
+
+    # NOTE : Same function patterns as `QRCode.makeImpl`, without the data, so that the
+    #           remaining empty modules are the data modules.
+    qr_code.setup_position_probe_pattern(0, 0)
+    qr_code.setup_position_probe_pattern(qr_code.modules_count - 7, 0)
+    qr_code.setup_position_probe_pattern(0, qr_code.modules_count - 7)
+    qr_code.setup_position_adjust_pattern()
+    qr_code.setup_timing_pattern()
+    qr_code.setup_type_info(True, 0)
+
+    if version >= 7:
+        qr_code.setup_type_number(True)
+
+    masks: List[List[List[bool]]] = list(
+        list(
+            list(
+                qr_code.modules[row][column] is None and mask(row, column)
+                for column in range(qr_code.modules_count)
+            )
+            for row in range(qr_code.modules_count)
+        )
+        for mask in map(util.mask_func, range(8))
+    )
+
+    return SymbolLayout(
+        mask_rows=tuple(_to_bitboards(mask) for mask in masks),
+        mask_columns=tuple(_to_bitboards(zip(*mask)) for mask in masks),
+    )
+
+
+class SwissQRCodeEncoder(QRCode):
+    """
+    QR code encoder fitted to the Swiss QR-bill: the smallest version holding the payload with
+    the error correction level M and no border. The data modules are placed once, each mask
+    pattern is then applied and scored on bitboards
+    """
+
+    def __init__(self):
+        super().__init__(version=None, error_correction=ERROR_CORRECT_M, border=0)
+
+    def best_mask_pattern(self) -> int:
+        symbol_layout: SymbolLayout = get_symbol_layout(self.version, self.error_correction)
+
+        self.makeImpl(True, 0)
+        unmasked_rows: Tuple[int, ...] = tuple(
+            row ^ mask_row
+            for row, mask_row in zip(_to_bitboards(self.modules), symbol_layout.mask_rows[0])
+        )
+        unmasked_columns: Tuple[int, ...] = tuple(
+            column ^ mask_column
+            for column, mask_column in zip(
+                _to_bitboards(zip(*self.modules)), symbol_layout.mask_columns[0]
+            )
+        )
+
+        lost_points: List[int] = list(
+            _lost_point(
+                tuple(map(int.__xor__, unmasked_rows, mask_rows)),
+                tuple(map(int.__xor__, unmasked_columns, mask_columns)),
+            )
+            for mask_rows, mask_columns in zip(
+                symbol_layout.mask_rows, symbol_layout.mask_columns
+            )
+        )
+
+        return lost_points.index(min(lost_points))
+
+    def encode(self, payload: str) -> QRCodeMatrix:
+        self.add_data(payload)
+        self.make(fit=True)
+
+        if self.version > MAX_VERSION:
+            raise DataOverflowError(
+                f"The QR code needs the version {self.version}, over {MAX_VERSION}."
+            )
+
+        return tuple(tuple(row) for row in self.modules)
+
+
+# NOTE : The matrices are keyed by the payload, so that rendering the same invoice again, a
+#           demo or a re-sent invoice, skips the encoding.
+@lru_cache(maxsize=1024)
+def encode_qr_code(payload: str) -> QRCodeMatrix:
+    return SwissQRCodeEncoder().encode(payload)
@@ -3,6 +3,7 @@ from PIL import Image
 from qrcode import QRCode
 
 from .contents import InvoiceContent
+from .qr_code_encoder import QRCodeMatrix, encode_qr_code
 
 
 class QRInvoice:
@@ -119,7 +120,7 @@ class QRInvoice:
 
     @property
     def ccy_amt_amt(self) -> str:
-        return self.invoice_content.total_amount
+        return self.invoice_content.fields.total_amount
 
     @property
     def ccy_amt_ccy(self) -> str:
@@ -171,11 +172,11 @@ class QRInvoice:
 
     @property
     def rmt_inf_tp(self) -> str:
-        return self.invoice_content.reference_type
+        return self.invoice_content.fields.reference_type
 
     @property
     def rmt_inf_ref(self) -> str:
-        return self.invoice_content.reference.replace(" ", "")
+        return self.invoice_content.fields.reference
 
     @property
     def rmt_inf(self) -> str:
@@ -209,7 +210,7 @@ class QRInvoice:
 
         return qr_code_string
 
-    def generate_qr_code(self) -> Image.Image:
+    def _make_qr_code(self) -> QRCode:
         qr_code_string: str = self._generate_qr_code_string()
 
         qr_code: QRCode = QRCode(
@@ -218,4 +219,10 @@ class QRInvoice:
         qr_code.add_data(qr_code_string)
         qr_code.make()
 
-        return qr_code.make_image().get_image()
+        return qr_code
+
+    def generate_qr_code(self) -> Image.Image:
+        return self._make_qr_code().make_image().get_image()
+
+    def generate_qr_code_matrix(self) -> QRCodeMatrix:
+        return encode_qr_code(self._generate_qr_code_string())
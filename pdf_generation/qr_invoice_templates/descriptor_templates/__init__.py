@@ -1,41 +1,39 @@
 from pathlib import Path
-from typing import List
 
-from pdf_generation.content import Text
-from pdf_generation.template import DescriptorTemplate
+from pdf_generation.template import DescriptorTemplate, DrawProgram
 
-descriptor_templates: List[List[Text]] = [
+descriptor_program: DrawProgram = (
     DescriptorTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/descriptor_templates/author_template.json"
         )
-    ).load_template(),
-    DescriptorTemplate(
+    ).compile()
+    + DescriptorTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/descriptor_templates/header_template.json"
         )
-    ).load_template(),
-    DescriptorTemplate(
+    ).compile()
+    + DescriptorTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/descriptor_templates/invoice_template.json"
         )
-    ).load_template(),
-    DescriptorTemplate(
+    ).compile()
+    + DescriptorTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/descriptor_templates/patient_template.json"
         )
-    ).load_template(),
-]
+    ).compile()
+)
 
-qr_part_descriptor_templates: List[List[Text]] = [
+qr_part_descriptor_program: DrawProgram = (
     DescriptorTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/descriptor_templates/payment_section_template.json"
         )
-    ).load_template(),
-    DescriptorTemplate(
+    ).compile()
+    + DescriptorTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/descriptor_templates/receipt_template.json"
         )
-    ).load_template(),
-]
+    ).compile()
+)
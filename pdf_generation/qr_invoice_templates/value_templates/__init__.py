@@ -1,28 +1,26 @@
 from pathlib import Path
-from typing import List
 
-from pdf_generation.content import Value
-from pdf_generation.template import ValueTemplate
+from pdf_generation.template import DrawProgram, ValueTemplate
 
-value_templates: List[List[Value]] = [
+value_program: DrawProgram = (
     ValueTemplate(
         Path("pdf_generation/qr_invoice_templates/value_templates/author_template.json")
-    ).load_template(),
-    ValueTemplate(
+    ).compile()
+    + ValueTemplate(
         Path("pdf_generation/qr_invoice_templates/value_templates/invoice_template.json")
-    ).load_template(),
-    ValueTemplate(
+    ).compile()
+    + ValueTemplate(
         Path("pdf_generation/qr_invoice_templates/value_templates/patient_template.json")
-    ).load_template(),
-]
+    ).compile()
+)
 
-qr_part_value_templates: List[List[Value]] = [
+qr_part_value_program: DrawProgram = (
     ValueTemplate(
         Path(
             "pdf_generation/qr_invoice_templates/value_templates/payment_section_template.json"
         )
-    ).load_template(),
-    ValueTemplate(
+    ).compile()
+    + ValueTemplate(
         Path("pdf_generation/qr_invoice_templates/value_templates/receipt_template.json")
-    ).load_template(),
-]
+    ).compile()
+)
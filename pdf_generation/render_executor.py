@@ -0,0 +1,148 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from monitoring import (
+    RENDER_IN_FLIGHT,
+    RENDER_QUEUE_DEPTH,
+    RENDER_WAIT_SECONDS,
+    ProcessStackSampler,
+    add_stage_timings,
+    collect_stage_timings,
+)
+
+
+class RenderQueueFullError(Exception):
+    pass
+
+
+def _timed_call(function: Callable, *args) -> Tuple[float, Dict[str, float], Any]:
+    # NOTE : The start time is taken inside the worker so that it can be compared with the
+    #           submission time, even when the worker is another process, and the stages
+    #           timed by the worker are sent back to the request which has submitted it.
+    return (time.time(), *collect_stage_timings(function, *args))
+
+
+class RenderExecutor:
+    """
+    Runs the CPU-bound PDF rendering outside of the event loop, in a pool of threads or of
+    pre-forked processes. At most `workers + queue_size` renders are accepted at once, further
+    submissions are rejected with a `RenderQueueFullError`
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int = 2,
+        queue_size: int = 16,
+        sampling_rate: float = 100,
+    ):
+        self.kind: str = kind
+        self.workers: int = workers
+        self.queue_size: int = queue_size
+        self._stack_sampler: Optional[ProcessStackSampler] = None
+
+        if kind == "process":
+            context = multiprocessing.get_context()
+            self._stack_sampler = ProcessStackSampler(context, sampling_rate, "render-process")
+            self._executor: Executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=context,
+                initializer=self._stack_sampler.start_worker,
+            )
+            self._prefork()
+        elif kind == "thread":
+            self._executor: Executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="render"
+            )
+        else:
+            raise ValueError(f"Unknown render executor kind: {kind}")
+
+        self._in_flight: int = 0
+        self._completed: int = 0
+        self._wait_time_last: float = 0.0
+        self._wait_time_total: float = 0.0
+        self._wait_time_max: float = 0.0
+
+    def _prefork(self):
+        for future in [self._executor.submit(time.time) for _ in range(self.workers)]:
+            future.result()
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.workers)
+
+    @property
+    def wait_time_average(self) -> float:
+        return self._wait_time_total / self._completed if self._completed else 0.0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "wait_time_last": self._wait_time_last,
+            "wait_time_average": self.wait_time_average,
+            "wait_time_max": self._wait_time_max,
+        }
+
+    def _record_wait_time(self, wait_time: float):
+        wait_time: float = max(0.0, wait_time)
+
+        self._completed += 1
+        self._wait_time_last = wait_time
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+        RENDER_WAIT_SECONDS.observe(wait_time)
+
+    async def run(self, function: Callable, *args) -> Any:
+        if self._in_flight >= self.capacity:
+            raise RenderQueueFullError(
+                f"The render queue is full ({self.queue_depth} invoices waiting), retry later."
+            )
+
+        self._in_flight += 1
+        RENDER_IN_FLIGHT.inc()
+        RENDER_QUEUE_DEPTH.set(self.queue_depth)
+        submitted_at: float = time.time()
+
+        try:
+            started_at, stage_timings, result = await asyncio.get_event_loop().run_in_executor(
+                self._executor, partial(_timed_call, function, *args)
+            )
+        finally:
+            self._in_flight -= 1
+            RENDER_IN_FLIGHT.dec()
+            RENDER_QUEUE_DEPTH.set(self.queue_depth)
+
+        self._record_wait_time(started_at - submitted_at)
+        add_stage_timings(
+            {"render_wait": max(0.0, started_at - submitted_at), **stage_timings}
+        )
+
+        return result
+
+    def sample_stacks(self, seconds: float) -> Dict[str, int]:
+        """
+        Samples the stacks of the render processes for `seconds` seconds. The render threads
+        belong to the current process, so that they are sampled along with it instead
+        """
+        if self._stack_sampler is None:
+            return {}
+
+        return self._stack_sampler.sample(seconds, self.workers)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
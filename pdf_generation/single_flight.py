@@ -0,0 +1,35 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+Result = TypeVar("Result")
+
+
+class SingleFlight:
+    """
+    Coalesces the concurrent calls sharing a key: the first call runs and the following ones,
+    until it completes, wait for its result instead of running again
+    """
+
+    def __init__(self):
+        self.calls: int = 0
+        self.coalesced: int = 0
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, function: Callable[[], Awaitable[Result]]) -> Result:
+        flight: Optional[asyncio.Future] = self._flights.get(key)
+
+        if flight is None:
+            self.calls += 1
+            flight = asyncio.ensure_future(function())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.coalesced += 1
+
+        # NOTE : A waiter being cancelled, when its client disconnects, does not cancel the
+        #           flight the other waiters are waiting for.
+        return await asyncio.shield(flight)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
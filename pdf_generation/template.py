@@ -1,9 +1,47 @@
 import json
 from abc import ABC
+from operator import attrgetter
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from reportlab.pdfgen.canvas import Canvas
 
 from .content import Content, Graphic, SwissQRCode, Text, Value
+from .text_style import TextStyle
+
+DRAW_STRING_FUNCTIONS: Dict[str, Callable] = {
+    "": Canvas.drawString,
+    "R": Canvas.drawRightString,
+    "C": Canvas.drawCentredString,
+}
+
+
+class DrawOp(NamedTuple):
+    """
+    A text drawing operation, with its coordinates already converted to points. `value` reads
+    the text from the drawn content when the text is not static
+    """
+
+    draw_string: Callable
+    style: TextStyle
+    left: float
+    bottom: float
+    text: Optional[str]
+    value: Optional[Callable]
+
+
+DrawProgram = Tuple[DrawOp, ...]
+
+
+def compile_content(content: Union[Text, Value], top_shift: float = 0.0) -> DrawOp:
+    return DrawOp(
+        draw_string=DRAW_STRING_FUNCTIONS[content.style.align],
+        style=content.style,
+        left=content.left,
+        bottom=content.shifted_bottom(top_shift),
+        text=content.text if isinstance(content, Text) else None,
+        value=attrgetter(content.key) if isinstance(content, Value) else None,
+    )
 
 
 class Template(ABC):
@@ -14,6 +52,11 @@ class Template(ABC):
     def load_template(self) -> List[Content]:
         pass
 
+    def compile(self, top_shift: float = 0.0) -> DrawProgram:
+        return tuple(
+            compile_content(content, top_shift) for content in self.load_template()
+        )
+
 
 class DescriptorTemplate(Template):
     def load_template(self) -> List[Text]:
@@ -34,6 +77,9 @@ class ValueTemplate(Template):
         with open(self.path.resolve().as_posix()) as json_template:
             return list(Value(dict_value) for dict_value in json.load(json_template))
 
+    def compile_rows(self, rows: int, row_shift: float) -> Tuple[DrawProgram, ...]:
+        return tuple(self.compile(row * row_shift) for row in range(rows))
+
 
 class SwissQRCodeTemplate(Template):
     def load_template(self) -> List[SwissQRCode]:
@@ -1,4 +1,9 @@
+import sys
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional
 
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
@@ -13,6 +18,46 @@ class TTFontToRegister:
         pdfmetrics.registerFont(TTFont(self.family, self.path.resolve().as_posix()))
 
 
+class FontRegistry:
+    """
+    Parses and registers the TrueType fonts once per process. Registering before the workers
+    are forked lets every worker share the parsed fonts
+    """
+
+    def __init__(self, fonts: List[TTFontToRegister]):
+        self.fonts: List[TTFontToRegister] = fonts
+        self.registration_time: Optional[float] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    @property
+    def registered(self) -> bool:
+        return self.registration_time is not None
+
+    def register(self):
+        if self.registered:
+            return
+
+        with self._lock:
+            if self.registered:
+                return
+
+            started_at: float = time.perf_counter()
+
+            for font in self.fonts:
+                font.register()
+
+            self.registration_time = time.perf_counter() - started_at
+
+
+font_registry: FontRegistry = FontRegistry(
+    [
+        TTFontToRegister(Path("fonts/Arial.ttf"), "Arial"),
+        TTFontToRegister(Path("fonts/Arial Bold.ttf"), "Arial B"),
+        TTFontToRegister(Path("fonts/OCRB.ttf"), "ORCB"),
+    ]
+)
+
+
 class TextStyle:
     def __init__(self, family: str = "Arial", size: float = 9, align: str = ""):
         self.family: str = family
@@ -175,3 +220,8 @@ class QRInvoiceReceiptHeaderRightTextStyle(QRInvoiceReceiptHeaderTextStyle):
         super().__init__()
         self.size = 6
         self.align = "R"
+
+
+@lru_cache(maxsize=None)
+def get_text_style(name: str) -> TextStyle:
+    return getattr(sys.modules[__name__], name)()
@@ -2,12 +2,44 @@ from typing import List
 
 from starlette.routing import Route
 
-from .email import email_endpoint
+from .admin import debug_profile_endpoint, profile_endpoint, profiles_endpoint
+from .download import DownloadLinkSigner, download_endpoint
+from .email import deliver_email, email_endpoint, email_status_endpoint
+from .email_bulk import email_bulk_endpoint
 from .favicon import favicon_endpoint
+from .metrics import metrics_endpoint
 from .pdf import pdf_endpoint
+from .pdf_batch import pdf_batch_endpoint
+from .pdf_merged import pdf_merged_endpoint
 
 routes: List[Route] = [
     Route("/favicon.ico", endpoint=favicon_endpoint, include_in_schema=False),
+    Route("/metrics", endpoint=metrics_endpoint, include_in_schema=False),
+    Route(
+        "/debug/profile",
+        endpoint=debug_profile_endpoint,
+        methods=["GET"],
+        include_in_schema=False,
+    ),
+    Route(
+        "/admin/profiles",
+        endpoint=profiles_endpoint,
+        methods=["GET"],
+        include_in_schema=False,
+    ),
+    Route(
+        "/admin/profiles/{name}",
+        endpoint=profile_endpoint,
+        methods=["GET"],
+        include_in_schema=False,
+    ),
+    Route(
+        "/download/{tenant}/{key}/{name}", endpoint=download_endpoint, methods=["GET"]
+    ),
+    Route("/pdf/batch", endpoint=pdf_batch_endpoint, methods=["POST"]),
+    Route("/pdf/merged/{name}", endpoint=pdf_merged_endpoint, methods=["POST"]),
     Route("/pdf/{name}", endpoint=pdf_endpoint, methods=["POST"]),
     Route("/email", endpoint=email_endpoint, methods=["POST"]),
+    Route("/email/bulk", endpoint=email_bulk_endpoint, methods=["POST"]),
+    Route("/email/{email_id}", endpoint=email_status_endpoint, methods=["GET"]),
 ]
@@ -0,0 +1,94 @@
+import asyncio
+import hmac
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import FileResponse, PlainTextResponse, UJSONResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND
+
+from monitoring import StackSampler
+from pdf_generation import RenderExecutor
+
+
+def is_admin(request: Request) -> bool:
+    """
+    Whether the request carries the admin token as a bearer token. Without an admin token set,
+    the admin features are disabled
+    """
+    admin_token: Optional[str] = request.app.state.ADMIN_TOKEN
+
+    if not admin_token:
+        return False
+
+    # NOTE : The headers are compared as bytes, the comparison of strings being limited to
+    #           ASCII ones.
+    return hmac.compare_digest(
+        request.headers.get("Authorization", "").encode("latin-1"),
+        f"Bearer {admin_token}".encode("utf-8"),
+    )
+
+
+def admin_forbidden() -> UJSONResponse:
+    return UJSONResponse(
+        {"admin_error": "A valid admin token is required."}, status_code=HTTP_403_FORBIDDEN
+    )
+
+
+async def profiles_endpoint(request: Request):
+    if not is_admin(request):
+        return admin_forbidden()
+
+    return UJSONResponse(await run_in_threadpool(request.app.state.profile_store.list))
+
+
+async def profile_endpoint(request: Request):
+    if not is_admin(request):
+        return admin_forbidden()
+
+    profile_name: str = request.path_params["name"]
+    profile_path: Optional[Path] = await run_in_threadpool(
+        request.app.state.profile_store.get_path, profile_name
+    )
+
+    if profile_path is None:
+        return UJSONResponse(
+            {"admin_error": "The profile does not exist."}, status_code=HTTP_404_NOT_FOUND
+        )
+
+    return FileResponse(
+        profile_path, media_type="application/octet-stream", filename=profile_name
+    )
+
+
+async def debug_profile_endpoint(request: Request):
+    """
+    Samples the stacks of the threads of this worker and of its render processes for `seconds`
+    seconds and returns them collapsed, ready to be turned into a flame graph
+    """
+    if not is_admin(request):
+        return admin_forbidden()
+
+    max_seconds: float = request.app.state.stackSamplerMaxSeconds
+
+    try:
+        seconds: float = float(request.query_params.get("seconds", "10"))
+    except ValueError:
+        seconds: float = 0
+
+    if not 0 < seconds <= max_seconds:
+        return UJSONResponse(
+            {"admin_error": f"The sampling duration must be between 0 and {max_seconds} seconds."},
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    stack_sampler: StackSampler = request.app.state.stack_sampler
+    render_executor: RenderExecutor = request.app.state.render_executor
+    stacks, render_stacks = await asyncio.gather(
+        run_in_threadpool(stack_sampler.sample, seconds),
+        run_in_threadpool(render_executor.sample_stacks, seconds),
+    )
+    stacks: Dict[str, int] = {**stacks, **render_stacks}
+
+    return PlainTextResponse(stack_sampler.collapsed(stacks))
@@ -0,0 +1,132 @@
+import hashlib
+import hmac
+import time
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlencode
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import FileResponse, UJSONResponse
+from starlette.status import HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_410_GONE
+
+from pdf_generation import invoice_cache
+
+
+class DownloadLinkSigner:
+    """
+    Signs the download links of the stored invoices with HMAC-SHA256. A link is only valid
+    for the invoice and the filename it has been signed for, until it expires
+    """
+
+    def __init__(self, secret: bytes, ttl: float = 604800):
+        self.secret: bytes = secret
+        self.ttl: float = ttl
+
+    def signature(self, tenant: str, key: str, filename: str, expires: int) -> str:
+        message: bytes = f"{tenant}/{key}/{filename}/{expires}".encode("utf-8")
+
+        return hmac.new(self.secret, message, hashlib.sha256).hexdigest()
+
+    def expires(self) -> int:
+        return int(time.time() + self.ttl)
+
+    def url(self, base_url: str, tenant: str, key: str, filename: str, expires: int) -> str:
+        query: str = urlencode(
+            {"expires": expires, "signature": self.signature(tenant, key, filename, expires)}
+        )
+
+        return f"{base_url}/download/{tenant}/{key}/{filename}?{query}"
+
+    def verify(
+        self, tenant: str, key: str, filename: str, expires: int, signature: str
+    ) -> bool:
+        return hmac.compare_digest(
+            self.signature(tenant, key, filename, expires), signature
+        )
+
+
+async def download_endpoint(request: Request):
+    """
+    summary: Download an invoice sent by email
+    description: >
+        Download a generated PDF invoice from the signed link sent by email, until the link
+        expires
+
+    parameters:
+        -   in: path
+            name: tenant
+            schema:
+                type: string
+            required: true
+        -   in: path
+            name: key
+            schema:
+                type: string
+            required: true
+        -   in: path
+            name: name
+            schema:
+                type: string
+            required: true
+            description: The PDF filename
+        -   in: query
+            name: expires
+            schema:
+                type: integer
+            required: true
+            description: The link expiration time, as a UNIX timestamp
+        -   in: query
+            name: signature
+            schema:
+                type: string
+            required: true
+            description: The link signature
+
+    responses:
+        200:
+            description: The PDF invoice
+            content:
+                application/pdf:
+                    schema:
+                        type: string
+                        format: binary
+        403:
+            description: Forbidden Error, the link signature is invalid
+        404:
+            description: Not Found Error, the invoice is not stored anymore
+        410:
+            description: Gone Error, the link has expired
+    """
+    tenant: str = request.path_params["tenant"]
+    key: str = request.path_params["key"]
+    filename: str = request.path_params["name"]
+
+    try:
+        expires: int = int(request.query_params.get("expires", ""))
+    except ValueError:
+        expires: int = 0
+
+    if not request.app.state.download_link_signer.verify(
+        tenant, key, filename, expires, request.query_params.get("signature", "")
+    ):
+        return UJSONResponse(
+            {"download_error": "The link is invalid."}, status_code=HTTP_403_FORBIDDEN
+        )
+
+    if expires < time.time():
+        return UJSONResponse(
+            {"download_error": "The link has expired."}, status_code=HTTP_410_GONE
+        )
+
+    invoice_path: Optional[Path] = await run_in_threadpool(
+        invoice_cache.get_path, tenant, key
+    )
+
+    if invoice_path is None:
+        return UJSONResponse(
+            {"download_error": "The invoice is not available anymore."},
+            status_code=HTTP_404_NOT_FOUND,
+        )
+
+    return FileResponse(invoice_path, media_type="application/pdf", filename=filename)
@@ -1,27 +1,98 @@
 import base64
+from datetime import datetime
 from json.decoder import JSONDecodeError
-from pathlib import Path
-from typing import Dict
+from typing import Optional
 
-import requests
 import ujson
 from pydantic import ValidationError
-from requests import Response as RequestsResponse
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 from starlette.responses import UJSONResponse
-from starlette.status import HTTP_400_BAD_REQUEST
+from starlette.status import (
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_404_NOT_FOUND,
+)
 
 from models import Invoice
+from monitoring import request_stage
 from pdf_generation import PDFGenerator
 from pdf_generation.contents import InvoiceContent
+from pdf_generation.contents.invoice_fields import ZURICH
+from .email_bulk import deliver_bulk_email
+from .invoice_rendering import render_invoice, store_invoice
+
+
+async def deliver_email(app: Starlette, email_json: str) -> dict:
+    """
+    Sends an email from the email outbox, either a bulk email or the email of a single invoice
+    """
+    email: dict = ujson.loads(email_json)
+
+    if email["kind"] == "bulk":
+        return await deliver_bulk_email(app, email)
+
+    return await deliver_invoice_email(app, email["invoice"])
+
+
+async def deliver_invoice_email(app: Starlette, invoice_dict: dict) -> dict:
+    """
+    Generates the PDF of an invoice from the email outbox and sends it by email to the
+    author's and patient's mail addresses
+    """
+    with request_stage("email_delivery", "content"):
+        invoice: Invoice = Invoice(**invoice_dict)
+        invoice_content: InvoiceContent = InvoiceContent(invoice)
+        pdf_generator: PDFGenerator = PDFGenerator(invoice_content)
+
+    patient_name: str = f"{invoice.patient.firstname} {invoice.patient.lastname}"
+    message: dict = {
+        "sender": {"email": "facture@app.aposto.ch", "name": "Aposto"},
+        "to": [{"email": invoice.patient.email, "name": patient_name}],
+        "bcc": [{"email": invoice.author.email, "name": invoice.author.name,}],
+        "subject": "Aposto - Votre nouvelle facture",
+    }
+
+    # NOTE : With download links, the PDF is stored once and the email only carries a signed
+    #           link to it, instead of the whole PDF encoded in base 64.
+    if app.state.emailDownloadLinks:
+        with request_stage("email_delivery", "render"):
+            await store_invoice(app, pdf_generator)
+
+        expires: int = app.state.download_link_signer.expires()
+        download_url: str = app.state.download_link_signer.url(
+            app.state.apostoAPIURL,
+            pdf_generator.tenant,
+            pdf_generator.cache_key,
+            pdf_generator.invoice_filename,
+            expires,
+        )
+        expiry_date: str = datetime.fromtimestamp(expires, ZURICH).strftime("%d.%m.%Y")
+        message["htmlContent"] = f'<h1>Votre facture</h1><p>Bonjour {patient_name},</p><p>Vous pouvez dès à présent consulter votre facture du {invoice_content.date_string} en suivant <a href="{download_url}">ce lien</a>, valable jusqu\'au {expiry_date}.</p><p>À très bientôt,<br>{invoice.author.name}</p>'
+    else:
+        with request_stage("email_delivery", "render"):
+            invoice_pdf: bytes = await render_invoice(app, pdf_generator)
+
+        message["htmlContent"] = f"<h1>Votre facture</h1><p>Bonjour {patient_name},</p><p>Vous pouvez dès à présent consulter votre facture du {invoice_content.date_string} en pièce jointe.</p><p>À très bientôt,<br>{invoice.author.name}</p>"
+        message["attachment"] = [
+            {"content": base64.b64encode(invoice_pdf), "name": pdf_generator.invoice_filename}
+        ]
+
+    data: str = ujson.dumps(message, reject_bytes=False)
+
+    with request_stage("email_delivery", "sendinblue"):
+        return await app.state.sendinblue_client.send_email(data.encode())
 
 
 async def email_endpoint(request: Request):
     """
     summary: Send an invoice by email
     description: >
-        Generate an invoice as PDF, based on Tarif 590 and QR-invoice Swiss standards and send it
-        to the author's and patient's mail addresses
+        Queue an invoice to be generated as PDF, based on Tarif 590 and QR-invoice Swiss
+        standards, and sent to the author's and patient's mail addresses. The emails are sent
+        in the background, in order, and the email status is available from
+        _/email/{email_id}_
 
     requestBody:
         description: The content used to generate the PDF invoice
@@ -32,8 +103,12 @@ async def email_endpoint(request: Request):
                     $ref: '#/components/schemas/Invoice'
 
     responses:
-        201:
-            description: The invoice as been successfully sent
+        202:
+            description: The invoice has been queued to be sent
+            content:
+                application/json:
+                    schema:
+                        $ref: '#/components/schemas/EmailStatus'
         400:
             description: Bad Request Error
             content:
@@ -44,56 +119,66 @@ async def email_endpoint(request: Request):
                             -   type: array
                                 items:
                                     $ref: '#/components/schemas/ValidationError'
-                            -   $ref: '#/components/schemas/SendinBlueError'
     """
 
     try:
-        invoice_dict: dict = await request.json()
+        with request_stage("email", "parse"):
+            invoice_dict: dict = await request.json()
     except JSONDecodeError as json_error:
         error_msg: str = f"{json_error.msg}: line {json_error.lineno} column {json_error.colno} (char {json_error.pos})"
 
         return UJSONResponse({"json_error": error_msg}, status_code=HTTP_400_BAD_REQUEST)
 
     try:
-        invoice: Invoice = Invoice(**invoice_dict)
+        with request_stage("email", "validation"):
+            Invoice(**invoice_dict)
     except ValidationError as validation_error:
         return UJSONResponse(validation_error.errors(), status_code=HTTP_400_BAD_REQUEST)
 
-    invoice_content: InvoiceContent = InvoiceContent(invoice)
-
-    invoice_path: Path = PDFGenerator(invoice_content).generate_invoice()
-
-    with open(invoice_path.as_posix(), "rb") as invoice_file:
-        invoice_file_base_64 = base64.b64encode(invoice_file.read())
-
-    data: str = ujson.dumps(
-        {
-            "sender": {"email": "facture@app.aposto.ch", "name": "Aposto"},
-            "to": [
-                {
-                    "email": invoice.patient.email,
-                    "name": f"{invoice.patient.firstname} {invoice.patient.lastname}",
-                }
-            ],
-            "bcc": [{"email": invoice.author.email, "name": invoice.author.name,}],
-            "htmlContent": f"<h1>Votre facture</h1><p>Bonjour {invoice.patient.firstname} {invoice.patient.lastname},</p><p>Vous pouvez dès à présent consulter votre facture du {invoice_content.date_string} en pièce jointe.</p><p>À très bientôt,<br>{invoice.author.name}</p>",
-            "subject": "Aposto - Votre nouvelle facture",
-            "attachment": [{"content": invoice_file_base_64, "name": invoice_path.name}],
-        },
-        reject_bytes=False,
+    with request_stage("email", "enqueue"):
+        email_id: str = await run_in_threadpool(
+            request.app.state.email_outbox.enqueue,
+            ujson.dumps({"kind": "invoice", "invoice": invoice_dict}),
+        )
+
+    return UJSONResponse(
+        {"id": email_id, "status": request.app.state.email_outbox.QUEUED},
+        status_code=HTTP_202_ACCEPTED,
     )
 
-    headers: Dict[str, str] = {
-        "accept": "application/json",
-        "content-type": "application/json",
-        "api-key": request.app.state.SEND_IN_BLUE_API_KEY,
-    }
 
-    response: RequestsResponse = requests.post(
-        f"{request.app.state.sendInBlueAPIURL}/smtp/email", data=data, headers=headers
+async def email_status_endpoint(request: Request):
+    """
+    summary: Get the status of an invoice email
+    description: >
+        Get whether a queued invoice email is still waiting to be sent, is being sent, has been
+        sent or has failed, with the number of attempts and the last error
+
+    parameters:
+        -   in: path
+            name: email_id
+            schema:
+                type: string
+            required: true
+            description: The email identifier returned when the invoice has been queued
+
+    responses:
+        200:
+            description: The email status
+            content:
+                application/json:
+                    schema:
+                        $ref: '#/components/schemas/EmailStatus'
+        404:
+            description: Not Found Error, no email has this identifier
+    """
+    email_status: Optional[dict] = await run_in_threadpool(
+        request.app.state.email_outbox.get, request.path_params["email_id"]
     )
 
-    if response.status_code == 201:
-        return UJSONResponse()
+    if email_status is None:
+        return UJSONResponse(
+            {"email_error": "This email does not exist."}, status_code=HTTP_404_NOT_FOUND
+        )
 
-    return UJSONResponse(ujson.loads(response.text), status_code=HTTP_400_BAD_REQUEST)
+    return UJSONResponse(email_status)
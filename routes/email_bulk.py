@@ -0,0 +1,283 @@
+import base64
+import math
+from io import BytesIO
+from json.decoder import JSONDecodeError
+from typing import Dict, List, Tuple
+from zipfile import ZIP_DEFLATED, ZipFile
+
+import ujson
+from pydantic import ValidationError
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import UJSONResponse
+from starlette.status import HTTP_202_ACCEPTED, HTTP_400_BAD_REQUEST
+
+from models import Invoice
+from pdf_generation import PDFGenerator
+from pdf_generation.contents import InvoiceContent
+from .invoice_rendering import render_invoices
+
+PATIENT: str = "patient"
+AUTHOR: str = "author"
+
+# NOTE : The filename and the PDF of a rendered invoice.
+InvoiceFile = Tuple[str, bytes]
+
+# NOTE : The number of an email among the emails sent to the same recipient, and their total.
+EmailPart = Tuple[int, int]
+
+
+def _date_list(date_strings: List[str]) -> str:
+    if len(date_strings) == 1:
+        return date_strings[0]
+
+    return f"{', '.join(date_strings[:-1])} et {date_strings[-1]}"
+
+
+def _part_suffix(part: EmailPart) -> str:
+    return f" ({part[0]}/{part[1]})" if part[1] > 1 else ""
+
+
+def _patient_message(
+    invoice: Invoice,
+    invoice_contents: List[InvoiceContent],
+    invoice_files: List[InvoiceFile],
+    part: EmailPart,
+) -> dict:
+    patient_name: str = f"{invoice.patient.firstname} {invoice.patient.lastname}"
+    date_list: str = _date_list([content.date_string for content in invoice_contents])
+    invoices_sentence: str = (
+        f"votre facture du {date_list}"
+        if len(invoice_contents) == 1
+        else f"vos factures du {date_list}"
+    )
+
+    return {
+        "to": [{"email": invoice.patient.email, "name": patient_name}],
+        "htmlContent": f"<h1>{'Votre facture' if len(invoice_contents) == 1 else 'Vos factures'}</h1><p>Bonjour {patient_name},</p><p>Vous pouvez dès à présent consulter {invoices_sentence} en pièce jointe.</p><p>À très bientôt,<br>{invoice.author.name}</p>",
+        "subject": (
+            "Aposto - Votre nouvelle facture"
+            if len(invoice_contents) == 1
+            else "Aposto - Vos nouvelles factures"
+        )
+        + _part_suffix(part),
+        "attachment": [
+            {"content": base64.b64encode(invoice_pdf), "name": filename}
+            for filename, invoice_pdf in invoice_files
+        ],
+    }
+
+
+def _author_message(
+    invoice: Invoice,
+    invoice_contents: List[InvoiceContent],
+    invoice_files: List[InvoiceFile],
+    part: EmailPart,
+) -> dict:
+    digest: BytesIO = BytesIO()
+
+    with ZipFile(digest, "w", ZIP_DEFLATED) as archive:
+        for index, (filename, invoice_pdf) in enumerate(invoice_files):
+            archive.writestr(f"{index:04d}-{filename}", invoice_pdf)
+
+    # NOTE : The patient emails are queued along with the digest, they may not be sent yet.
+    queued_sentence: str = (
+        "1 facture a été programmée pour être envoyée à votre patient"
+        if len(invoice_contents) == 1
+        else f"{len(invoice_contents)} factures ont été programmées pour être envoyées à vos patients"
+    )
+    archive_suffix: str = f"-{part[0]}" if part[1] > 1 else ""
+
+    return {
+        "to": [{"email": invoice.author.email, "name": invoice.author.name}],
+        "htmlContent": f"<h1>Vos factures programmées</h1><p>Bonjour {invoice.author.name},</p><p>{queued_sentence}. Vous pouvez les consulter dans l'archive en pièce jointe.</p>",
+        "subject": "Aposto - Récapitulatif des factures programmées" + _part_suffix(part),
+        "attachment": [
+            {
+                "content": base64.b64encode(digest.getvalue()),
+                "name": f"factures-{invoice_contents[0].date_string}{archive_suffix}.zip",
+            }
+        ],
+    }
+
+
+async def deliver_bulk_email(app: Starlette, bulk_email: dict) -> dict:
+    """
+    Generates the PDF of the invoices of a bulk email from the email outbox and sends them in a
+    single email, either attached to the patient's one or zipped in the author's digest
+    """
+    invoices: List[Invoice] = [
+        Invoice(**invoice_dict) for invoice_dict in bulk_email["invoices"]
+    ]
+    invoice_contents: List[InvoiceContent] = [InvoiceContent(invoice) for invoice in invoices]
+    pdf_generators: List[PDFGenerator] = [
+        PDFGenerator(invoice_content) for invoice_content in invoice_contents
+    ]
+    invoice_pdfs: List[bytes] = await render_invoices(app, pdf_generators)
+    invoice_files: List[InvoiceFile] = [
+        (pdf_generator.invoice_filename, invoice_pdf)
+        for pdf_generator, invoice_pdf in zip(pdf_generators, invoice_pdfs)
+    ]
+
+    part: EmailPart = tuple(bulk_email.get("part", (1, 1)))
+    message: dict = (
+        _patient_message(invoices[0], invoice_contents, invoice_files, part)
+        if bulk_email["recipient"] == PATIENT
+        else _author_message(invoices[0], invoice_contents, invoice_files, part)
+    )
+    data: str = ujson.dumps(
+        {"sender": {"email": "facture@app.aposto.ch", "name": "Aposto"}, **message},
+        reject_bytes=False,
+    )
+
+    return await app.state.sendinblue_client.send_email(data.encode())
+
+
+def _group_invoices(
+    invoices: List[Invoice], max_invoices: int
+) -> List[Tuple[str, str, List[int], EmailPart]]:
+    """
+    Groups the invoice indexes by patient, along with the author, and by author for the
+    digests. The groups are split in emails of at most `max_invoices` invoices, so that their
+    attachments stay within the email size limits, and listed with their recipient role, email
+    address and part
+    """
+    patients: Dict[Tuple[str, str], List[int]] = {}
+    authors: Dict[str, List[int]] = {}
+
+    for index, invoice in enumerate(invoices):
+        patients.setdefault((invoice.author.email, invoice.patient.email), []).append(index)
+        authors.setdefault(invoice.author.email, []).append(index)
+
+    groups: List[Tuple[str, str, List[int]]] = [
+        (PATIENT, patient_email, indexes)
+        for (_, patient_email), indexes in patients.items()
+    ] + [(AUTHOR, author_email, indexes) for author_email, indexes in authors.items()]
+
+    emails: List[Tuple[str, str, List[int], EmailPart]] = []
+
+    for recipient, email, indexes in groups:
+        parts: int = math.ceil(len(indexes) / max_invoices)
+
+        for part, start in enumerate(range(0, len(indexes), max_invoices), 1):
+            emails.append(
+                (recipient, email, indexes[start : start + max_invoices], (part, parts))
+            )
+
+    return emails
+
+
+async def email_bulk_endpoint(request: Request):
+    """
+    summary: Send several invoices by email
+    description: >
+        Queue several invoices to be generated as PDF, based on Tarif 590 and QR-invoice Swiss
+        standards, and sent by email. Each patient receives an email with all their invoices,
+        and each author receives a digest with all the invoices zipped. Both are split in
+        several emails when they would carry too many invoices. The emails are sent in the
+        background and their status is available from _/email/{email_id}_
+
+    requestBody:
+        description: The contents used to generate the PDF invoices
+        required: true
+        content:
+            application/json:
+                schema:
+                    type: array
+                    items:
+                        $ref: '#/components/schemas/Invoice'
+
+    responses:
+        202:
+            description: >
+                The emails have been queued to be sent, with their recipient and the indexes of
+                their invoices
+            content:
+                application/json:
+                    schema:
+                        type: array
+                        items:
+                            $ref: '#/components/schemas/EmailStatus'
+        400:
+            description: >
+                Bad Request Error. The location of the validation errors starts with the index of
+                the invalid invoice
+            content:
+                application/json:
+                    schema:
+                        oneOf:
+                            -   $ref: '#/components/schemas/JSONError'
+                            -   type: array
+                                items:
+                                    $ref: '#/components/schemas/ValidationError'
+    """
+    try:
+        invoice_dicts: list = await request.json()
+    except JSONDecodeError as json_error:
+        error_msg: str = f"{json_error.msg}: line {json_error.lineno} column {json_error.colno} (char {json_error.pos})"
+
+        return UJSONResponse({"json_error": error_msg}, status_code=HTTP_400_BAD_REQUEST)
+
+    if not isinstance(invoice_dicts, list) or not invoice_dicts:
+        return UJSONResponse(
+            {"json_error": "The invoices must be sent as a non-empty JSON array."},
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    if len(invoice_dicts) > request.app.state.emailBulkMaxInvoices:
+        return UJSONResponse(
+            {
+                "json_error": f"At most {request.app.state.emailBulkMaxInvoices} invoices can be sent at once."
+            },
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    invoices: List[Invoice] = []
+    validation_errors: List[dict] = []
+
+    for index, invoice_dict in enumerate(invoice_dicts):
+        if not isinstance(invoice_dict, dict):
+            validation_errors.append(
+                {"loc": [index], "msg": "value is not a valid dict", "type": "type_error.dict"}
+            )
+            continue
+
+        try:
+            invoices.append(Invoice(**invoice_dict))
+        except ValidationError as validation_error:
+            validation_errors.extend(
+                {**error, "loc": [index, *error["loc"]]}
+                for error in validation_error.errors()
+            )
+
+    if validation_errors:
+        return UJSONResponse(validation_errors, status_code=HTTP_400_BAD_REQUEST)
+
+    emails: List[dict] = []
+
+    for recipient, email, indexes, part in _group_invoices(
+        invoices, request.app.state.emailBulkMaxAttachments
+    ):
+        email_id: str = await run_in_threadpool(
+            request.app.state.email_outbox.enqueue,
+            ujson.dumps(
+                {
+                    "kind": "bulk",
+                    "recipient": recipient,
+                    "invoices": [invoice_dicts[index] for index in indexes],
+                    "part": part,
+                }
+            ),
+        )
+        emails.append(
+            {
+                "id": email_id,
+                "status": request.app.state.email_outbox.QUEUED,
+                "recipient": recipient,
+                "email": email,
+                "invoices": indexes,
+            }
+        )
+
+    return UJSONResponse(emails, status_code=HTTP_202_ACCEPTED)
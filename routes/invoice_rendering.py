@@ -0,0 +1,94 @@
+import asyncio
+import time
+from typing import List, Optional
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+
+from pdf_generation import InvoiceLock, PDFGenerator
+
+# NOTE : How often a worker checks whether the invoice locked by another worker is stored.
+LOCK_POLL_INTERVAL: float = 0.05
+
+
+async def _acquire(invoice_lock: InvoiceLock, timeout: float) -> bool:
+    deadline: float = time.monotonic() + timeout
+
+    while not await run_in_threadpool(invoice_lock.acquire, False):
+        if time.monotonic() >= deadline:
+            return False
+
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+
+    return True
+
+
+async def _render_and_store(app: Starlette, pdf_generator: PDFGenerator, store: bool) -> bytes:
+    if not store:
+        return await app.state.render_executor.run(pdf_generator.render)
+
+    invoice_lock: InvoiceLock = pdf_generator.lock()
+
+    # NOTE : When the render holding the lock hangs, the invoice is rendered without the lock
+    #           instead, its storing being atomic anyway.
+    await _acquire(invoice_lock, app.state.renderLockTimeout)
+
+    try:
+        # NOTE : Another worker may have stored the invoice while this one was waiting for the
+        #           lock.
+        invoice_pdf: Optional[bytes] = await run_in_threadpool(pdf_generator.cached_invoice)
+
+        if invoice_pdf is None:
+            invoice_pdf = await app.state.render_executor.run(pdf_generator.render)
+            await run_in_threadpool(pdf_generator.save, invoice_pdf)
+    finally:
+        await run_in_threadpool(invoice_lock.release)
+
+    return invoice_pdf
+
+
+async def render_invoice(
+    app: Starlette, pdf_generator: PDFGenerator, store: bool = False
+) -> bytes:
+    """
+    Returns the stored invoice or renders it, storing it if `store` or `persistInvoices` is
+    set. The concurrent requests for the same invoice share a single rendering, within a worker
+    and, through a lock file, across the workers sharing the store
+    """
+    invoice_pdf: Optional[bytes] = await run_in_threadpool(pdf_generator.cached_invoice)
+
+    if invoice_pdf is not None:
+        return invoice_pdf
+
+    store = store or app.state.persistInvoices
+
+    return await app.state.render_flights.run(
+        (pdf_generator.tenant, pdf_generator.cache_key, store),
+        lambda: _render_and_store(app, pdf_generator, store),
+    )
+
+
+async def store_invoice(app: Starlette, pdf_generator: PDFGenerator):
+    """
+    Renders and stores an invoice, unless it is already stored, so that it can be downloaded
+    """
+    if await run_in_threadpool(pdf_generator.cached_invoice_path) is not None:
+        return
+
+    await render_invoice(app, pdf_generator, store=True)
+
+
+async def render_invoices(
+    app: Starlette, pdf_generators: List[PDFGenerator]
+) -> List[bytes]:
+    """
+    Renders several invoices in parallel, at most `pdfBatchWindow` at once, so that they do not
+    fill the render queue
+    """
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(app.state.pdfBatchWindow)
+
+    async def render(pdf_generator: PDFGenerator) -> bytes:
+        async with semaphore:
+            return await render_invoice(app, pdf_generator)
+
+    return await asyncio.gather(*(render(pdf_generator) for pdf_generator in pdf_generators))
@@ -0,0 +1,13 @@
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from monitoring import metrics_registry
+
+
+async def metrics_endpoint(_: Request):
+    # NOTE : The metrics of every worker are read from their files, outside of the event loop.
+    metrics: bytes = await run_in_threadpool(generate_latest, metrics_registry())
+
+    return Response(metrics, media_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,38 @@
 from json.decoder import JSONDecodeError
-from pathlib import Path
 
 from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
-from starlette.responses import FileResponse, UJSONResponse
-from starlette.status import HTTP_400_BAD_REQUEST
+from starlette.responses import Response, UJSONResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_503_SERVICE_UNAVAILABLE
 
 from models import Invoice
-from pdf_generation import PDFGenerator
+from monitoring import request_stage
+from pdf_generation import PDFGenerator, RenderQueueFullError
 from pdf_generation.contents import InvoiceContent
+from .admin import is_admin
+from .invoice_rendering import render_invoice
+
+
+def _render_pdf(invoice_dict: dict) -> bytes:
+    return PDFGenerator(InvoiceContent(Invoice(**invoice_dict))).render()
+
+
+async def _profiled_pdf_response(request: Request, invoice_dict: dict) -> Response:
+    """
+    Validates and renders the invoice in a single thread under the profiler, bypassing the
+    invoice store and the render workers so that the whole render path is profiled
+    """
+    try:
+        profile_name, invoice_pdf = await run_in_threadpool(
+            request.app.state.profile_store.profile, "pdf", _render_pdf, invoice_dict
+        )
+    except ValidationError as validation_error:
+        return UJSONResponse(validation_error.errors(), status_code=HTTP_400_BAD_REQUEST)
+
+    return Response(
+        invoice_pdf, media_type="application/pdf", headers={"Profile-Name": profile_name}
+    )
 
 
 async def pdf_endpoint(request: Request):
@@ -53,22 +77,43 @@ async def pdf_endpoint(request: Request):
                             -   type: array
                                 items:
                                     $ref: '#/components/schemas/ValidationError'
+        503:
+            description: Service Unavailable Error, too many invoices are being generated
+            content:
+                application/json:
+                    schema:
+                        $ref: '#/components/schemas/RenderError'
     """
     try:
-        invoice_dict: dict = await request.json()
+        with request_stage("pdf", "parse"):
+            invoice_dict: dict = await request.json()
     except JSONDecodeError as json_error:
         error_msg: str = f"{json_error.msg}: line {json_error.lineno} column {json_error.colno} (char {json_error.pos})"
 
         return UJSONResponse({"json_error": error_msg}, status_code=HTTP_400_BAD_REQUEST)
 
+    if "profile" in request.query_params and is_admin(request):
+        return await _profiled_pdf_response(request, invoice_dict)
+
     try:
-        invoice: Invoice = Invoice(**invoice_dict)
+        with request_stage("pdf", "validation"):
+            invoice: Invoice = Invoice(**invoice_dict)
     except ValidationError as validation_error:
         print(validation_error)
         return UJSONResponse(validation_error.errors(), status_code=HTTP_400_BAD_REQUEST)
 
-    invoice_content: InvoiceContent = InvoiceContent(invoice)
+    with request_stage("pdf", "content"):
+        invoice_content: InvoiceContent = InvoiceContent(invoice)
 
-    invoice_path: Path = PDFGenerator(invoice_content).generate_invoice()
+        pdf_generator: PDFGenerator = PDFGenerator(invoice_content)
+
+    try:
+        with request_stage("pdf", "render"):
+            invoice_pdf: bytes = await render_invoice(request.app, pdf_generator)
+    except RenderQueueFullError as render_queue_full_error:
+        return UJSONResponse(
+            {"render_error": str(render_queue_full_error)},
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        )
 
-    return FileResponse(invoice_path.as_posix())
+    return Response(invoice_pdf, media_type="application/pdf")
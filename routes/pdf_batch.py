@@ -0,0 +1,248 @@
+import asyncio
+import json
+from json.decoder import JSONDecodeError
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+from zipfile import ZIP_STORED, ZipFile
+
+from pydantic import ValidationError
+from starlette.requests import Request
+from starlette.responses import StreamingResponse, UJSONResponse
+from starlette.types import Receive, Scope, Send
+from starlette.status import HTTP_400_BAD_REQUEST
+
+from models import Invoice
+from pdf_generation import PDFGenerator, RenderQueueFullError
+from pdf_generation.contents import InvoiceContent
+from .invoice_rendering import render_invoice
+from .zip_stream import ZipStream
+
+# NOTE : An item of a batch is either the invoice dict or the error raised while reading it.
+BatchItem = Tuple[Optional[dict], Optional[dict]]
+
+# NOTE : The index, the filename and the PDF of a rendered invoice, or its error instead of the
+#           filename and the PDF.
+RenderedItem = Tuple[int, Optional[str], Optional[bytes], Optional[dict]]
+
+ARCHIVE_HEADERS: Dict[str, str] = {
+    "Content-Disposition": 'attachment; filename="invoices.zip"'
+}
+
+
+class ArchiveResponse(StreamingResponse):
+    """
+    Streams the ZIP archive while the NDJSON request body may still be read. Unlike
+    `StreamingResponse`, it does not listen for the client disconnection on the receive
+    channel, which would steal the request body chunks: the archive stream checks for it
+    between the invoices instead, once the body is read
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+def _json_error_message(json_error: JSONDecodeError) -> str:
+    return f"{json_error.msg}: line {json_error.lineno} column {json_error.colno} (char {json_error.pos})"
+
+
+async def _read_json_array(invoice_dicts: list) -> AsyncIterator[BatchItem]:
+    for invoice_dict in invoice_dicts:
+        yield (invoice_dict, None)
+
+
+async def _read_ndjson(request: Request) -> AsyncIterator[BatchItem]:
+    buffer: bytes = b""
+
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            if line.strip():
+                yield _parse_ndjson_line(line)
+
+    if buffer.strip():
+        yield _parse_ndjson_line(buffer)
+
+
+def _parse_ndjson_line(line: bytes) -> BatchItem:
+    try:
+        return (json.loads(line), None)
+    except JSONDecodeError as json_error:
+        return (None, {"json_error": _json_error_message(json_error)})
+
+
+def _validate_invoice(invoice_dict: dict) -> Tuple[Optional[Invoice], Optional[dict]]:
+    if not isinstance(invoice_dict, dict):
+        return (None, {"json_error": "An invoice must be a JSON object."})
+
+    try:
+        return (Invoice(**invoice_dict), None)
+    except ValidationError as validation_error:
+        return (None, {"validation_errors": validation_error.errors()})
+
+
+async def _render_item(request: Request, index: int, invoice: Invoice) -> RenderedItem:
+    pdf_generator: PDFGenerator = PDFGenerator(InvoiceContent(invoice))
+
+    try:
+        invoice_pdf: bytes = await render_invoice(request.app, pdf_generator)
+    except RenderQueueFullError as render_queue_full_error:
+        return (index, None, None, {"render_error": str(render_queue_full_error)})
+    except Exception as render_error:
+        # NOTE : A failed invoice is listed in the manifest, instead of ending the stream with
+        #           a truncated archive.
+        return (
+            index,
+            None,
+            None,
+            {"render_error": f"The invoice could not be generated: {render_error!r}"},
+        )
+
+    return (index, f"{index:04d}-{pdf_generator.invoice_filename}", invoice_pdf, None)
+
+
+def _write_rendered_items(
+    archive: ZipFile, rendered_items: Set[asyncio.Future], manifest: List[dict]
+):
+    for rendered_item in rendered_items:
+        index, filename, invoice_pdf, error = rendered_item.result()
+
+        if error is not None:
+            manifest.append({"index": index, **error})
+            continue
+
+        archive.writestr(filename, invoice_pdf)
+        manifest.append({"index": index, "filename": filename})
+
+
+async def _is_disconnected(request: Request, body_read: bool) -> bool:
+    # NOTE : While the NDJSON body is streamed, its reading raises `ClientDisconnect` instead,
+    #           listening on the receive channel would steal its chunks.
+    return body_read and await request.is_disconnected()
+
+
+async def _stream_archive(
+    request: Request, batch_items: AsyncIterator[BatchItem], body_read: bool
+) -> AsyncIterator[bytes]:
+    """
+    Renders the invoices and streams the archive, until the batch ends or the client
+    disconnects
+    """
+    zip_stream: ZipStream = ZipStream()
+    manifest: List[dict] = []
+    pending: Set[asyncio.Future] = set()
+    window: int = request.app.state.pdfBatchWindow
+    index: int = 0
+
+    try:
+        with ZipFile(zip_stream, "w", ZIP_STORED) as archive:
+            async for invoice_dict, error in batch_items:
+                if error is None:
+                    invoice, error = _validate_invoice(invoice_dict)
+
+                if error is None:
+                    pending.add(asyncio.ensure_future(_render_item(request, index, invoice)))
+                else:
+                    manifest.append({"index": index, **error})
+
+                index += 1
+
+                # NOTE : At most `window` invoices are rendered at once. Each one is written in
+                #           the archive and sent as soon as it is rendered, so that the memory
+                #           used does not depend on the batch size.
+                while len(pending) >= window:
+                    if await _is_disconnected(request, body_read):
+                        return
+
+                    done, pending = await asyncio.wait(
+                        pending, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    _write_rendered_items(archive, done, manifest)
+                    yield zip_stream.drain()
+
+            while pending:
+                if await _is_disconnected(request, True):
+                    return
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                _write_rendered_items(archive, done, manifest)
+                yield zip_stream.drain()
+
+            manifest.sort(key=lambda item: item["index"])
+            archive.writestr("manifest.json", json.dumps(manifest, default=str))
+    finally:
+        for rendered_item in pending:
+            rendered_item.cancel()
+
+    yield zip_stream.drain()
+
+
+async def pdf_batch_endpoint(request: Request):
+    """
+    summary: Generate a batch of invoices as a ZIP archive of PDF
+    description: >
+        Generate several invoices at once, based on Tarif 590 and QR-invoice Swiss standards.
+        The invoices are sent either as a JSON array or as newline-delimited JSON, one invoice
+        per line. The archive is streamed while the invoices are generated. It contains a
+        _manifest.json_ file listing, for each invoice index, either its PDF filename or the
+        errors preventing its generation
+
+    requestBody:
+        description: The contents used to generate the PDF invoices
+        required: true
+        content:
+            application/json:
+                schema:
+                    type: array
+                    items:
+                        $ref: '#/components/schemas/Invoice'
+            application/x-ndjson:
+                schema:
+                    $ref: '#/components/schemas/Invoice'
+
+    responses:
+        200:
+            description: The ZIP archive of the generated PDF invoices
+            content:
+                application/zip:
+                    schema:
+                        type: string
+                        format: binary
+        400:
+            description: Bad Request Error, the JSON body is not an array
+            content:
+                application/json:
+                    schema:
+                        $ref: '#/components/schemas/JSONError'
+    """
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        return ArchiveResponse(
+            _stream_archive(request, _read_ndjson(request), body_read=False),
+            media_type="application/zip",
+            headers=ARCHIVE_HEADERS,
+        )
+
+    try:
+        invoice_dicts: list = await request.json()
+    except JSONDecodeError as json_error:
+        return UJSONResponse(
+            {"json_error": _json_error_message(json_error)},
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    if not isinstance(invoice_dicts, list):
+        return UJSONResponse(
+            {"json_error": "The invoices must be sent as a JSON array."},
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    return ArchiveResponse(
+        _stream_archive(request, _read_json_array(invoice_dicts), body_read=True),
+        media_type="application/zip",
+        headers=ARCHIVE_HEADERS,
+    )
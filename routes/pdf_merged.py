@@ -0,0 +1,123 @@
+from json.decoder import JSONDecodeError
+from typing import List
+
+from pydantic import ValidationError
+from starlette.requests import Request
+from starlette.responses import Response, UJSONResponse
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_503_SERVICE_UNAVAILABLE
+
+from models import Invoice
+from pdf_generation import MergedPDFGenerator, RenderQueueFullError
+from pdf_generation.contents import InvoiceContent
+
+
+async def pdf_merged_endpoint(request: Request):
+    """
+    summary: Generate several invoices as a single PDF
+    description: >
+        Generate several invoices back to back in a single PDF document, ready to be printed,
+        based on Tarif 590 and QR-invoice Swiss standards
+
+    parameters:
+        -   in: path
+            name: name
+            schema:
+                type: string
+            required: true
+            description: >
+                The generated PDF filename. It is needed when downloading the PDF from this
+                endpoint or when opening the PDF in a browser directly from the endpoint URL.
+                It should end with _.pdf_
+
+    requestBody:
+        description: The contents used to generate the PDF invoices
+        required: true
+        content:
+            application/json:
+                schema:
+                    type: array
+                    items:
+                        $ref: '#/components/schemas/Invoice'
+
+    responses:
+        200:
+            description: The generated PDF invoices
+            content:
+                application/pdf:
+                    schema:
+                        type: string
+                        format: binary
+        400:
+            description: >
+                Bad Request Error. The location of the validation errors starts with the index of
+                the invalid invoice
+            content:
+                application/json:
+                    schema:
+                        oneOf:
+                            -   $ref: '#/components/schemas/JSONError'
+                            -   type: array
+                                items:
+                                    $ref: '#/components/schemas/ValidationError'
+        503:
+            description: Service Unavailable Error, too many invoices are being generated
+            content:
+                application/json:
+                    schema:
+                        $ref: '#/components/schemas/RenderError'
+    """
+    try:
+        invoice_dicts: list = await request.json()
+    except JSONDecodeError as json_error:
+        error_msg: str = f"{json_error.msg}: line {json_error.lineno} column {json_error.colno} (char {json_error.pos})"
+
+        return UJSONResponse({"json_error": error_msg}, status_code=HTTP_400_BAD_REQUEST)
+
+    if not isinstance(invoice_dicts, list) or not invoice_dicts:
+        return UJSONResponse(
+            {"json_error": "The invoices must be sent as a non-empty JSON array."},
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    if len(invoice_dicts) > request.app.state.pdfMergedMaxInvoices:
+        return UJSONResponse(
+            {
+                "json_error": f"At most {request.app.state.pdfMergedMaxInvoices} invoices can be merged."
+            },
+            status_code=HTTP_400_BAD_REQUEST,
+        )
+
+    invoice_contents: List[InvoiceContent] = []
+    validation_errors: List[dict] = []
+
+    for index, invoice_dict in enumerate(invoice_dicts):
+        if not isinstance(invoice_dict, dict):
+            validation_errors.append(
+                {"loc": [index], "msg": "value is not a valid dict", "type": "type_error.dict"}
+            )
+            continue
+
+        try:
+            invoice_contents.append(InvoiceContent(Invoice(**invoice_dict)))
+        except ValidationError as validation_error:
+            validation_errors.extend(
+                {**error, "loc": [index, *error["loc"]]}
+                for error in validation_error.errors()
+            )
+
+    if validation_errors:
+        return UJSONResponse(validation_errors, status_code=HTTP_400_BAD_REQUEST)
+
+    merged_pdf_generator: MergedPDFGenerator = MergedPDFGenerator(invoice_contents)
+
+    try:
+        invoices_pdf: bytes = await request.app.state.render_executor.run(
+            merged_pdf_generator.render
+        )
+    except RenderQueueFullError as render_queue_full_error:
+        return UJSONResponse(
+            {"render_error": str(render_queue_full_error)},
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+    return Response(invoices_pdf, media_type="application/pdf")
@@ -0,0 +1,27 @@
+from io import RawIOBase
+from typing import List
+
+
+class ZipStream(RawIOBase):
+    """
+    Write-only and unseekable file object for `zipfile.ZipFile`. It keeps what has been written
+    until it is drained, so that an archive can be sent entry by entry while it is written
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+
+        return len(data)
+
+    def drain(self) -> bytes:
+        chunk: bytes = b"".join(self._chunks)
+        self._chunks.clear()
+
+        return chunk
@@ -1,8 +1,14 @@
+from typing import List, Tuple
 from unittest import TestCase
 
-from responses import POST, Response
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import UJSONResponse
+from starlette.routing import Route
 
 from app import config
+from mailing import CircuitBreaker, SendinBlueClient
 
 
 class InvoiceContentTestCase(TestCase):
@@ -182,22 +188,40 @@ class InvoiceContentImproperJSONTestCase(TestCase):
 
 
 class SendInBlueMock:
+    """
+    Stand-in for the SendinBlue API. It answers the queued responses in order, the last one
+    being repeated, and records the received requests
+    """
+
+    SUCCESS_JSON: dict = {"messageId": "1"}
     FAILURE_JSON: dict = {"code": "400", "message": "Invalid parameter"}
 
-    @staticmethod
-    def smtp_email_success_request() -> Response:
-        return Response(
-            POST,
-            f"{config['sendInBlueAPIURL']}/smtp/email",
-            json={"messageId": "1"},
-            status=201,
+    def __init__(self, *responses: Tuple[int, dict]):
+        self.responses: List[Tuple[int, dict]] = list(responses)
+        self.requests: List[dict] = []
+        self.app: Starlette = Starlette(
+            routes=[Route("/v3/smtp/email", self.smtp_email, methods=["POST"])]
         )
 
-    @staticmethod
-    def smtp_email_failure_request() -> Response:
-        return Response(
-            POST,
-            f"{config['sendInBlueAPIURL']}/smtp/email",
-            json=SendInBlueMock.FAILURE_JSON,
-            status=400,
+    @classmethod
+    def success(cls) -> "SendInBlueMock":
+        return cls((201, cls.SUCCESS_JSON))
+
+    @classmethod
+    def failure(cls) -> "SendInBlueMock":
+        return cls((400, cls.FAILURE_JSON))
+
+    async def smtp_email(self, request: Request) -> UJSONResponse:
+        self.requests.append(await request.json())
+        status_code, body = (
+            self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
         )
+
+        return UJSONResponse(body, status_code=status_code)
+
+    def client(self, **kwargs) -> SendinBlueClient:
+        kwargs.setdefault("retry_backoff", 0)
+        kwargs.setdefault("circuit_breaker", CircuitBreaker())
+        kwargs.setdefault("transport", httpx.ASGITransport(app=self.app))
+
+        return SendinBlueClient(config["sendInBlueAPIURL"], "api-key", **kwargs)
@@ -1,14 +1,36 @@
+import asyncio
+import base64
+import json
+import pstats
+import re
+import time
 from datetime import datetime
+from io import BytesIO
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Optional
 from unittest import TestCase
+from zipfile import ZipFile
 
-import responses
 from requests import Response
-from starlette.status import HTTP_200_OK, HTTP_400_BAD_REQUEST
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_403_FORBIDDEN,
+    HTTP_404_NOT_FOUND,
+    HTTP_410_GONE,
+)
 from starlette.testclient import TestClient
 
-from app import app
+from app import app, config
+from mailing import EmailDispatcher, EmailOutbox, SendinBlueClient
 from models import Invoice
+from monitoring import ProfileStore
+from pdf_generation import PDFGenerator, invoice_cache
+from pdf_generation.contents import InvoiceContent
+from routes import deliver_email
+from routes.invoice_rendering import render_invoice
 from tests.commons import (
     InvoiceContentDemoModeTestCase,
     InvoiceContentImproperJSONTestCase,
@@ -18,6 +40,10 @@ from tests.commons import (
 )
 
 
+def _server_timing_stages(response: Response) -> list:
+    return [timing.split(";")[0] for timing in response.headers["Server-Timing"].split(", ")]
+
+
 class APITestCase(TestCase):
     def setUp(self):
         self.test_client: TestClient = TestClient(app)
@@ -37,22 +63,20 @@ class PDFEndpointTest(
         InvoiceContentInvalidTestCase.setUp(self)
         InvoiceContentImproperJSONTestCase.setUp(self)
 
-        invoice: Invoice = Invoice(**self.invoice)
-
-        self.invoice_path: Path = Path(
-            f"./out/{invoice.id}/invoice-{int(datetime.timestamp(invoice.timestamp))}.pdf"
-        )
+        self.invoice_path: Path = self._invoice_path(self.invoice)
 
         if self.invoice_path.is_file():
             self.invoice_path.unlink()
 
-        self.invoice_path_demo: Path = Path(
-            f"./out/demo/invoice-{int(datetime.timestamp(invoice.timestamp))}.pdf"
-        )
+        self.invoice_path_demo: Path = self._invoice_path(self.invoice_demo)
 
         if self.invoice_path_demo.is_file():
             self.invoice_path_demo.unlink()
 
+    @staticmethod
+    def _invoice_path(invoice_dict: dict) -> Path:
+        return PDFGenerator(InvoiceContent(Invoice(**invoice_dict))).invoice_path
+
     def test_pdf_endpoint(self):
         test_time: datetime = datetime.now()
         test_time_str: str = test_time.strftime("%Y%m%d%H%M%S")
@@ -66,6 +90,10 @@ class PDFEndpointTest(
 
     def test_pdf_endpoint_iban(self):
         self.invoice["author"]["iban"] = "CH2641234567890123456"
+        self.invoice_path = self._invoice_path(self.invoice)
+
+        if self.invoice_path.is_file():
+            self.invoice_path.unlink()
 
         test_time: datetime = datetime.now()
         test_time_str: str = test_time.strftime("%Y%m%d%H%M%S")
@@ -103,6 +131,87 @@ class PDFEndpointTest(
         self.assertTrue(f"/CreationDate (D:{test_time_str}" in response.text)
         self.assertTrue(self.invoice_path_demo.is_file())
 
+    def test_pdf_endpoint_cache(self):
+        first_response: Response = self.test_client.post(
+            "/pdf/invoice.pdf", json=self.invoice
+        )
+        hits: int = invoice_cache.hits
+
+        self.invoice["author"]["phone"] = "0816606836"
+        self.invoice["services"][0]["date"] = 1584921600.000
+        second_response: Response = self.test_client.post(
+            "/pdf/invoice.pdf", json=self.invoice
+        )
+
+        self.assertEqual(second_response.status_code, HTTP_200_OK)
+        self.assertEqual(second_response.content, first_response.content)
+        self.assertEqual(invoice_cache.hits, hits + 1)
+
+    def test_pdf_endpoint_cache_same_timestamp(self):
+        first_response: Response = self.test_client.post(
+            "/pdf/invoice.pdf", json=self.invoice
+        )
+
+        self.invoice["patient"]["city"] = "Amden"
+        second_response: Response = self.test_client.post(
+            "/pdf/invoice.pdf", json=self.invoice
+        )
+
+        self.assertEqual(second_response.status_code, HTTP_200_OK)
+        self.assertNotEqual(second_response.content, first_response.content)
+        self.assertNotEqual(self._invoice_path(self.invoice), self.invoice_path)
+
+        self._invoice_path(self.invoice).unlink()
+
+    def test_pdf_endpoint_without_persistence(self):
+        app.state.persistInvoices = False
+
+        try:
+            response: Response = self.test_client.post(
+                "/pdf/invoice.pdf", json=self.invoice
+            )
+        finally:
+            app.state.persistInvoices = True
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.headers["Content-Type"], "application/pdf")
+        self.assertTrue(response.content.startswith(b"%PDF"))
+        self.assertFalse(self.invoice_path.is_file())
+
+    def test_pdf_endpoint_single_flight(self):
+        completed: int = app.state.render_executor.stats["completed"]
+
+        async def render_concurrently() -> list:
+            return await asyncio.gather(
+                *(
+                    render_invoice(app, PDFGenerator(InvoiceContent(Invoice(**self.invoice))))
+                    for _ in range(3)
+                )
+            )
+
+        invoice_pdfs: list = asyncio.get_event_loop().run_until_complete(
+            render_concurrently()
+        )
+
+        self.assertEqual(app.state.render_executor.stats["completed"], completed + 1)
+        self.assertEqual(len(set(invoice_pdfs)), 1)
+        self.assertEqual(self.invoice_path.read_bytes(), invoice_pdfs[0])
+
+    def test_pdf_endpoint_lock_timeout(self):
+        app.state.renderLockTimeout = 0.1
+        pdf_generator: PDFGenerator = PDFGenerator(InvoiceContent(Invoice(**self.invoice)))
+
+        try:
+            with pdf_generator.lock():
+                invoice_pdf: bytes = asyncio.get_event_loop().run_until_complete(
+                    render_invoice(app, pdf_generator, store=True)
+                )
+        finally:
+            app.state.renderLockTimeout = config["renderLockTimeout"]
+
+        self.assertTrue(invoice_pdf.startswith(b"%PDF"))
+        self.assertEqual(self.invoice_path.read_bytes(), invoice_pdf)
+
     def test_pdf_endpoint_invalid_content(self):
         response: Response = self.test_client.post(
             "/pdf/invoice.pdf", json=self.invoice_invalid
@@ -120,6 +229,160 @@ class PDFEndpointTest(
         self.assertEqual(response.json(), InvoiceContentImproperJSONTestCase.FAILURE_JSON)
 
 
+class PDFBatchEndpointTest(
+    APITestCase,
+    InvoiceContentTestCase,
+    InvoiceContentDemoModeTestCase,
+    InvoiceContentInvalidTestCase,
+    InvoiceContentImproperJSONTestCase,
+):
+    def setUp(self):
+        APITestCase.setUp(self)
+        InvoiceContentTestCase.setUp(self)
+        InvoiceContentDemoModeTestCase.setUp(self)
+        InvoiceContentInvalidTestCase.setUp(self)
+        InvoiceContentImproperJSONTestCase.setUp(self)
+
+    def _assert_archive(self, response: Response) -> list:
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.headers["Content-Type"], "application/zip")
+
+        archive: ZipFile = ZipFile(BytesIO(response.content))
+        manifest: list = json.loads(archive.read("manifest.json"))
+
+        for item in manifest:
+            if "filename" in item:
+                self.assertTrue(archive.read(item["filename"]).startswith(b"%PDF"))
+
+        return manifest
+
+    def test_pdf_batch_endpoint(self):
+        response: Response = self.test_client.post(
+            "/pdf/batch", json=[self.invoice, self.invoice_invalid, self.invoice_demo]
+        )
+        manifest: list = self._assert_archive(response)
+
+        self.assertEqual(list(item["index"] for item in manifest), [0, 1, 2])
+        self.assertIn("filename", manifest[0])
+        self.assertEqual(
+            manifest[1]["validation_errors"], InvoiceContentInvalidTestCase.FAILURE_JSON
+        )
+        self.assertIn("filename", manifest[2])
+
+    def test_pdf_batch_endpoint_ndjson(self):
+        response: Response = self.test_client.post(
+            "/pdf/batch",
+            data="\n".join(
+                [json.dumps(self.invoice), self.invoice_improper_json, json.dumps(self.invoice)]
+            ),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        manifest: list = self._assert_archive(response)
+
+        self.assertIn("filename", manifest[0])
+        self.assertIn("json_error", manifest[1])
+        self.assertNotEqual(manifest[0]["filename"], manifest[2]["filename"])
+
+    def test_pdf_batch_endpoint_render_error(self):
+        class FailingFlights:
+            async def run(self, *_):
+                raise RuntimeError("Drawing failed")
+
+        invoice_path: Path = PDFGenerator(
+            InvoiceContent(Invoice(**self.invoice))
+        ).invoice_path
+
+        if invoice_path.is_file():
+            invoice_path.unlink()
+
+        render_flights = app.state.render_flights
+        app.state.render_flights = FailingFlights()
+
+        try:
+            response: Response = self.test_client.post("/pdf/batch", json=[self.invoice])
+        finally:
+            app.state.render_flights = render_flights
+
+        manifest: list = self._assert_archive(response)
+
+        self.assertIn("Drawing failed", manifest[0]["render_error"])
+
+    def test_pdf_batch_endpoint_disconnect(self):
+        body: bytes = json.dumps([self.invoice_demo] * 20).encode()
+        messages: list = [
+            {"type": "http.request", "body": body, "more_body": False},
+            {"type": "http.disconnect"},
+        ]
+        sent: list = []
+
+        async def receive() -> dict:
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message: dict):
+            sent.append(message)
+
+        scope: dict = {
+            "type": "http",
+            "method": "POST",
+            "path": "/pdf/batch",
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"content-type", b"application/json")],
+        }
+        asyncio.get_event_loop().run_until_complete(app(scope, receive, send))
+
+        archive_body: bytes = b"".join(
+            message.get("body", b"")
+            for message in sent
+            if message["type"] == "http.response.body"
+        )
+
+        self.assertEqual(sent[0]["status"], HTTP_200_OK)
+        self.assertNotIn(b"manifest.json", archive_body)
+
+    def test_pdf_batch_endpoint_not_array(self):
+        response: Response = self.test_client.post("/pdf/batch", json=self.invoice)
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+
+class PDFMergedEndpointTest(
+    APITestCase,
+    InvoiceContentTestCase,
+    InvoiceContentDemoModeTestCase,
+    InvoiceContentInvalidTestCase,
+):
+    def setUp(self):
+        APITestCase.setUp(self)
+        InvoiceContentTestCase.setUp(self)
+        InvoiceContentDemoModeTestCase.setUp(self)
+        InvoiceContentInvalidTestCase.setUp(self)
+
+    def test_pdf_merged_endpoint(self):
+        response: Response = self.test_client.post(
+            "/pdf/merged/invoices.pdf", json=[self.invoice, self.invoice_demo, self.invoice]
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.headers["Content-Type"], "application/pdf")
+        self.assertEqual(response.content.count(b"/Type /Page\n"), 6)
+        self.assertEqual(response.content.count(b"/Subtype /Form"), 2)
+
+    def test_pdf_merged_endpoint_invalid_content(self):
+        response: Response = self.test_client.post(
+            "/pdf/merged/invoices.pdf", json=[self.invoice, self.invoice_invalid]
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.json(),
+            list(
+                {**error, "loc": [1, *error["loc"]]}
+                for error in InvoiceContentInvalidTestCase.FAILURE_JSON
+            ),
+        )
+
+
 class EmailEndpointTest(
     APITestCase,
     InvoiceContentTestCase,
@@ -131,25 +394,183 @@ class EmailEndpointTest(
         InvoiceContentTestCase.setUp(self)
         InvoiceContentInvalidTestCase.setUp(self)
         InvoiceContentImproperJSONTestCase.setUp(self)
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.sendinblue_client: SendinBlueClient = app.state.sendinblue_client
+        self.email_outbox: EmailOutbox = app.state.email_outbox
+        app.state.email_outbox = EmailOutbox(Path(self.directory.name, "emails.sqlite3"))
+        self.email_dispatcher: EmailDispatcher = EmailDispatcher(
+            app.state.email_outbox,
+            lambda email_json: deliver_email(app, email_json),
+            rate=1000,
+            retry_backoff=0,
+        )
 
-    @responses.activate
-    def test_email_endpoint_success(self):
-        responses.add(SendInBlueMock.smtp_email_success_request())
+    def tearDown(self):
+        asyncio.get_event_loop().run_until_complete(app.state.sendinblue_client.close())
+        app.state.sendinblue_client = self.sendinblue_client
+        app.state.email_outbox = self.email_outbox
+        app.state.emailDownloadLinks = config["emailDownloadLinks"]
+        app.state.emailBulkMaxAttachments = config["emailBulkMaxAttachments"]
+        self.directory.cleanup()
 
+    def test_email_endpoint_server_timing(self):
         response: Response = self.test_client.post("/email", json=self.invoice)
 
-        self.assertEqual(response.status_code, HTTP_200_OK)
-        self.assertEqual(response.headers["Content-Type"], "application/json")
+        self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        self.assertEqual(_server_timing_stages(response), ["parse", "validation", "enqueue"])
+
+    def _send_email(
+        self, sendinblue_mock: SendInBlueMock, invoice: Optional[dict] = None
+    ) -> dict:
+        app.state.sendinblue_client = sendinblue_mock.client(retries=0)
+
+        response: Response = self.test_client.post("/email", json=invoice or self.invoice)
+
+        self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        self.assertEqual(response.json()["status"], "queued")
+
+        asyncio.get_event_loop().run_until_complete(self.email_dispatcher.dispatch_batch())
+
+        return self.test_client.get(f"/email/{response.json()['id']}").json()
+
+    def test_email_endpoint_success(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+
+        email_status: dict = self._send_email(sendinblue_mock)
+
+        self.assertEqual(email_status["status"], "sent")
+        self.assertEqual(email_status["message_id"], "1")
+        self.assertEqual(len(sendinblue_mock.requests), 1)
+        self.assertEqual(
+            sendinblue_mock.requests[0]["to"][0]["email"], self.invoice["patient"]["email"]
+        )
+
+    def test_email_endpoint_invoices_key(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+
+        email_status: dict = self._send_email(sendinblue_mock, {**self.invoice, "invoices": []})
+
+        self.assertEqual(email_status["status"], "sent")
+        self.assertEqual(
+            sendinblue_mock.requests[0]["to"][0]["email"], self.invoice["patient"]["email"]
+        )
 
-    @responses.activate
     def test_email_endpoint_failure(self):
-        responses.add(SendInBlueMock.smtp_email_failure_request())
+        email_status: dict = self._send_email(SendInBlueMock.failure())
 
-        response: Response = self.test_client.post("/email", json=self.invoice)
+        self.assertEqual(email_status["status"], "failed")
+        self.assertEqual(email_status["error"], SendInBlueMock.FAILURE_JSON["message"])
+
+    def test_email_endpoint_retry(self):
+        email_status: dict = self._send_email(SendInBlueMock((503, {"message": "Unavailable"})))
+
+        self.assertEqual(email_status["status"], "queued")
+        self.assertEqual(email_status["attempts"], 1)
+        self.assertEqual(email_status["error"], "Unavailable")
+
+    def test_email_endpoint_download_link(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        app.state.emailDownloadLinks = True
+
+        email_status: dict = self._send_email(sendinblue_mock)
+        sent_email: dict = sendinblue_mock.requests[0]
+        download_url: str = re.search(r'href="([^"]+)"', sent_email["htmlContent"]).group(1)
+
+        self.assertEqual(email_status["status"], "sent")
+        self.assertNotIn("attachment", sent_email)
+        self.assertTrue(download_url.startswith(f"{config['apostoAPIURL']}/download/"))
+
+        response: Response = self.test_client.get(
+            download_url[len(config["apostoAPIURL"]) :]
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.headers["Content-Type"], "application/pdf")
+        self.assertTrue(response.content.startswith(b"%PDF"))
+
+    def test_email_bulk_endpoint(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        app.state.sendinblue_client = sendinblue_mock.client(retries=0)
+        other_invoice: dict = {
+            **self.invoice,
+            "patient": {**self.invoice["patient"], "email": "MarcelDupont@teleworm.us"},
+        }
+
+        response: Response = self.test_client.post(
+            "/email/bulk", json=[self.invoice, other_invoice, self.invoice]
+        )
+
+        self.assertEqual(response.status_code, HTTP_202_ACCEPTED)
+        self.assertEqual(
+            [(email["recipient"], email["invoices"]) for email in response.json()],
+            [("patient", [0, 2]), ("patient", [1]), ("author", [0, 1, 2])],
+        )
+
+        asyncio.get_event_loop().run_until_complete(self.email_dispatcher.dispatch_batch())
+
+        for email in response.json():
+            email_status: dict = self.test_client.get(f"/email/{email['id']}").json()
+
+            self.assertEqual(email_status["status"], "sent")
+
+        sent_emails: dict = {
+            sent_email["to"][0]["email"]: sent_email for sent_email in sendinblue_mock.requests
+        }
+        patient_email: dict = sent_emails[self.invoice["patient"]["email"]]
+        author_email: dict = sent_emails[self.invoice["author"]["email"]]
+        digest: bytes = base64.b64decode(author_email["attachment"][0]["content"])
+
+        self.assertEqual(len(sent_emails), 3)
+        self.assertNotIn("bcc", patient_email)
+        self.assertEqual(len(patient_email["attachment"]), 2)
+        self.assertEqual(len(ZipFile(BytesIO(digest)).namelist()), 3)
+
+    def test_email_bulk_endpoint_split(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        app.state.sendinblue_client = sendinblue_mock.client(retries=0)
+        app.state.emailBulkMaxAttachments = 2
+
+        response: Response = self.test_client.post("/email/bulk", json=[self.invoice] * 3)
+
+        self.assertEqual(
+            [(email["recipient"], email["invoices"]) for email in response.json()],
+            [("patient", [0, 1]), ("patient", [2]), ("author", [0, 1]), ("author", [2])],
+        )
+
+        asyncio.get_event_loop().run_until_complete(self.email_dispatcher.dispatch_batch())
+
+        author_emails: list = [
+            sent_email
+            for sent_email in sendinblue_mock.requests
+            if sent_email["to"][0]["email"] == self.invoice["author"]["email"]
+        ]
+        author_emails.sort(key=lambda sent_email: sent_email["subject"])
+
+        self.assertEqual(
+            [author_email["subject"] for author_email in author_emails],
+            [
+                "Aposto - Récapitulatif des factures programmées (1/2)",
+                "Aposto - Récapitulatif des factures programmées (2/2)",
+            ],
+        )
+        self.assertIn("2 factures ont été programmées", author_emails[0]["htmlContent"])
+        self.assertIn("1 facture a été programmée", author_emails[1]["htmlContent"])
+
+    def test_email_bulk_endpoint_invalid_content(self):
+        response: Response = self.test_client.post(
+            "/email/bulk", json=[self.invoice, self.invoice_invalid]
+        )
 
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.headers["Content-Type"], "application/json")
-        self.assertDictEqual(response.json(), SendInBlueMock.FAILURE_JSON)
+        self.assertEqual(
+            [error["loc"] for error in response.json()],
+            [[1, *error["loc"]] for error in InvoiceContentInvalidTestCase.FAILURE_JSON],
+        )
+
+    def test_email_status_endpoint_not_found(self):
+        response: Response = self.test_client.get("/email/unknown")
+
+        self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
 
     def test_email_endpoint_invalid_content(self):
         response: Response = self.test_client.post("/email", json=self.invoice_invalid)
@@ -164,3 +585,219 @@ class EmailEndpointTest(
 
         self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
         self.assertEqual(response.json(), InvoiceContentImproperJSONTestCase.FAILURE_JSON)
+
+
+class DownloadEndpointTest(APITestCase, InvoiceContentTestCase):
+    def setUp(self):
+        APITestCase.setUp(self)
+        InvoiceContentTestCase.setUp(self)
+
+        self.pdf_generator: PDFGenerator = PDFGenerator(
+            InvoiceContent(Invoice(**self.invoice))
+        )
+        self.pdf_generator.save(self.pdf_generator.render())
+
+    def _download_path(self, expires: int, filename: str = "invoice.pdf") -> str:
+        download_url: str = app.state.download_link_signer.url(
+            "",
+            self.pdf_generator.tenant,
+            self.pdf_generator.cache_key,
+            filename,
+            expires,
+        )
+
+        return download_url.replace(filename, "invoice.pdf")
+
+    def test_download_endpoint(self):
+        response: Response = self.test_client.get(
+            self._download_path(app.state.download_link_signer.expires())
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.headers["Content-Type"], "application/pdf")
+        self.assertIn("invoice.pdf", response.headers["Content-Disposition"])
+
+    def test_download_endpoint_invalid_signature(self):
+        response: Response = self.test_client.get(
+            self._download_path(app.state.download_link_signer.expires(), "other.pdf")
+        )
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_download_endpoint_expired(self):
+        response: Response = self.test_client.get(self._download_path(int(time.time()) - 1))
+
+        self.assertEqual(response.status_code, HTTP_410_GONE)
+
+
+class MetricsEndpointTest(APITestCase, InvoiceContentTestCase):
+    def setUp(self):
+        APITestCase.setUp(self)
+        InvoiceContentTestCase.setUp(self)
+
+        invoice_path: Path = PDFGenerator(InvoiceContent(Invoice(**self.invoice))).invoice_path
+
+        if invoice_path.is_file():
+            invoice_path.unlink()
+
+    def test_metrics_endpoint(self):
+        self.test_client.post("/pdf/invoice.pdf", json=self.invoice)
+
+        response: Response = self.test_client.get("/metrics")
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertIn("text/plain", response.headers["Content-Type"])
+
+        for sample in (
+            'aposto_request_seconds_count{route="pdf",status_code="200"}',
+            'aposto_request_stage_seconds_count{route="pdf",stage="validation"}',
+            'aposto_request_stage_seconds_count{route="pdf",stage="send"}',
+            'aposto_render_stage_seconds_count{stage="drawing"}',
+            'aposto_render_stage_seconds_count{stage="qr_encoding"}',
+            'aposto_render_cache_lookups_total{result="miss"}',
+        ):
+            self.assertIn(sample, response.text)
+
+
+class ServerTimingTest(APITestCase, InvoiceContentTestCase):
+    def setUp(self):
+        APITestCase.setUp(self)
+        InvoiceContentTestCase.setUp(self)
+
+        invoice_path: Path = PDFGenerator(InvoiceContent(Invoice(**self.invoice))).invoice_path
+
+        if invoice_path.is_file():
+            invoice_path.unlink()
+
+    def test_server_timing_pdf(self):
+        response: Response = self.test_client.post("/pdf/invoice.pdf", json=self.invoice)
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(
+            _server_timing_stages(response),
+            [
+                "parse",
+                "validation",
+                "content",
+                "render_wait",
+                "qr_encoding",
+                "drawing",
+                "save",
+                "render",
+            ],
+        )
+        self.assertRegex(response.headers["Server-Timing"], r"^parse;dur=\d+\.\d{3}, ")
+
+    def test_server_timing_without_stages(self):
+        response: Response = self.test_client.get("/metrics")
+
+        self.assertNotIn("Server-Timing", response.headers)
+
+
+class AdminProfilesTest(APITestCase, InvoiceContentTestCase):
+    def setUp(self):
+        APITestCase.setUp(self)
+        InvoiceContentTestCase.setUp(self)
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.profile_store: ProfileStore = app.state.profile_store
+        app.state.profile_store = ProfileStore(Path(self.directory.name))
+        app.state.ADMIN_TOKEN = "admin-token"
+        self.admin_headers: dict = {"Authorization": "Bearer admin-token"}
+
+    def tearDown(self):
+        app.state.profile_store = self.profile_store
+        app.state.ADMIN_TOKEN = None
+        self.directory.cleanup()
+
+    def test_pdf_endpoint_profile(self):
+        response: Response = self.test_client.post(
+            "/pdf/invoice.pdf?profile", json=self.invoice, headers=self.admin_headers
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertEqual(response.headers["Content-Type"], "application/pdf")
+
+        profile_name: str = response.headers["Profile-Name"]
+        profiles: list = self.test_client.get(
+            "/admin/profiles", headers=self.admin_headers
+        ).json()
+
+        self.assertEqual([profile["name"] for profile in profiles], [profile_name])
+
+        profile_response: Response = self.test_client.get(
+            f"/admin/profiles/{profile_name}", headers=self.admin_headers
+        )
+        profile_path: Path = Path(self.directory.name, "downloaded.prof")
+        profile_path.write_bytes(profile_response.content)
+        functions: list = [function for _, _, function in pstats.Stats(str(profile_path)).stats]
+
+        self.assertIn("render", functions)
+        self.assertIn("generate_qr_code_matrix", functions)
+
+    def test_pdf_endpoint_profile_without_admin_token(self):
+        response: Response = self.test_client.post(
+            "/pdf/invoice.pdf?profile",
+            json=self.invoice,
+            headers={"Authorization": "Bearer other-token"},
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertNotIn("Profile-Name", response.headers)
+        self.assertEqual(app.state.profile_store.list(), [])
+
+    def test_pdf_endpoint_profile_invalid_content(self):
+        del self.invoice["author"]["name"]
+
+        response: Response = self.test_client.post(
+            "/pdf/invoice.pdf?profile", json=self.invoice, headers=self.admin_headers
+        )
+
+        self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_admin_profiles_forbidden(self):
+        self.assertEqual(
+            self.test_client.get("/admin/profiles").status_code, HTTP_403_FORBIDDEN
+        )
+
+        app.state.ADMIN_TOKEN = None
+
+        self.assertEqual(
+            self.test_client.get("/admin/profiles", headers=self.admin_headers).status_code,
+            HTTP_403_FORBIDDEN,
+        )
+
+    def test_admin_profiles_non_ascii_token(self):
+        response: Response = self.test_client.get(
+            "/admin/profiles", headers={"Authorization": "Bearer admin-tokén"}
+        )
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
+
+    def test_admin_profile_not_found(self):
+        for profile_name in ("20201010101010-pdf-0123abcd.prof", "..%2Fconfig.json"):
+            response: Response = self.test_client.get(
+                f"/admin/profiles/{profile_name}", headers=self.admin_headers
+            )
+
+            self.assertEqual(response.status_code, HTTP_404_NOT_FOUND)
+
+    def test_debug_profile(self):
+        response: Response = self.test_client.get(
+            "/debug/profile?seconds=0.05", headers=self.admin_headers
+        )
+
+        self.assertEqual(response.status_code, HTTP_200_OK)
+        self.assertRegex(response.text, r"^(\S+;)*\S+ \d+\n")
+
+    def test_debug_profile_invalid_seconds(self):
+        for seconds in ("0", "3600", "ten"):
+            response: Response = self.test_client.get(
+                f"/debug/profile?seconds={seconds}", headers=self.admin_headers
+            )
+
+            self.assertEqual(response.status_code, HTTP_400_BAD_REQUEST)
+
+    def test_debug_profile_forbidden(self):
+        response: Response = self.test_client.get("/debug/profile?seconds=0.05")
+
+        self.assertEqual(response.status_code, HTTP_403_FORBIDDEN)
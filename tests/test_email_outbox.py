@@ -0,0 +1,191 @@
+import asyncio
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+from unittest import TestCase
+
+from mailing import CircuitOpenError, EmailDispatcher, EmailOutbox, SendinBlueError
+
+
+class EmailOutboxTestCase(TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.outbox: EmailOutbox = EmailOutbox(
+            Path(self.directory.name, "emails.sqlite3"), lease=0.05
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class EmailOutboxTest(EmailOutboxTestCase):
+    def test_enqueue(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+
+        self.assertEqual(self.outbox.get(email_id)["status"], EmailOutbox.QUEUED)
+        self.assertIsNone(self.outbox.get("unknown"))
+
+    def test_claim(self):
+        first_id: str = self.outbox.enqueue('{"id": "1"}')
+        second_id: str = self.outbox.enqueue('{"id": "2"}')
+
+        self.assertEqual(self.outbox.claim(1), [(first_id, '{"id": "1"}', 1)])
+        self.assertEqual(self.outbox.claim(10), [(second_id, '{"id": "2"}', 1)])
+        self.assertEqual(self.outbox.claim(10), [])
+        self.assertEqual(self.outbox.get(first_id)["status"], EmailOutbox.SENDING)
+
+    def test_claim_expired_lease(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+        self.outbox.claim(1)
+        time.sleep(0.05)
+
+        self.assertEqual(self.outbox.claim(1), [(email_id, '{"id": "1"}', 2)])
+
+    def test_retry(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+        self.outbox.claim(1)
+        self.outbox.retry(email_id, "Unavailable", 60)
+
+        self.assertEqual(self.outbox.claim(1), [])
+        self.assertEqual(self.outbox.get(email_id)["status"], EmailOutbox.QUEUED)
+        self.assertEqual(self.outbox.get(email_id)["error"], "Unavailable")
+
+    def test_stats(self):
+        sent_id: str = self.outbox.enqueue('{"id": "1"}')
+        failed_id: str = self.outbox.enqueue('{"id": "2"}')
+        self.outbox.enqueue('{"id": "3"}')
+        self.outbox.mark_sent(sent_id, "1")
+        self.outbox.mark_failed(failed_id, "Invalid parameter")
+
+        self.assertDictEqual(
+            self.outbox.stats, {"queued": 1, "sending": 0, "sent": 1, "failed": 1}
+        )
+
+    def test_reserve_slot(self):
+        # NOTE : A second outbox on the same file stands for another worker process.
+        other_outbox: EmailOutbox = EmailOutbox(self.outbox.path)
+        first_slot: float = self.outbox.reserve_slot(1)
+
+        self.assertAlmostEqual(other_outbox.reserve_slot(1), first_slot + 1)
+        self.assertAlmostEqual(self.outbox.reserve_slot(1), first_slot + 2)
+
+    def test_purge(self):
+        sent_id: str = self.outbox.enqueue('{"id": "1"}')
+        queued_id: str = self.outbox.enqueue('{"id": "2"}')
+        self.outbox.mark_sent(sent_id, "1")
+        self.outbox.retention = 60
+
+        self.assertEqual(self.outbox.purge(), 0)
+
+        self.outbox.retention = -1
+
+        self.assertEqual(self.outbox.purge(), 1)
+        self.assertIsNone(self.outbox.get(sent_id))
+        self.assertEqual(self.outbox.get(queued_id)["status"], EmailOutbox.QUEUED)
+
+
+class EmailDispatcherTest(EmailOutboxTestCase):
+    def setUp(self):
+        super().setUp()
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.delivered: List[str] = []
+        self.errors: List[Exception] = []
+
+    def tearDown(self):
+        self.loop.close()
+        super().tearDown()
+
+    async def _deliver(self, invoice_json: str) -> dict:
+        if self.errors:
+            raise self.errors.pop(0)
+
+        self.delivered.append(invoice_json)
+
+        return {"messageId": str(len(self.delivered))}
+
+    def _dispatcher(self, **kwargs) -> EmailDispatcher:
+        return EmailDispatcher(self.outbox, self._deliver, retry_backoff=0, **kwargs)
+
+    def test_dispatch_batch(self):
+        email_ids: List[str] = [self.outbox.enqueue(f'{{"id": "{i}"}}') for i in range(3)]
+
+        dispatched: int = self.loop.run_until_complete(
+            self._dispatcher(rate=1000, batch_size=2).dispatch_batch()
+        )
+
+        self.assertEqual(dispatched, 2)
+        self.assertEqual(self.delivered, ['{"id": "0"}', '{"id": "1"}'])
+        self.assertEqual(self.outbox.get(email_ids[1])["message_id"], "2")
+        self.assertEqual(self.outbox.get(email_ids[2])["status"], EmailOutbox.QUEUED)
+
+    def test_dispatch_rate(self):
+        for i in range(3):
+            self.outbox.enqueue(f'{{"id": "{i}"}}')
+
+        start: float = time.perf_counter()
+        self.loop.run_until_complete(self._dispatcher(rate=20).dispatch_batch())
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.1)
+        self.assertEqual(len(self.delivered), 3)
+
+    def test_dispatch_rate_shared(self):
+        for i in range(4):
+            self.outbox.enqueue(f'{{"id": "{i}"}}')
+
+        other_dispatcher: EmailDispatcher = EmailDispatcher(
+            EmailOutbox(self.outbox.path), self._deliver, rate=20, batch_size=2
+        )
+
+        async def dispatch_batches():
+            await asyncio.gather(
+                self._dispatcher(rate=20, batch_size=2).dispatch_batch(),
+                other_dispatcher.dispatch_batch(),
+            )
+
+        start: float = time.perf_counter()
+        self.loop.run_until_complete(dispatch_batches())
+
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+        self.assertEqual(len(self.delivered), 4)
+
+    def test_dispatch_retry(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+        self.errors = [CircuitOpenError("The circuit is open"), SendinBlueError(502, {})]
+        email_dispatcher: EmailDispatcher = self._dispatcher(max_attempts=3)
+
+        for status in (EmailOutbox.QUEUED, EmailOutbox.QUEUED, EmailOutbox.SENT):
+            self.loop.run_until_complete(email_dispatcher.dispatch_batch())
+
+            self.assertEqual(self.outbox.get(email_id)["status"], status)
+
+        self.assertEqual(self.outbox.get(email_id)["attempts"], 3)
+
+    def test_dispatch_rejected(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+        self.errors = [SendinBlueError(400, {"message": "Invalid parameter"})]
+
+        self.loop.run_until_complete(self._dispatcher().dispatch_batch())
+
+        self.assertEqual(self.outbox.get(email_id)["status"], EmailOutbox.FAILED)
+        self.assertEqual(self.outbox.get(email_id)["error"], "Invalid parameter")
+
+    def test_dispatch_max_attempts(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+        self.errors = [SendinBlueError(503, {}), SendinBlueError(503, {})]
+        email_dispatcher: EmailDispatcher = self._dispatcher(max_attempts=2)
+
+        for _ in range(2):
+            self.loop.run_until_complete(email_dispatcher.dispatch_batch())
+
+        self.assertEqual(self.outbox.get(email_id)["status"], EmailOutbox.FAILED)
+
+    def test_dispatch_delivery_unknown(self):
+        email_id: str = self.outbox.enqueue('{"id": "1"}')
+        self.errors = [
+            SendinBlueError(502, {"message": "ReadTimeout"}, retryable=False),
+        ]
+
+        self.loop.run_until_complete(self._dispatcher().dispatch_batch())
+
+        self.assertEqual(self.outbox.get(email_id)["status"], EmailOutbox.FAILED)
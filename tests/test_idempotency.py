@@ -0,0 +1,168 @@
+import hashlib
+import json
+import time
+import uuid
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from requests import Response
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_202_ACCEPTED,
+    HTTP_409_CONFLICT,
+    HTTP_422_UNPROCESSABLE_ENTITY,
+)
+from starlette.testclient import TestClient
+
+from app import app
+from mailing import EmailOutbox
+from middlewares import (
+    IdempotencyConflictError,
+    IdempotencyKeyReusedError,
+    IdempotencyStore,
+    StoredResponse,
+)
+from tests.commons import InvoiceContentTestCase
+
+
+class IdempotencyStoreTest(TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.store: IdempotencyStore = IdempotencyStore(
+            Path(self.directory.name, "responses.sqlite3"), max_entries=2, lease=0.05
+        )
+        self.response: StoredResponse = StoredResponse(
+            201, [("content-type", "application/json")], b"{}"
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_begin_complete(self):
+        self.assertIsNone(self.store.begin("a", "fingerprint"))
+
+        self.store.complete("a", self.response)
+
+        self.assertEqual(self.store.begin("a", "fingerprint"), self.response)
+
+    def test_begin_pending(self):
+        self.store.begin("a", "fingerprint")
+
+        self.assertRaises(IdempotencyConflictError, self.store.begin, "a", "fingerprint")
+
+        time.sleep(0.05)
+
+        self.assertIsNone(self.store.begin("a", "fingerprint"))
+
+    def test_begin_other_fingerprint(self):
+        self.store.begin("a", "fingerprint")
+        self.store.complete("a", self.response)
+
+        self.assertRaises(IdempotencyKeyReusedError, self.store.begin, "a", "other")
+
+    def test_abandon(self):
+        self.store.begin("a", "fingerprint")
+        self.store.abandon("a")
+
+        self.assertIsNone(self.store.begin("a", "fingerprint"))
+
+    def test_max_entries(self):
+        for key in "abc":
+            self.store.begin(key, "fingerprint")
+            self.store.complete(key, self.response)
+
+        self.assertEqual(self.store.size, 2)
+        self.assertIsNone(self.store.begin("a", "fingerprint"))
+
+    def test_max_bytes(self):
+        self.store.max_entries = 10
+        self.store.max_bytes = 2 * len(self.response.body)
+
+        for key in "abc":
+            self.store.begin(key, "fingerprint")
+            self.store.complete(key, self.response)
+
+        self.assertEqual(self.store.size, 2)
+        self.assertIsNone(self.store.begin("a", "fingerprint"))
+
+    def test_begin_purge(self):
+        self.store.begin("a", "fingerprint")
+        self.store.complete("a", self.response)
+        self.store.ttl = -1
+
+        self.store.begin("b", "fingerprint")
+
+        self.assertEqual(self.store.size, 1)
+
+
+class IdempotencyMiddlewareTest(InvoiceContentTestCase):
+    def setUp(self):
+        InvoiceContentTestCase.setUp(self)
+        self.test_client: TestClient = TestClient(app)
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.email_outbox: EmailOutbox = app.state.email_outbox
+        app.state.email_outbox = EmailOutbox(Path(self.directory.name, "emails.sqlite3"))
+
+    def tearDown(self):
+        app.state.email_outbox = self.email_outbox
+        self.directory.cleanup()
+
+    def _post(self, path: str, idempotency_key: str, invoice: dict) -> Response:
+        return self.test_client.post(
+            path, json=invoice, headers={"Idempotency-Key": idempotency_key}
+        )
+
+    def test_pdf_endpoint(self):
+        idempotency_key: str = uuid.uuid4().hex
+        first_response: Response = self._post("/pdf/invoice.pdf", idempotency_key, self.invoice)
+        render_calls: int = app.state.render_flights.calls
+        second_response: Response = self._post(
+            "/pdf/invoice.pdf", idempotency_key, self.invoice
+        )
+
+        self.assertEqual(second_response.status_code, HTTP_200_OK)
+        self.assertEqual(second_response.headers["Content-Type"], "application/pdf")
+        self.assertEqual(second_response.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(second_response.content, first_response.content)
+        self.assertEqual(app.state.render_flights.calls, render_calls)
+        self.assertNotIn("Idempotent-Replayed", first_response.headers)
+
+    def test_email_endpoint(self):
+        idempotency_key: str = uuid.uuid4().hex
+        first_response: Response = self._post("/email", idempotency_key, self.invoice)
+        second_response: Response = self._post("/email", idempotency_key, self.invoice)
+
+        self.assertEqual(second_response.status_code, HTTP_202_ACCEPTED)
+        self.assertEqual(second_response.json(), first_response.json())
+        self.assertEqual(app.state.email_outbox.stats["queued"], 1)
+
+    def test_email_endpoint_without_key(self):
+        self.test_client.post("/email", json=self.invoice)
+        self.test_client.post("/email", json=self.invoice)
+
+        self.assertEqual(app.state.email_outbox.stats["queued"], 2)
+
+    def test_key_reused(self):
+        idempotency_key: str = uuid.uuid4().hex
+        self._post("/email", idempotency_key, self.invoice)
+
+        response: Response = self._post(
+            "/email", idempotency_key, {**self.invoice, "paid": False}
+        )
+
+        self.assertEqual(response.status_code, HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertIn("idempotency_error", response.json())
+
+    def test_key_pending(self):
+        idempotency_key: str = uuid.uuid4().hex
+        body: bytes = json.dumps(self.invoice).encode("utf-8")
+        app.state.idempotency_store.begin(
+            f"POST /email {idempotency_key}", hashlib.sha256(b"\n" + body).hexdigest()
+        )
+
+        response: Response = self.test_client.post(
+            "/email", data=body, headers={"Idempotency-Key": idempotency_key}
+        )
+
+        self.assertEqual(response.status_code, HTTP_409_CONFLICT)
@@ -0,0 +1,162 @@
+import asyncio
+import pickle
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from pdf_generation import InvoiceCache, InvoiceCacheEvictor, InvoiceLock
+
+
+class InvoiceCacheTestCase(TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.invoice_cache: InvoiceCache = InvoiceCache(Path(self.directory.name))
+
+    def test_get_put(self):
+        self.assertIsNone(self.invoice_cache.get("demo", "a"))
+
+        invoice_path: Path = self.invoice_cache.put("demo", "a", b"%PDF-a")
+
+        self.assertEqual(invoice_path, Path(self.directory.name, "demo", "a.pdf"))
+        self.assertEqual(self.invoice_cache.get("demo", "a"), b"%PDF-a")
+        self.assertIsNone(self.invoice_cache.get("other", "a"))
+        self.assertEqual(self.invoice_cache.stats["hits"], 1)
+        self.assertEqual(self.invoice_cache.stats["misses"], 2)
+        self.assertAlmostEqual(self.invoice_cache.hit_ratio, 1 / 3)
+
+    def test_get_deleted_file(self):
+        self.invoice_cache.put("demo", "a", b"%PDF-a").unlink()
+
+        self.assertIsNone(self.invoice_cache.get("demo", "a"))
+        self.assertEqual(self.invoice_cache.size, 0)
+
+    def test_evict_expired(self):
+        self.invoice_cache.ttl = 0.01
+        invoice_path: Path = self.invoice_cache.put("demo", "a", b"%PDF-a")
+        time.sleep(0.02)
+
+        self.assertIsNone(self.invoice_cache.get("demo", "a"))
+        self.assertEqual(self.invoice_cache.evict(), 1)
+        self.assertFalse(invoice_path.exists())
+
+    def test_evict_least_recently_used(self):
+        self.invoice_cache.quota_bytes = 12
+        first_path: Path = self.invoice_cache.put("demo", "a", b"%PDF-a")
+        second_path: Path = self.invoice_cache.put("demo", "b", b"%PDF-b")
+        self.invoice_cache.get("demo", "a")
+        third_path: Path = self.invoice_cache.put("demo", "c", b"%PDF-c")
+
+        self.assertEqual(self.invoice_cache.evict(), 1)
+        self.assertTrue(first_path.exists())
+        self.assertFalse(second_path.exists())
+        self.assertTrue(third_path.exists())
+        self.assertEqual(self.invoice_cache.size, 12)
+        self.assertEqual(self.invoice_cache.evict(), 0)
+
+    def test_evict_batch_size(self):
+        self.invoice_cache.quota_bytes = 0
+
+        for key in "abcde":
+            self.invoice_cache.put("demo", key, b"%PDF")
+
+        self.assertEqual(self.invoice_cache.evict(batch_size=2), 2)
+        self.assertEqual(self.invoice_cache.evict(batch_size=2), 2)
+        self.assertEqual(self.invoice_cache.evict(batch_size=2), 1)
+
+    def test_put_replace(self):
+        self.invoice_cache.put("demo", "a", b"%PDF-a")
+        invoice_path: Path = self.invoice_cache.put("demo", "a", b"%PDF-b")
+
+        self.assertEqual(invoice_path.read_bytes(), b"%PDF-b")
+        self.assertEqual(list(invoice_path.parent.iterdir()), [invoice_path])
+
+    def test_lock(self):
+        first_lock: InvoiceLock = self.invoice_cache.lock("demo", "a")
+        second_lock: InvoiceLock = self.invoice_cache.lock("demo", "a")
+
+        self.assertTrue(first_lock.acquire(blocking=False))
+        self.assertFalse(second_lock.acquire(blocking=False))
+
+        first_lock.release()
+
+        self.assertTrue(second_lock.acquire(blocking=False))
+
+        second_lock.release()
+
+    def test_evict_lock(self):
+        self.invoice_cache.quota_bytes = 0
+        self.invoice_cache.put("demo", "a", b"%PDF-a")
+
+        with self.invoice_cache.lock("demo", "a") as invoice_lock:
+            pass
+
+        self.assertEqual(self.invoice_cache.evict(), 1)
+        self.assertFalse(invoice_lock.path.exists())
+
+    def test_evict_held_lock(self):
+        self.invoice_cache.quota_bytes = 0
+        self.invoice_cache.put("demo", "a", b"%PDF-a")
+
+        with self.invoice_cache.lock("demo", "a") as invoice_lock:
+            self.assertEqual(self.invoice_cache.evict(), 1)
+            self.assertTrue(invoice_lock.path.exists())
+
+    def test_lock_removed_file(self):
+        first_lock: InvoiceLock = self.invoice_cache.lock("demo", "a")
+        second_lock: InvoiceLock = self.invoice_cache.lock("demo", "a")
+        first_lock.acquire()
+        first_lock.path.unlink()
+
+        # NOTE : The first lock is held on a removed file, which is not the lock anymore.
+        self.assertTrue(second_lock.acquire(blocking=False))
+        self.assertFalse(first_lock._is_current(first_lock._file))
+
+        first_lock.release()
+        second_lock.release()
+
+    def test_pickle(self):
+        self.invoice_cache.put("demo", "a", b"%PDF-a")
+
+        invoice_cache: InvoiceCache = pickle.loads(pickle.dumps(self.invoice_cache))
+
+        self.assertEqual(invoice_cache.get("demo", "a"), b"%PDF-a")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+
+class InvoiceCacheEvictorTestCase(TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.invoice_cache: InvoiceCache = InvoiceCache(Path(self.directory.name))
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+
+    def test_evict_error(self):
+        evictions: list = []
+
+        def evict(batch_size: int) -> int:
+            evictions.append(batch_size)
+
+            if len(evictions) == 1:
+                raise PermissionError("Permission denied")
+
+            return 0
+
+        self.invoice_cache.evict = evict
+        evictor: InvoiceCacheEvictor = InvoiceCacheEvictor(self.invoice_cache, interval=0.01)
+
+        async def run_evictor():
+            evictor.start()
+            await asyncio.sleep(0.1)
+            await evictor.stop()
+
+        with self.assertLogs("aposto.store") as logs:
+            self.loop.run_until_complete(run_evictor())
+
+        self.assertGreater(len(evictions), 1)
+        self.assertIn("PermissionError", logs.output[0])
+
+    def tearDown(self):
+        self.loop.close()
+        self.directory.cleanup()
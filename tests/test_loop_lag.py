@@ -0,0 +1,59 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from prometheus_client import REGISTRY
+
+from monitoring import LoopLagMonitor
+
+
+class LoopLagMonitorTest(TestCase):
+    def setUp(self):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.loop_lag_monitor: LoopLagMonitor = LoopLagMonitor(interval=0.01, threshold=0.05)
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.loop_lag_monitor.stop())
+        self.loop.close()
+
+    @staticmethod
+    def _lag_count() -> float:
+        return REGISTRY.get_sample_value("aposto_event_loop_lag_seconds_count") or 0
+
+    @staticmethod
+    def _blocks(route: str) -> float:
+        return (
+            REGISTRY.get_sample_value("aposto_event_loop_blocks_total", {"route": route}) or 0
+        )
+
+    async def _run(self, endpoint):
+        self.loop_lag_monitor.start()
+        await asyncio.sleep(0.05)
+        await endpoint()
+        await asyncio.sleep(0.05)
+
+    def test_loop_lag(self):
+        async def sleeping_endpoint():
+            await asyncio.sleep(0.1)
+
+        lag_count: float = self._lag_count()
+
+        with self.assertRaises(AssertionError):
+            with self.assertLogs("aposto.loop"):
+                self.loop.run_until_complete(self._run(sleeping_endpoint))
+
+        self.assertGreater(self._lag_count(), lag_count)
+
+    def test_loop_blocked(self):
+        async def blocking_endpoint():
+            time.sleep(0.2)
+
+        blocks: float = self._blocks("blocking")
+
+        with self.assertLogs("aposto.loop", "WARNING") as logs:
+            self.loop.run_until_complete(self._run(blocking_endpoint))
+
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("by the blocking route", logs.output[0])
+        self.assertIn("time.sleep(0.2)", logs.output[0])
+        self.assertEqual(self._blocks("blocking"), blocks + 1)
@@ -220,6 +220,10 @@ class InvoiceTestCase(TestCase):
             int(f"{invoice.reference[4:]}2715{invoice.reference[2:4]}") % 97, 1
         )
 
+        self.invoice_dict["timestamp"] = 1891293001199
+
+        self.assertEqual(Invoice(**self.invoice_dict).reference, "RF971891293001199")
+
     def test_qr_reference(self):
         self.invoice_dict["author"]["iban"] = "CH5131234567890123456"
 
@@ -92,5 +92,12 @@ class ServiceTestCase(TestCase):
         with self.assertRaises(ValidationError):
             Service(**self.service_dict)
 
+    def test_code_not_int(self):
+        for code in ("1003", 1003.9):
+            self.service_dict["code"] = code
+
+            with self.assertRaises(ValidationError):
+                Service(**self.service_dict)
+
     def tearDown(self):
         self.service_dict = None
@@ -0,0 +1,33 @@
+from unittest import TestCase
+
+from models import ServiceCode, ServiceCodeCatalogue, tarif_590
+
+
+class ServiceCodeCatalogueTestCase(TestCase):
+    def setUp(self):
+        self.catalogue: ServiceCodeCatalogue = ServiceCodeCatalogue(
+            "test",
+            [
+                ServiceCode(1003, {"fr": "Acupressure", "de": "Akupressur"}),
+                ServiceCode(1004, {"fr": "Acupuncture"}),
+            ],
+        )
+
+    def test_contains(self):
+        self.assertIn(1003, self.catalogue)
+        self.assertNotIn(1, self.catalogue)
+        self.assertEqual(self.catalogue.codes, [1003, 1004])
+
+    def test_label(self):
+        self.assertEqual(self.catalogue.label(1003), "Acupressure")
+        self.assertEqual(self.catalogue.label(1003, "de"), "Akupressur")
+        self.assertEqual(self.catalogue.label(1004, "de"), "Acupuncture")
+
+        with self.assertRaises(KeyError):
+            self.catalogue.label(1)
+
+    def test_tarif_590(self):
+        self.assertEqual(len(tarif_590), 93)
+        self.assertEqual(
+            tarif_590.label(1210), "Spiraldynamik, par période de 5 minutes"
+        )
@@ -0,0 +1,151 @@
+from io import BytesIO
+from pathlib import Path
+from unittest import TestCase
+
+from reportlab.lib.units import mm
+
+from models import Invoice
+from pdf_generation import MergedPDFGenerator, PDFGenerator
+from pdf_generation.aposto_pdf import ApostoCanvas
+from pdf_generation.content import Graphic
+from pdf_generation.contents import InvoiceContent, InvoiceFields
+from pdf_generation.image_assets import ImageAsset, get_image_asset
+from pdf_generation.template import DrawOp, DrawProgram, ValueTemplate
+from pdf_generation.text_style import FontRegistry, TTFontToRegister
+from tests.commons import InvoiceContentTestCase
+
+
+class PDFGeneratorTest(InvoiceContentTestCase):
+    def setUp(self):
+        InvoiceContentTestCase.setUp(self)
+        self.pdf_generator: PDFGenerator = PDFGenerator(
+            InvoiceContent(Invoice(**self.invoice))
+        )
+
+    def test_render(self):
+        invoice_pdf: bytes = self.pdf_generator.render()
+
+        self.assertTrue(invoice_pdf.startswith(b"%PDF"))
+        self.assertEqual(invoice_pdf.count(b"/Type /Page\n"), 2)
+        self.assertEqual(invoice_pdf.count(b"/Subtype /Form"), 2)
+
+    def test_render_merged(self):
+        invoice_pdf: bytes = self.pdf_generator.render()
+        merged_invoice_pdf: bytes = MergedPDFGenerator(
+            [InvoiceContent(Invoice(**self.invoice)) for _ in range(3)]
+        ).render()
+
+        self.assertEqual(merged_invoice_pdf.count(b"/Type /Page\n"), 6)
+        self.assertEqual(merged_invoice_pdf.count(b"/Subtype /Form"), 2)
+        self.assertLess(len(merged_invoice_pdf), 2 * len(invoice_pdf))
+
+    def test_static_layer_is_drawn_once_per_document(self):
+        drawn_layers: list = []
+
+        def draw_layer(cvs: ApostoCanvas):
+            drawn_layers.append(cvs)
+            cvs.drawString(10, 10, "Static")
+
+        cvs: ApostoCanvas = ApostoCanvas(BytesIO())
+
+        for _ in range(3):
+            cvs.draw_static_layer("layer", draw_layer)
+            cvs.showPage()
+
+        cvs.save()
+
+        self.assertEqual(len(drawn_layers), 1)
+
+    def test_image_assets_are_embedded_in_every_document(self):
+        first_pdf: bytes = self.pdf_generator.render()
+        second_pdf: bytes = self.pdf_generator.render()
+
+        self.assertEqual(first_pdf.count(b"/Subtype /Image"), 3)
+        self.assertEqual(second_pdf.count(b"/Subtype /Image"), 3)
+
+    def test_draw_matrix(self):
+        cvs: ApostoCanvas = ApostoCanvas(BytesIO())
+        cvs.setPageCompression(0)
+        cvs._draw_matrix(
+            [[True, True, False], [False, True, True], [True, False, True]],
+            Graphic({"left": 10, "top": 10, "width": 3, "height": 3}),
+        )
+
+        self.assertEqual(cvs.getpdfdata().count(b" re"), 4)
+
+
+class ImageAssetTest(TestCase):
+    def test_get_image_asset(self):
+        image_asset: ImageAsset = get_image_asset("scissors.png", -90)
+
+        self.assertIs(get_image_asset("scissors.png", -90), image_asset)
+        self.assertIsNot(get_image_asset("scissors.png"), image_asset)
+        self.assertEqual(
+            (image_asset.width, image_asset.height),
+            tuple(reversed(get_image_asset("scissors.png").image.size)),
+        )
+        self.assertIsNot(image_asset.image_xobject(), image_asset.image_xobject())
+
+
+class InvoiceFieldsTest(InvoiceContentTestCase):
+    def test_derive(self):
+        invoice_fields: InvoiceFields = InvoiceFields.derive(Invoice(**self.invoice))
+
+        self.assertEqual(invoice_fields.reference_type, "QRR")
+        self.assertEqual(invoice_fields.reference, "000000000000015850491184852")
+        self.assertEqual(
+            invoice_fields.formatted_reference, "00 00000 00000 01585 04911 84852"
+        )
+
+        with self.assertRaises(AttributeError):
+            invoice_fields.total_amount = "0.00"
+
+
+class TemplateTest(InvoiceContentTestCase):
+    def setUp(self):
+        InvoiceContentTestCase.setUp(self)
+        self.services_template: ValueTemplate = ValueTemplate(
+            Path("pdf_generation/invoice_templates/value_templates/services_template.json")
+        )
+
+    def test_compile(self):
+        program: DrawProgram = self.services_template.compile()
+        draw_op: DrawOp = program[0]
+
+        self.assertAlmostEqual(draw_op.left, 16.243 * mm)
+        self.assertAlmostEqual(draw_op.bottom, (297 - 155.226) * mm)
+        self.assertIsNone(draw_op.text)
+        self.assertEqual(
+            draw_op.value(InvoiceContent(Invoice(**self.invoice)).services_content[0]),
+            "23.03.2020",
+        )
+        self.assertIs(draw_op.style, program[1].style)
+
+    def test_compile_rows(self):
+        programs: tuple = self.services_template.compile_rows(3, 6)
+
+        self.assertEqual(len(programs), 3)
+        self.assertAlmostEqual(programs[0][0].bottom - programs[2][0].bottom, 12 * mm)
+
+
+class FontRegistryTest(TestCase):
+    def setUp(self):
+        self.registered_fonts: list = []
+
+        class TTFontToRegisterMock(TTFontToRegister):
+            def register(mock_self):
+                self.registered_fonts.append(mock_self.family)
+
+        self.font_registry: FontRegistry = FontRegistry(
+            [TTFontToRegisterMock(Path("fonts/Arial.ttf"), "Arial")]
+        )
+
+    def test_register_once(self):
+        self.assertFalse(self.font_registry.registered)
+
+        self.font_registry.register()
+        self.font_registry.register()
+
+        self.assertTrue(self.font_registry.registered)
+        self.assertEqual(self.registered_fonts, ["Arial"])
+        self.assertGreaterEqual(self.font_registry.registration_time, 0.0)
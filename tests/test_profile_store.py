@@ -0,0 +1,53 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from monitoring import ProfileStore
+
+
+class ProfileStoreTest(TestCase):
+    def setUp(self):
+        self.directory: TemporaryDirectory = TemporaryDirectory()
+        self.profile_store: ProfileStore = ProfileStore(
+            Path(self.directory.name), max_profiles=2
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_profile(self):
+        profile_name, result = self.profile_store.profile("pdf", sum, [1, 2, 3])
+
+        self.assertEqual(result, 6)
+        self.assertRegex(profile_name, r"^\d{14}-pdf-[0-9a-f]{8}\.prof$")
+        self.assertEqual(
+            self.profile_store.get_path(profile_name), Path(self.directory.name, profile_name)
+        )
+
+    def test_profile_prune(self):
+        profile_names: list = [
+            self.profile_store.profile("pdf", sum, [])[0] for _ in range(3)
+        ]
+
+        self.assertCountEqual(
+            [profile["name"] for profile in self.profile_store.list()], profile_names[1:]
+        )
+
+    def test_get_path_invalid_name(self):
+        Path(self.directory.name, "other.prof").write_bytes(b"")
+
+        self.assertIsNone(self.profile_store.get_path("other.prof"))
+        self.assertIsNone(self.profile_store.get_path("../other.prof"))
+
+    def test_profile_removed_by_other_worker(self):
+        profile_name, _ = self.profile_store.profile("pdf", sum, [])
+        profile_path: Path = Path(self.directory.name, profile_name)
+        profiles: list = self.profile_store._profiles()
+        profile_path.unlink()
+        self.profile_store.max_profiles = 0
+
+        with patch.object(self.profile_store, "_profiles", return_value=profiles):
+            self.profile_store._prune()
+
+        self.assertEqual(self.profile_store.list(), [])
@@ -0,0 +1,59 @@
+import random
+from unittest import TestCase
+
+import qrcode
+from qrcode import util
+from qrcode.exceptions import DataOverflowError
+
+from models import Invoice
+from pdf_generation.contents import InvoiceContent
+from pdf_generation.qr_code_encoder import (
+    SwissQRCodeEncoder,
+    encode_qr_code,
+    lost_point,
+)
+from pdf_generation.qr_invoice import QRInvoice
+from tests.commons import InvoiceContentTestCase
+
+
+class LostPointTestCase(TestCase):
+    def test_lost_point(self):
+        random_generator: random.Random = random.Random(590)
+
+        for modules_count in (21, 25, 57):
+            modules: list = list(
+                list(random_generator.random() < 0.5 for _ in range(modules_count))
+                for _ in range(modules_count)
+            )
+
+            self.assertEqual(lost_point(modules), util.lost_point(modules))
+
+
+class SwissQRCodeEncoderTestCase(InvoiceContentTestCase):
+    def setUp(self):
+        InvoiceContentTestCase.setUp(self)
+        self.payload: str = QRInvoice(
+            InvoiceContent(Invoice(**self.invoice))
+        )._generate_qr_code_string()
+
+    def test_encode(self):
+        qr_code: qrcode.QRCode = qrcode.QRCode(
+            error_correction=qrcode.constants.ERROR_CORRECT_M, border=0
+        )
+        qr_code.add_data(self.payload)
+        qr_code.make(fit=True)
+
+        self.assertEqual(
+            SwissQRCodeEncoder().encode(self.payload),
+            tuple(tuple(row) for row in qr_code.modules),
+        )
+
+    def test_encode_smallest_version(self):
+        self.assertEqual(len(SwissQRCodeEncoder().encode("SPC\r\n0210\r\n1")), 21)
+
+    def test_encode_overflow(self):
+        with self.assertRaises(DataOverflowError):
+            SwissQRCodeEncoder().encode("x" * 1300)
+
+    def test_encode_qr_code_cache(self):
+        self.assertIs(encode_qr_code(self.payload), encode_qr_code(self.payload))
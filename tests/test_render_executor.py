@@ -0,0 +1,91 @@
+import asyncio
+import time
+from unittest import TestCase
+
+from pdf_generation import RenderExecutor, RenderQueueFullError
+
+
+class RenderExecutorTestCase(TestCase):
+    def setUp(self):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.render_executor: RenderExecutor = RenderExecutor("thread", 1, 1)
+
+    def test_run(self):
+        result: int = self.loop.run_until_complete(self.render_executor.run(sum, [1, 2]))
+
+        self.assertEqual(result, 3)
+        self.assertEqual(self.render_executor.stats["completed"], 1)
+        self.assertEqual(self.render_executor.in_flight, 0)
+
+    def test_queue_full(self):
+        async def run_concurrently():
+            return await asyncio.gather(
+                *(self.render_executor.run(time.sleep, 0.05) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        results: list = self.loop.run_until_complete(run_concurrently())
+
+        self.assertIsInstance(results[2], RenderQueueFullError)
+        self.assertEqual(self.render_executor.stats["completed"], 2)
+        self.assertGreater(self.render_executor.stats["wait_time_max"], 0.0)
+
+    def test_queue_depth(self):
+        async def check_queue_depth():
+            first = asyncio.ensure_future(self.render_executor.run(time.sleep, 0.05))
+            second = asyncio.ensure_future(self.render_executor.run(time.sleep, 0.05))
+            await asyncio.sleep(0.01)
+            queue_depth: int = self.render_executor.queue_depth
+            await asyncio.gather(first, second)
+
+            return queue_depth
+
+        self.assertEqual(self.loop.run_until_complete(check_queue_depth()), 1)
+        self.assertEqual(self.render_executor.queue_depth, 0)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            RenderExecutor("fiber")
+
+    def tearDown(self):
+        self.render_executor.shutdown()
+        self.loop.close()
+
+
+def busy_render(seconds: float):
+    ends_at: float = time.perf_counter() + seconds
+
+    while time.perf_counter() < ends_at:
+        pass
+
+
+class ProcessRenderExecutorTestCase(TestCase):
+    def setUp(self):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.render_executor: RenderExecutor = RenderExecutor("process", 1, 1)
+
+    def test_sample_stacks(self):
+        async def sample_while_rendering():
+            render = asyncio.ensure_future(self.render_executor.run(busy_render, 1.0))
+            stacks: dict = await self.loop.run_in_executor(
+                None, self.render_executor.sample_stacks, 0.3
+            )
+            await render
+
+            return stacks
+
+        stacks: dict = self.loop.run_until_complete(sample_while_rendering())
+
+        self.assertTrue(stacks)
+        self.assertTrue(all(stack.startswith("render-process-") for stack in stacks))
+        self.assertTrue(any(stack.endswith("test_render_executor:busy_render") for stack in stacks))
+
+    def test_thread_executor_has_no_process_stacks(self):
+        render_executor: RenderExecutor = RenderExecutor("thread", 1, 1)
+
+        self.assertEqual(render_executor.sample_stacks(0.1), {})
+        render_executor.shutdown()
+
+    def tearDown(self):
+        self.render_executor.shutdown()
+        self.loop.close()
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from typing import List
+from unittest import TestCase
+
+import httpcore
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse
+from starlette.routing import Route
+
+from mailing import CircuitBreaker, CircuitOpenError, SendinBlueClient, SendinBlueError
+from tests.commons import SendInBlueMock
+
+
+class FailingTransport(httpcore.AsyncHTTPTransport):
+    """
+    Transport raising the given errors in order, then answering through the SendinBlue mock
+    """
+
+    def __init__(self, sendinblue_mock: SendInBlueMock, *errors: Exception):
+        self.transport: httpx.ASGITransport = httpx.ASGITransport(app=sendinblue_mock.app)
+        self.errors: List[Exception] = list(errors)
+
+    async def arequest(self, *args, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+
+        return await self.transport.arequest(*args, **kwargs)
+
+
+class SendinBlueClientTestCase(TestCase):
+    def setUp(self):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _send_email(self, sendinblue_client: SendinBlueClient) -> dict:
+        async def send_email():
+            try:
+                return await sendinblue_client.send_email(b'{"subject": "Facture"}')
+            finally:
+                await sendinblue_client.close()
+
+        return self.loop.run_until_complete(send_email())
+
+    def test_send_email(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+
+        body: dict = self._send_email(sendinblue_mock.client())
+
+        self.assertDictEqual(body, SendInBlueMock.SUCCESS_JSON)
+        self.assertEqual(sendinblue_mock.requests, [{"subject": "Facture"}])
+
+    def test_send_email_failure(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.failure()
+
+        with self.assertRaises(SendinBlueError) as context:
+            self._send_email(sendinblue_mock.client())
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.assertDictEqual(context.exception.body, SendInBlueMock.FAILURE_JSON)
+        self.assertEqual(len(sendinblue_mock.requests), 1)
+
+    def test_send_email_retry(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock(
+            (429, {}), (503, {}), (201, SendInBlueMock.SUCCESS_JSON)
+        )
+
+        body: dict = self._send_email(sendinblue_mock.client())
+
+        self.assertDictEqual(body, SendInBlueMock.SUCCESS_JSON)
+        self.assertEqual(len(sendinblue_mock.requests), 3)
+
+    def test_send_email_retries_exhausted(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock((502, {"code": "bad_gateway"}))
+
+        with self.assertRaises(SendinBlueError) as context:
+            self._send_email(sendinblue_mock.client(retries=2))
+
+        self.assertEqual(context.exception.status_code, 502)
+        self.assertEqual(len(sendinblue_mock.requests), 3)
+
+    def test_send_email_retry_after(self):
+        sendinblue_client: SendinBlueClient = SendInBlueMock.success().client(
+            max_retry_delay=5
+        )
+        response: httpx.Response = httpx.Response(429, headers={"Retry-After": "3600"})
+
+        self.assertEqual(sendinblue_client._retry_delay(0, response), 5)
+
+    def test_send_email_connect_error_retry(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        sendinblue_client: SendinBlueClient = sendinblue_mock.client(
+            transport=FailingTransport(
+                sendinblue_mock, httpcore.ConnectError(), httpcore.PoolTimeout()
+            )
+        )
+
+        body: dict = self._send_email(sendinblue_client)
+
+        self.assertDictEqual(body, SendInBlueMock.SUCCESS_JSON)
+        self.assertEqual(len(sendinblue_mock.requests), 1)
+
+    def test_send_email_read_timeout_not_retried(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        sendinblue_client: SendinBlueClient = sendinblue_mock.client(
+            transport=FailingTransport(sendinblue_mock, httpcore.ReadTimeout())
+        )
+
+        with self.assertRaises(SendinBlueError) as context:
+            self._send_email(sendinblue_client)
+
+        self.assertFalse(context.exception.retryable)
+        self.assertEqual(context.exception.body["code"], "delivery_unknown")
+        self.assertEqual(sendinblue_mock.requests, [])
+
+    def test_send_email_cancelled(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        sendinblue_client: SendinBlueClient = sendinblue_mock.client(
+            transport=FailingTransport(sendinblue_mock, asyncio.CancelledError())
+        )
+
+        with self.assertRaises(asyncio.CancelledError):
+            self._send_email(sendinblue_client)
+
+        self.assertEqual(sendinblue_client.circuit_breaker.failures, 0)
+
+    def test_send_email_cancelled_trial(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock.success()
+        circuit_breaker: CircuitBreaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        circuit_breaker.record_failure()
+        sendinblue_client: SendinBlueClient = sendinblue_mock.client(
+            circuit_breaker=circuit_breaker,
+            transport=FailingTransport(sendinblue_mock, asyncio.CancelledError()),
+        )
+
+        with self.assertRaises(asyncio.CancelledError):
+            self._send_email(sendinblue_client)
+
+        body: dict = self._send_email(sendinblue_client)
+
+        self.assertDictEqual(body, SendInBlueMock.SUCCESS_JSON)
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_send_email_html_error(self):
+        async def bad_gateway(request):
+            return HTMLResponse("<html>Bad Gateway</html>", status_code=502)
+
+        app: Starlette = Starlette(
+            routes=[Route("/v3/smtp/email", bad_gateway, methods=["POST"])]
+        )
+        sendinblue_client: SendinBlueClient = SendInBlueMock.success().client(
+            retries=0, transport=httpx.ASGITransport(app=app)
+        )
+
+        with self.assertRaises(SendinBlueError) as context:
+            self._send_email(sendinblue_client)
+
+        self.assertEqual(context.exception.status_code, 502)
+        self.assertEqual(context.exception.body["message"], "<html>Bad Gateway</html>")
+
+    def test_send_email_circuit_open(self):
+        sendinblue_mock: SendInBlueMock = SendInBlueMock((500, {}))
+        sendinblue_client: SendinBlueClient = sendinblue_mock.client(
+            retries=5, circuit_breaker=CircuitBreaker(failure_threshold=2)
+        )
+
+        with self.assertRaises(CircuitOpenError):
+            self._send_email(sendinblue_client)
+
+        with self.assertRaises(CircuitOpenError):
+            self._send_email(sendinblue_client)
+
+        self.assertEqual(len(sendinblue_mock.requests), 2)
+
+
+class CircuitBreakerTest(TestCase):
+    def test_circuit_breaker(self):
+        circuit_breaker: CircuitBreaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+        circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
+        self.assertRaises(CircuitOpenError, circuit_breaker.before_call)
+
+        time.sleep(0.05)
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.HALF_OPEN)
+
+        circuit_breaker.before_call()
+
+        self.assertRaises(CircuitOpenError, circuit_breaker.before_call)
+
+        circuit_breaker.record_success()
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.CLOSED)
+
+    def test_circuit_breaker_trial_failure(self):
+        circuit_breaker: CircuitBreaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        circuit_breaker.record_failure()
+        time.sleep(0.05)
+        circuit_breaker.before_call()
+        circuit_breaker.record_failure()
+
+        self.assertEqual(circuit_breaker.state, CircuitBreaker.OPEN)
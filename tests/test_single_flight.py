@@ -0,0 +1,83 @@
+import asyncio
+from unittest import TestCase
+
+from pdf_generation import SingleFlight
+
+
+class SingleFlightTestCase(TestCase):
+    def setUp(self):
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.single_flight: SingleFlight = SingleFlight()
+        self.runs: int = 0
+
+    def tearDown(self):
+        self.loop.close()
+
+    async def _render(self) -> bytes:
+        self.runs += 1
+        await asyncio.sleep(0.01)
+
+        return b"%PDF"
+
+    async def _gather(self, *runs, **kwargs) -> list:
+        return await asyncio.gather(*runs, **kwargs)
+
+    async def _fail(self) -> bytes:
+        self.runs += 1
+        await asyncio.sleep(0.01)
+
+        raise RuntimeError("Rendering failed")
+
+    def test_run(self):
+        results: list = self.loop.run_until_complete(
+            self._gather(*(self.single_flight.run("a", self._render) for _ in range(3)))
+        )
+
+        self.assertEqual(results, [b"%PDF"] * 3)
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(self.single_flight.coalesced, 2)
+        self.assertEqual(self.single_flight.in_flight, 0)
+
+    def test_run_keys(self):
+        self.loop.run_until_complete(
+            self._gather(
+                self.single_flight.run("a", self._render),
+                self.single_flight.run("b", self._render),
+            )
+        )
+
+        self.assertEqual(self.runs, 2)
+
+    def test_run_sequential(self):
+        self.loop.run_until_complete(self.single_flight.run("a", self._render))
+        self.loop.run_until_complete(self.single_flight.run("a", self._render))
+
+        self.assertEqual(self.runs, 2)
+
+    def test_run_error(self):
+        results: list = self.loop.run_until_complete(
+            self._gather(
+                *(self.single_flight.run("a", self._fail) for _ in range(2)),
+                return_exceptions=True,
+            )
+        )
+
+        self.assertIsInstance(results[0], RuntimeError)
+        self.assertIs(results[0], results[1])
+        self.assertEqual(self.runs, 1)
+
+    def test_run_cancelled_waiter(self):
+        async def run():
+            first: asyncio.Future = asyncio.ensure_future(
+                self.single_flight.run("a", self._render)
+            )
+            second: asyncio.Future = asyncio.ensure_future(
+                self.single_flight.run("a", self._render)
+            )
+            await asyncio.sleep(0)
+            first.cancel()
+
+            return await second
+
+        self.assertEqual(self.loop.run_until_complete(run()), b"%PDF")
+        self.assertEqual(self.runs, 1)
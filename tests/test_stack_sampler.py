@@ -0,0 +1,38 @@
+import threading
+from unittest import TestCase
+
+from monitoring import StackSampler
+
+
+def _busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class StackSamplerTest(TestCase):
+    def test_sample(self):
+        stop: threading.Event = threading.Event()
+        thread: threading.Thread = threading.Thread(
+            target=_busy_loop, args=(stop,), name="busy"
+        )
+        thread.start()
+
+        try:
+            stacks: dict = StackSampler(rate=200).sample(0.1)
+        finally:
+            stop.set()
+            thread.join()
+
+        busy_stacks: list = [stack for stack in stacks if stack.startswith("busy;")]
+
+        self.assertTrue(busy_stacks)
+        self.assertTrue(
+            all(stack.endswith("tests.test_stack_sampler:_busy_loop") for stack in busy_stacks)
+        )
+        self.assertGreater(sum(stacks[stack] for stack in busy_stacks), 5)
+
+    def test_collapsed(self):
+        self.assertEqual(
+            StackSampler.collapsed({"main;app:b": 1, "main;app:a": 3}),
+            "main;app:a 3\nmain;app:b 1\n",
+        )